@@ -0,0 +1,206 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional
+from bson import ObjectId
+from acb_orm.cache.invalidation import register_invalidation_hook
+from acb_orm.cache.shared import load_documents
+from acb_orm.collections.roles import Role
+from acb_orm.collections.users import User
+from acb_orm.enums.access_type import AccessType
+from acb_orm.queries.memberships import groups_for_users
+
+# Bit of each CRUD operation in a module mask, keyed as in RolePermissionSchema.
+OPERATIONS = {'c': 1, 'r': 2, 'u': 4, 'd': 8}
+
+DEFAULT_MAX_USERS = 10000
+
+def operation_bit(operation: str) -> int:
+    try:
+        return OPERATIONS[operation]
+    except KeyError:
+        raise ValueError(f"Unknown operation '{operation}', expected one of {', '.join(OPERATIONS)}") from None
+
+def permission_mask(permission) -> int:
+    """
+    Returns the CRUD bitmask of a module permission given as a dict or a
+    RolePermissionSchema.
+    """
+    if hasattr(permission, 'model_dump'):
+        permission = permission.model_dump()
+    if not isinstance(permission, Mapping):
+        return 0
+    return sum(bit for operation, bit in OPERATIONS.items() if permission.get(operation))
+
+def _group_id(value) -> str:
+    # allowed_groups may hold IDs, DBRefs or dereferenced Group documents.
+    return str(getattr(value, 'pk', None) or getattr(value, 'id', None) or value)
+
+class EffectivePermissions:
+    """
+    Permissions of one user compiled across all of their groups: the CRUD
+    bitmask of each module, granted by any group, and the bitmask of each
+    module per group for documents restricted to some groups.
+    """
+    __slots__ = ('user_id', 'is_active', 'masks', 'group_masks', 'group_ids', 'role_ids')
+
+    def __init__(self, user_id: str, is_active: bool, group_masks: Dict[str, Dict[str, int]],
+                 role_ids: Iterable[str] = ()):
+        self.user_id = user_id
+        self.is_active = is_active
+        self.group_masks = group_masks
+        self.group_ids: FrozenSet[str] = frozenset(group_masks)
+        self.role_ids: FrozenSet[str] = frozenset(role_ids)
+        masks: Dict[str, int] = {}
+        for modules in group_masks.values():
+            for module, mask in modules.items():
+                masks[module] = masks.get(module, 0) | mask
+        self.masks = masks
+
+    def can(self, operation: str, module: str) -> bool:
+        """
+        Tells whether any group of the user grants the operation ('c', 'r',
+        'u' or 'd') on the module.
+        """
+        return self.is_active and bool(self.masks.get(module, 0) & operation_bit(operation))
+
+    def can_access(self, operation: str, module: str, access_config) -> bool:
+        """
+        Tells whether the user may apply the operation to a document of the
+        module with the given access configuration (an AccessConfig, its
+        schema or its raw dict). Restricted documents require the operation
+        to be granted by one of their allowed groups.
+        """
+        if not self.can(operation, module):
+            return False
+        if access_config is None:
+            return True
+        if isinstance(access_config, Mapping):
+            access_type, allowed_groups = access_config.get('access_type'), access_config.get('allowed_groups')
+        else:
+            access_type, allowed_groups = access_config.access_type, access_config.allowed_groups
+        if AccessType(getattr(access_type, 'value', access_type)) == AccessType.PUBLIC:
+            return True
+        bit = operation_bit(operation)
+        return any(self.group_masks.get(_group_id(group), {}).get(module, 0) & bit for group in allowed_groups or ())
+
+def compile_permissions_many(user_ids: Iterable[str]) -> Dict[str, EffectivePermissions]:
+    """
+    Compiles the permissions of several users from their groups and the
+    roles they hold in each one, with one indexed query per collection.
+    Unknown and inactive users get no permissions.
+    """
+    user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+    users = load_documents(User, user_ids) if user_ids else {}
+    memberships = groups_for_users(list(users))
+    role_ids = {membership.role_id for user_memberships in memberships.values() for membership in user_memberships}
+    roles = load_documents(Role, role_ids) if role_ids else {}
+    compiled = {}
+    for user_id in user_ids:
+        if user_id not in users:
+            compiled[user_id] = EffectivePermissions(user_id, False, {})
+            continue
+        group_masks: Dict[str, Dict[str, int]] = {}
+        for membership in memberships[user_id]:
+            modules = group_masks.setdefault(membership.group_id, {})
+            for module, permission in roles.get(membership.role_id, {}).get('permissions', {}).items():
+                modules[module] = modules.get(module, 0) | permission_mask(permission)
+        user_role_ids = [membership.role_id for membership in memberships[user_id]]
+        compiled[user_id] = EffectivePermissions(user_id, users[user_id].get('is_active', True), group_masks, user_role_ids)
+    return compiled
+
+def compile_permissions(user_id: str) -> EffectivePermissions:
+    return compile_permissions_many([user_id])[str(user_id)]
+
+class PermissionIndex:
+    """
+    Process-local LRU of compiled permissions by user ID. Entries are
+    evicted through the invalidation hooks when the user, one of their
+    roles or a group they belong to is written. Writes that add members
+    to a group also invalidate the added users.
+    """
+    def __init__(self, max_users: int = DEFAULT_MAX_USERS):
+        self.max_users = max_users
+        self._reset()
+
+    def _reset(self) -> None:
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(self, user_id: str) -> EffectivePermissions:
+        return self.get_many([user_id])[str(user_id)]
+
+    def get_many(self, user_ids: Iterable[str]) -> Dict[str, EffectivePermissions]:
+        """
+        Returns the permissions of several users by ID, compiling the
+        missing ones together.
+        """
+        found = {}
+        pending = []
+        with self._lock:
+            for user_id in dict.fromkeys(str(value) for value in user_ids):
+                permissions = self._entries.get(user_id)
+                if permissions is None:
+                    pending.append(user_id)
+                else:
+                    self._entries.move_to_end(user_id)
+                    found[user_id] = permissions
+            generation = self._generation
+        if not pending:
+            return found
+        compiled = compile_permissions_many(pending)
+        with self._lock:
+            # Skip caching if an invalidation ran while compiling.
+            if self.max_users > 0 and generation == self._generation:
+                self._entries.update(compiled)
+                while len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+        found.update(compiled)
+        return found
+
+    def invalidate(self, collection: str, document_id: Optional[str] = None) -> None:
+        if collection not in ('users', 'roles', 'groups'):
+            return
+        if document_id is None:
+            self.clear()
+            return
+        with self._lock:
+            self._generation += 1
+            if collection == 'users':
+                self._entries.pop(document_id, None)
+                return
+            for user_id, permissions in list(self._entries.items()):
+                if (collection == 'roles' and document_id in permissions.role_ids
+                        or collection == 'groups' and document_id in permissions.group_ids):
+                    del self._entries[user_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+permission_index = PermissionIndex(int(os.getenv('PERMISSION_INDEX_MAX_USERS', DEFAULT_MAX_USERS)))
+register_invalidation_hook(permission_index.invalidate)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=permission_index._reset)
+
+def get_permissions(user_id: str) -> EffectivePermissions:
+    """
+    Returns the compiled permissions of a user, compiling them on a miss.
+    """
+    return permission_index.get(user_id)
+
+def get_permissions_many(user_ids: Iterable[str]) -> Dict[str, EffectivePermissions]:
+    return permission_index.get_many(user_ids)
+
+def can(user_id: str, operation: str, module: str, access_config=None) -> bool:
+    """
+    Tells whether the user may apply the operation to the module or, when
+    access_config is given, to a document of the module.
+    """
+    return get_permissions(user_id).can_access(operation, module, access_config)
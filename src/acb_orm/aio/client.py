@@ -0,0 +1,36 @@
+from pymongo import AsyncMongoClient
+from mongoengine import DEFAULT_CONNECTION_NAME
+from acb_orm.database.database import get_connection_settings
+
+_clients = {}
+
+def init_async_db(alias: str = DEFAULT_CONNECTION_NAME, **overrides) -> AsyncMongoClient:
+    """
+    Initialize an asynchronous MongoDB connection for an alias.
+    It reads the same environment variables and keyword arguments as
+    init_db, so sync and async code share one configuration.
+    """
+    settings = get_connection_settings(alias, **overrides)
+    settings.pop('alias')
+    db_name = settings.pop('db')
+    client_class = settings.pop('mongo_client_class', AsyncMongoClient)
+    client = client_class(**settings)
+    _clients[alias] = (client, db_name)
+    return client
+
+def get_async_db(alias: str = DEFAULT_CONNECTION_NAME):
+    """
+    Returns the asynchronous database registered under the alias.
+    """
+    if alias not in _clients:
+        raise EnvironmentError(f"No async connection registered for alias '{alias}'. Call init_async_db first.")
+    client, db_name = _clients[alias]
+    return client[db_name]
+
+async def close_async_db(alias: str = DEFAULT_CONNECTION_NAME) -> None:
+    """
+    Closes the asynchronous connection registered under the alias.
+    """
+    client, _ = _clients.pop(alias, (None, None))
+    if client is not None:
+        await client.close()
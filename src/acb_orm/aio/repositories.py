@@ -0,0 +1,59 @@
+from acb_orm.aio.repository import AsyncRepository
+from acb_orm.collections.templates_master import TemplatesMaster
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.collections.bulletins_master import BulletinsMaster
+from acb_orm.collections.bulletins_version import BulletinsVersion
+from acb_orm.collections.bulletin_reviews import BulletinReviews
+from acb_orm.collections.cards import Cards
+from acb_orm.schemas.templates_master_schema import TemplatesMasterRead
+from acb_orm.schemas.templates_version_schema import TemplatesVersionRead
+from acb_orm.schemas.bulletins_master_schema import BulletinsMasterRead
+from acb_orm.schemas.bulletins_version_schema import BulletinsVersionRead
+from acb_orm.schemas.bulletin_reviews_schema import BulletinReviewsRead
+from acb_orm.schemas.cards_schema import CardsRead
+# Imported so MongoEngine can resolve the string references of the models.
+from acb_orm.auxiliaries.access_config import AccessConfig
+from acb_orm.collections.users import User
+from acb_orm.collections.groups import Group
+
+class TemplatesMasterRepository(AsyncRepository):
+    """
+    Async access to the 'templates_master' collection.
+    """
+    document_cls = TemplatesMaster
+    read_schema = TemplatesMasterRead
+
+class TemplatesVersionRepository(AsyncRepository):
+    """
+    Async access to the 'templates_versions' collection.
+    """
+    document_cls = TemplatesVersion
+    read_schema = TemplatesVersionRead
+
+class BulletinsMasterRepository(AsyncRepository):
+    """
+    Async access to the 'bulletins_master' collection.
+    """
+    document_cls = BulletinsMaster
+    read_schema = BulletinsMasterRead
+
+class BulletinsVersionRepository(AsyncRepository):
+    """
+    Async access to the 'bulletins_versions' collection.
+    """
+    document_cls = BulletinsVersion
+    read_schema = BulletinsVersionRead
+
+class BulletinReviewsRepository(AsyncRepository):
+    """
+    Async access to the 'bulletin_reviews' collection.
+    """
+    document_cls = BulletinReviews
+    read_schema = BulletinReviewsRead
+
+class CardsRepository(AsyncRepository):
+    """
+    Async access to the 'cards' collection.
+    """
+    document_cls = Cards
+    read_schema = CardsRead
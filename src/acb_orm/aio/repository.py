@@ -0,0 +1,149 @@
+from typing import AsyncIterator, List, Optional, Union
+from bson import ObjectId
+from mongoengine import DEFAULT_CONNECTION_NAME, EmbeddedDocumentField
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+from acb_orm.aio.client import get_async_db
+from acb_orm.cache.version_cache import version_cache
+from acb_orm.converters.bson_to_read import to_read
+from acb_orm.storage.delta import DELTA_FIELDS, check_snapshot_update_async
+from acb_orm.storage.payloads import decode_documents_async
+
+class AsyncRepository:
+    """
+    Asynchronous data access for one collection, built on PyMongo's async
+    client. Collection name and indexes come from the MongoEngine model and
+    results are returned as its Pydantic *Read schema.
+    """
+    document_cls: type = None
+    read_schema: type = None
+    alias: str = DEFAULT_CONNECTION_NAME
+
+    def __init__(self, db=None):
+        self._db = db
+
+    @property
+    def database(self):
+        return self._db if self._db is not None else get_async_db(self.alias)
+
+    @property
+    def collection(self):
+        return self.database[self.document_cls._get_collection_name()]
+
+    def to_read(self, raw: dict) -> BaseModel:
+        return to_read(self.read_schema, raw)
+
+    async def decode(self, raws: List[dict]) -> List[dict]:
+        """
+        Decodes stored payloads (content blocks, delta versions) in raws.
+        """
+        return await decode_documents_async(self.document_cls, raws, self.database)
+
+    def to_mongo(self, data: Union[BaseModel, dict]) -> dict:
+        """
+        Converts a *Create schema or dict into the BSON document that the
+        MongoEngine model would store, including defaults and validation.
+        """
+        payload = data.model_dump(exclude_none=True) if isinstance(data, BaseModel) else dict(data)
+        document = self.document_cls(**payload)
+        document.validate()
+        return document.to_mongo().to_dict()
+
+    def to_mongo_update(self, data: Union[BaseModel, dict]) -> dict:
+        """
+        Converts a partial *Update schema or dict into a '$set' document.
+        Embedded documents are set field by field so unset fields keep their
+        stored values.
+        """
+        payload = data.model_dump(exclude_unset=True) if isinstance(data, BaseModel) else dict(data)
+        changes = {}
+        for name, value in payload.items():
+            field = self.document_cls._fields[name]
+            if isinstance(field, EmbeddedDocumentField) and isinstance(value, dict):
+                embedded_fields = field.document_type._fields
+                for sub_name, sub_value in value.items():
+                    if sub_value is None:
+                        continue
+                    sub_field = embedded_fields[sub_name]
+                    changes[f"{field.db_field}.{sub_field.db_field}"] = sub_field.to_mongo(sub_field.to_python(sub_value))
+            elif value is None:
+                changes[field.db_field] = None
+            else:
+                changes[field.db_field] = field.to_mongo(field.to_python(value))
+        return changes
+
+    async def ensure_indexes(self) -> None:
+        """
+        Creates the indexes declared in the MongoEngine model meta.
+        """
+        for spec in self.document_cls._meta['index_specs']:
+            options = {key: value for key, value in spec.items() if key != 'fields'}
+            await self.collection.create_index(spec['fields'], **options)
+
+    async def get(self, id: str) -> Optional[BaseModel]:
+        object_id = ObjectId(id)
+        raw = version_cache.get(self.document_cls, object_id)
+        if raw is None:
+            raw = await self.collection.find_one({'_id': object_id})
+            if raw is None:
+                return None
+            await self.decode([raw])
+            version_cache.put(self.document_cls, raw)
+        return self.to_read(raw)
+
+    def _find(self, filter: Optional[dict] = None, sort: Optional[list] = None, skip: int = 0, limit: int = 0, projection: Optional[dict] = None):
+        cursor = self.collection.find(filter or {}, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    async def list(self, filter: Optional[dict] = None, sort: Optional[list] = None, skip: int = 0, limit: int = 0) -> List[BaseModel]:
+        raws = await self.decode([raw async for raw in self._find(filter, sort, skip, limit)])
+        return [self.to_read(raw) for raw in raws]
+
+    async def stream(self, filter: Optional[dict] = None, sort: Optional[list] = None, batch_size: Optional[int] = None) -> AsyncIterator[BaseModel]:
+        """
+        Yields documents one by one as the cursor fetches them, without
+        loading the whole result in memory.
+        """
+        cursor = self._find(filter, sort)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        async for raw in cursor:
+            await self.decode([raw])
+            yield self.to_read(raw)
+
+    async def create(self, data: Union[BaseModel, dict]) -> BaseModel:
+        document = self.to_mongo(data)
+        result = await self.collection.insert_one(document)
+        document['_id'] = result.inserted_id
+        return self.to_read(document)
+
+    async def update(self, id: str, data: Union[BaseModel, dict]) -> Optional[BaseModel]:
+        """
+        Sets the given fields. For version models with delta storage, the
+        payload of a snapshot in use cannot change (ValueError), and a delta
+        version whose payload is set is stored in full from then on.
+        """
+        changes = self.to_mongo_update(data)
+        version_cache.invalidate(self.document_cls, ObjectId(id))
+        if not changes:
+            return await self.get(id)
+        update = {'$set': changes}
+        await check_snapshot_update_async(self.document_cls, [ObjectId(id)], update, self.database)
+        delta_field = getattr(self.document_cls, '_delta_field', None)
+        if delta_field is not None and self.document_cls._fields[delta_field].db_field in changes:
+            update['$unset'] = {name: '' for name in DELTA_FIELDS if name not in changes}
+        raw = await self.collection.find_one_and_update(
+            {'_id': ObjectId(id)},
+            update,
+            return_document=ReturnDocument.AFTER
+        )
+        if raw is None:
+            return None
+        await self.decode([raw])
+        return self.to_read(raw)
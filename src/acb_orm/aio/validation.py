@@ -0,0 +1,73 @@
+import asyncio
+from typing import Any, Dict, Iterable, List
+from bson import ObjectId
+from mongoengine import DEFAULT_CONNECTION_NAME
+from pydantic import BaseModel
+from acb_orm.aio.client import get_async_db
+from acb_orm.validations.reference_cache import lookup_reference, remember_reference
+from acb_orm.validations.valid_reference_id import ReferenceCheck, deferred_references, group_reference_checks, locate_reference_checks, raise_for_missing_references, collect_reference_checks, raise_for_instances
+
+async def find_missing_ids_async(values: Iterable[str], document_cls: type, db) -> List[str]:
+    """
+    Async counterpart of find_missing_ids: one '$in' query projecting only
+    '_id', skipping IDs already known to the active validation caches.
+    """
+    collection = document_cls._get_collection_name()
+    unique_ids = list(dict.fromkeys(str(value) for value in values))
+    known = {value: lookup_reference(collection, value) for value in unique_ids}
+    pending = [value for value, exists in known.items() if exists is None]
+    if pending:
+        cursor = db[collection].find(
+            {'_id': {'$in': [ObjectId(value) for value in pending]}},
+            {'_id': 1}
+        )
+        found = {str(doc['_id']) async for doc in cursor}
+        for value in pending:
+            known[value] = value in found
+            remember_reference(collection, value, known[value])
+    return [value for value in unique_ids if not known[value]]
+
+async def _find_missing_references(checks: Iterable[ReferenceCheck], db) -> Dict[type, set]:
+    references = group_reference_checks(checks)
+    results = await asyncio.gather(*(
+        find_missing_ids_async(values, document_cls, db)
+        for document_cls, values in references.items()
+    ))
+    return {document_cls: set(result) for document_cls, result in zip(references, results)}
+
+async def verify_reference_checks_async(title: str, checks: List[ReferenceCheck], db=None, alias: str = DEFAULT_CONNECTION_NAME) -> None:
+    """
+    Runs one batched existence query per referenced collection, all of them
+    concurrently, and raises a ValidationError for the failed checks.
+    """
+    if not checks:
+        return
+    db = db if db is not None else get_async_db(alias)
+    missing = await _find_missing_references(checks, db)
+    raise_for_missing_references(title, checks, missing)
+
+async def verify_references_async(*instances: BaseModel, db=None, alias: str = DEFAULT_CONNECTION_NAME) -> None:
+    """
+    Async counterpart of verify_references for schemas validated with
+    context={'check_refs': False}.
+    """
+    checks_per_instance = [collect_reference_checks(instance) for instance in instances]
+    all_checks = [check for checks in checks_per_instance for check in checks]
+    if not all_checks:
+        return
+    db = db if db is not None else get_async_db(alias)
+    missing = await _find_missing_references(all_checks, db)
+    raise_for_instances(list(instances), checks_per_instance, missing)
+
+async def validate_schema_async(schema_cls: type, data: Any, db=None, alias: str = DEFAULT_CONNECTION_NAME) -> BaseModel:
+    """
+    Validates data against a *Create or *Update schema without blocking.
+    The schema is parsed without touching the database and the referenced
+    IDs (users, groups, templates, bulletins...) are then checked with one
+    concurrent batched query per collection. Errors are reported as a
+    ValidationError with the same messages as the sync validators.
+    """
+    with deferred_references() as checks:
+        instance = schema_cls.model_validate(data)
+    await verify_reference_checks_async(schema_cls.__name__, locate_reference_checks(instance, checks), db, alias)
+    return instance
@@ -0,0 +1,188 @@
+import threading
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+from bson import ObjectId
+from mongoengine.connection import get_db
+from pymongo.errors import OperationFailure
+from acb_orm.cache.invalidation import notify_invalidation
+from acb_orm.collections.change_stream_tokens import ChangeStreamToken
+
+WATCHED_COLLECTIONS = ('roles', 'groups', 'users', 'templates_master', 'cards')
+
+# Server error code of a resume token that is no longer in the oplog.
+CHANGE_STREAM_HISTORY_LOST = 286
+
+_DOCUMENT_EVENTS = {'insert', 'update', 'replace', 'delete'}
+_COLLECTION_EVENTS = {'drop', 'rename'}
+
+def load_resume_token(name: str) -> Optional[dict]:
+    raw = ChangeStreamToken._get_collection().find_one({'_id': name}, {'token': 1})
+    return raw['token'] if raw is not None else None
+
+def save_resume_token(name: str, token: dict) -> None:
+    ChangeStreamToken._get_collection().update_one(
+        {'_id': name},
+        {'$set': {'token': token, 'updated_at': datetime.now()}},
+        upsert=True
+    )
+
+def invalidate_change(change: dict, collections: Iterable[str] = WATCHED_COLLECTIONS) -> None:
+    """
+    Evicts what a change event makes stale: the changed document for
+    inserts, updates, replaces and deletes, or every cached document of the
+    collection for drops and renames.
+    """
+    operation = change.get('operationType')
+    if operation == 'dropDatabase':
+        for collection in collections:
+            notify_invalidation(collection)
+        return
+    collection = change.get('ns', {}).get('coll')
+    if collection not in collections:
+        return
+    if operation in _DOCUMENT_EVENTS:
+        notify_invalidation(collection, str(change['documentKey']['_id']))
+    elif operation in _COLLECTION_EVENTS:
+        notify_invalidation(collection)
+
+class ChangeStreamInvalidator:
+    """
+    Tails the change stream of the watched collections and fires the
+    invalidation hooks for every change, so caches also follow the writes
+    of other services. The resume token of the last processed event is
+    stored under the subscriber name, and a restarted subscriber resumes
+    from it. If the token has fallen off the oplog, every watched
+    collection is invalidated before starting over.
+
+    watch(pipeline, resume_after) opens the stream; by default it watches
+    the database of the default connection.
+    """
+    def __init__(self, name: str = 'acb_orm', collections: Iterable[str] = WATCHED_COLLECTIONS,
+                 watch: Optional[Callable] = None):
+        self.name = name
+        self.collections = tuple(collections)
+        self._watch = watch or self._watch_database
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _watch_database(pipeline: List[dict], resume_after: Optional[dict]):
+        return get_db().watch(pipeline, resume_after=resume_after)
+
+    def pipeline(self) -> List[dict]:
+        return [{'$match': {'$or': [
+            {'ns.coll': {'$in': list(self.collections)}},
+            {'operationType': 'dropDatabase'}
+        ]}}]
+
+    def open(self):
+        token = load_resume_token(self.name)
+        try:
+            return self._watch(self.pipeline(), token)
+        except OperationFailure as exc:
+            if token is None or exc.code != CHANGE_STREAM_HISTORY_LOST:
+                raise
+        # Events were lost, so nothing cached before now can be trusted.
+        for collection in self.collections:
+            notify_invalidation(collection)
+        return self._watch(self.pipeline(), None)
+
+    def process(self, change: dict) -> None:
+        invalidate_change(change, self.collections)
+        save_resume_token(self.name, change['_id'])
+
+    def run(self, until_idle: bool = False) -> None:
+        """
+        Processes changes until stop() is called, or until no change is
+        pending when until_idle is set.
+        """
+        stream = self.open()
+        try:
+            while not self._stop.is_set() and stream.alive:
+                change = stream.try_next()
+                if change is not None:
+                    self.process(change)
+                elif until_idle:
+                    return
+        finally:
+            stream.close()
+
+    def start(self) -> threading.Thread:
+        """
+        Runs the subscriber in a daemon thread.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name=f"{self.name}-invalidator", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+class LocalEventBus:
+    """
+    In-process stand-in for MongoDB change streams, for tests and for
+    deployments without a replica set. Published events are kept, so
+    streams opened with a resume token replay the events after it.
+    Pipelines are ignored; ChangeStreamInvalidator filters events itself.
+    """
+    def __init__(self):
+        self._events: List[dict] = []
+        self._condition = threading.Condition()
+
+    def publish(self, collection: str, operation_type: str, document_id=None) -> dict:
+        with self._condition:
+            event = {
+                '_id': {'_data': f"{len(self._events) + 1:016x}"},
+                'operationType': operation_type,
+                'ns': {'db': 'local', 'coll': collection}
+            }
+            if document_id is not None:
+                key = ObjectId(document_id) if ObjectId.is_valid(str(document_id)) else document_id
+                event['documentKey'] = {'_id': key}
+            self._events.append(event)
+            self._condition.notify_all()
+        return event
+
+    def watch(self, pipeline: Optional[List[dict]] = None, resume_after: Optional[dict] = None) -> 'LocalChangeStream':
+        position = 0
+        if resume_after is not None:
+            position = int(resume_after['_data'], 16)
+            if position > len(self._events):
+                raise OperationFailure("resume token was not found", code=CHANGE_STREAM_HISTORY_LOST)
+        return LocalChangeStream(self, position)
+
+class LocalChangeStream:
+    """
+    Stream over a LocalEventBus with the subset of the pymongo ChangeStream
+    API used by ChangeStreamInvalidator.
+    """
+    def __init__(self, bus: LocalEventBus, position: int, max_await: float = 0.1):
+        self._bus = bus
+        self._position = position
+        self._max_await = max_await
+        self.alive = True
+        self.resume_token: Optional[dict] = None
+
+    def try_next(self) -> Optional[dict]:
+        with self._bus._condition:
+            if self._position >= len(self._bus._events):
+                self._bus._condition.wait(self._max_await)
+            if not self.alive or self._position >= len(self._bus._events):
+                return None
+            event = self._bus._events[self._position]
+            self._position += 1
+        self.resume_token = event['_id']
+        return event
+
+    def close(self) -> None:
+        self.alive = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,73 @@
+from typing import Callable, List, Optional
+from bson import ObjectId
+from mongoengine.queryset import QuerySet
+
+InvalidationHook = Callable[[str, Optional[str]], None]
+
+_hooks: List[InvalidationHook] = []
+
+def register_invalidation_hook(hook: InvalidationHook) -> InvalidationHook:
+    """
+    Registers hook(collection, document_id) to be called whenever documents
+    of the User, Role and Group models are written through the ORM, or a
+    ChangeStreamInvalidator reports a change in a watched collection.
+    document_id is None when any document of the collection may have
+    changed. Returns the hook, so it can be used as a decorator.
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+    return hook
+
+def unregister_invalidation_hook(hook: InvalidationHook) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+def notify_invalidation(collection: str, document_id: Optional[str] = None) -> None:
+    """
+    Calls every registered hook. All hooks run even if one of them fails;
+    the first error is raised afterwards.
+    """
+    error = None
+    for hook in list(_hooks):
+        try:
+            hook(collection, document_id)
+        except Exception as exc:
+            error = error or exc
+    if error is not None:
+        raise error
+
+class InvalidatingQuerySet(QuerySet):
+    """
+    QuerySet that fires the invalidation hooks after updates and deletes.
+    Writes filtered on a single '_id' invalidate that document only.
+    """
+    def _invalidate(self) -> None:
+        query = self._query
+        target = query.get('_id') if set(query) == {'_id'} else None
+        document_id = str(target) if isinstance(target, ObjectId) else None
+        notify_invalidation(self._document._get_collection_name(), document_id)
+
+    def update(self, *args, **kwargs):
+        result = super().update(*args, **kwargs)
+        self._invalidate()
+        return result
+
+    def modify(self, *args, **kwargs):
+        result = super().modify(*args, **kwargs)
+        self._invalidate()
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._invalidate()
+        return result
+
+class InvalidatingDocument:
+    """
+    Mixin that fires the invalidation hooks after a document is saved.
+    Deletes and updates go through InvalidatingQuerySet.
+    """
+    def save(self, *args, **kwargs):
+        result = super().save(*args, **kwargs)
+        notify_invalidation(self._get_collection_name(), str(self.pk))
+        return result
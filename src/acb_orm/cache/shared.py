@@ -0,0 +1,260 @@
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import quote
+import bson
+from bson import ObjectId
+from acb_orm.cache.invalidation import register_invalidation_hook, unregister_invalidation_hook
+from acb_orm.collections.groups import Group
+from acb_orm.collections.roles import Role
+from acb_orm.collections.users import User
+from acb_orm.converters.bson_to_read import to_read
+from acb_orm.queries.memberships import load_users_access
+from acb_orm.schemas.groups_schema import GroupsRead
+from acb_orm.schemas.roles_schema import RolesRead
+from acb_orm.schemas.users_schema import UsersRead
+
+DEFAULT_TTL = 300.0
+
+class SharedCacheBackend:
+    """
+    Interface of the stores behind SharedCache. Values are bytes and every
+    entry expires after its TTL, in seconds.
+    """
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+class LocalCacheBackend(SharedCacheBackend):
+    """
+    In-process stand-in for a shared store, used in tests and single-process
+    deployments.
+    """
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+class FileCacheBackend(SharedCacheBackend):
+    """
+    Store shared by every process of a host, with one file per entry in a
+    directory (ideally on a tmpfs such as /dev/shm). Files are replaced
+    atomically, so readers never see a partial entry.
+    """
+    _header = struct.Struct('!d')
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, quote(key, safe=''))
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < self._header.size:
+            return None
+        (expires_at,) = self._header.unpack_from(data)
+        if expires_at < time.time():
+            self.delete(key)
+            return None
+        return data[self._header.size:]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(self._header.pack(time.time() + ttl) + value)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def delete_prefix(self, prefix: str) -> None:
+        encoded = quote(prefix, safe='')
+        for name in os.listdir(self.directory):
+            if name.startswith(encoded):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            # Temporary files belong to set() calls that are still writing.
+            if name.startswith('.tmp-'):
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+class SharedCache:
+    """
+    Second-level cache of raw User, Role and Group documents, shared by the
+    worker processes through its backend. Entries expire after the TTL of
+    their collection and are invalidated when the documents are written
+    through the ORM.
+    """
+    collections = frozenset({'users', 'roles', 'groups'})
+
+    def __init__(self, backend: SharedCacheBackend, ttl: float = DEFAULT_TTL, ttls: Optional[Dict[str, float]] = None):
+        self.backend = backend
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(collection: str, document_id: str) -> str:
+        return f"{collection}:{document_id}"
+
+    def load(self, document_cls: type, ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        Returns the raw documents with the given IDs by ID, reading the
+        missing ones with a single '$in' query. Unknown IDs are left out.
+        Documents read while the collection is invalidated are returned but
+        not stored, since they may predate the write.
+        """
+        collection = document_cls._get_collection_name()
+        generation = self._generations.get(collection, 0)
+        documents = {}
+        pending = []
+        for document_id in dict.fromkeys(str(value) for value in ids):
+            value = self.backend.get(self.key(collection, document_id))
+            if value is None:
+                pending.append(document_id)
+            else:
+                documents[document_id] = bson.decode(value)
+        if pending:
+            ttl = self.ttls.get(collection, self.ttl)
+            raws = list(document_cls._get_collection().find({'_id': {'$in': [ObjectId(value) for value in pending]}}))
+            for raw in raws:
+                documents[str(raw['_id'])] = raw
+            if self._generations.get(collection, 0) == generation:
+                for raw in raws:
+                    self.backend.set(self.key(collection, str(raw['_id'])), bson.encode(raw), ttl)
+        return documents
+
+    def invalidate(self, collection: str, document_id: Optional[str] = None) -> None:
+        if collection not in self.collections:
+            return
+        with self._lock:
+            self._generations[collection] = self._generations.get(collection, 0) + 1
+        if document_id is None:
+            self.backend.delete_prefix(f"{collection}:")
+        else:
+            self.backend.delete(self.key(collection, document_id))
+
+_shared_cache: Optional[SharedCache] = None
+
+def configure_shared_cache(backend: Optional[SharedCacheBackend] = None, ttl: float = DEFAULT_TTL,
+                           ttls: Optional[Dict[str, float]] = None) -> SharedCache:
+    """
+    Enables the shared cache with the given backend (by default an
+    in-process LocalCacheBackend) and registers its invalidation hook.
+    ttls overrides the TTL per collection name.
+    """
+    disable_shared_cache()
+    global _shared_cache
+    _shared_cache = SharedCache(backend or LocalCacheBackend(), ttl, ttls)
+    register_invalidation_hook(_shared_cache.invalidate)
+    return _shared_cache
+
+def disable_shared_cache() -> None:
+    global _shared_cache
+    if _shared_cache is not None:
+        unregister_invalidation_hook(_shared_cache.invalidate)
+    _shared_cache = None
+
+def get_shared_cache() -> Optional[SharedCache]:
+    return _shared_cache
+
+def load_documents(document_cls: type, ids: Iterable[str]) -> Dict[str, dict]:
+    """
+    Returns raw documents by ID through the shared cache, or straight from
+    the database when it is disabled.
+    """
+    if _shared_cache is not None:
+        return _shared_cache.load(document_cls, ids)
+    cursor = document_cls._get_collection().find({'_id': {'$in': [ObjectId(value) for value in ids]}})
+    return {str(raw['_id']): raw for raw in cursor}
+
+def _read_one(document_cls: type, schema_cls: type, document_id: str):
+    raw = load_documents(document_cls, [document_id]).get(str(document_id))
+    return to_read(schema_cls, raw) if raw is not None else None
+
+def get_user(user_id: str) -> Optional[UsersRead]:
+    return _read_one(User, UsersRead, user_id)
+
+def get_role(role_id: str) -> Optional[RolesRead]:
+    return _read_one(Role, RolesRead, role_id)
+
+def get_roles(role_ids: Iterable[str]) -> List[RolesRead]:
+    """
+    Returns the roles with the given IDs, with one query for those that are
+    not cached.
+    """
+    return [to_read(RolesRead, raw) for raw in load_documents(Role, role_ids).values()]
+
+def get_group(group_id: str) -> Optional[GroupsRead]:
+    """
+    Returns a group with its members. The members of groups in external
+    membership mode are not cached; they are read from group_memberships.
+    """
+    raw = load_documents(Group, [group_id]).get(str(group_id))
+    if raw is None:
+        return None
+    return to_read(GroupsRead, load_users_access([dict(raw)])[0])
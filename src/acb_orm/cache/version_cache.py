@@ -0,0 +1,237 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Set
+import bson
+from bson import ObjectId
+from acb_orm.storage.delta import DeltaQuerySet
+from acb_orm.storage.payloads import decode_documents
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Models whose documents never change once created and can be cached.
+_cached_documents: Set[type] = set()
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class VersionCache:
+    """
+    Process-local LRU of immutable documents by collection and '_id',
+    bounded by the total BSON size of the entries. Documents are kept
+    decoded (decompressed, with blocks and deltas rebuilt) and as BSON, so
+    each hit returns a fresh copy. The cache is emptied in forked children.
+    """
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._reset()
+
+    def _reset(self) -> None:
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def enabled_for(self, document_cls: type) -> bool:
+        return self.max_bytes > 0 and document_cls in _cached_documents
+
+    def get(self, document_cls: type, object_id: ObjectId) -> Optional[dict]:
+        if not self.enabled_for(document_cls):
+            return None
+        key = (document_cls._get_collection_name(), object_id)
+        with self._lock:
+            encoded = self._entries.get(key)
+            if encoded is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return bson.decode(encoded)
+
+    def contains(self, collection: str, object_id: ObjectId) -> bool:
+        """
+        Tells whether a document is cached, without counting a lookup.
+        """
+        with self._lock:
+            return (collection, object_id) in self._entries
+
+    def put(self, document_cls: type, raw: dict) -> None:
+        if not self.enabled_for(document_cls):
+            return
+        encoded = bson.encode(raw)
+        if len(encoded) > self.max_bytes:
+            return
+        key = (document_cls._get_collection_name(), raw['_id'])
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = encoded
+            self._size += len(encoded)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._entries and self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self._evictions += 1
+
+    def resize(self, max_bytes: int) -> None:
+        """
+        Sets the size limit, evicting the least recently used entries that
+        no longer fit. 0 disables the cache.
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def invalidate(self, document_cls: type, object_id: Optional[ObjectId] = None) -> None:
+        """
+        Removes one document, or every document of the collection when
+        object_id is None.
+        """
+        collection = document_cls._get_collection_name()
+        with self._lock:
+            keys = [(collection, object_id)] if object_id is not None else [key for key in self._entries if key[0] == collection]
+            for key in keys:
+                encoded = self._entries.pop(key, None)
+                if encoded is not None:
+                    self._size -= len(encoded)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._size)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+version_cache = VersionCache(int(os.getenv('VERSION_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)))
+
+if hasattr(os, 'register_at_fork'):
+    # A lock held by another thread while forking would never be released
+    # in the child, so the child starts with a fresh, empty cache.
+    os.register_at_fork(after_in_child=version_cache._reset)
+
+def load_cached(document_cls: type, object_id: ObjectId, collection=None) -> Optional[dict]:
+    """
+    Returns the decoded raw document from the cache, or loads it with one
+    query and caches it. Returns None if it does not exist.
+    """
+    raw = version_cache.get(document_cls, object_id)
+    if raw is not None:
+        return raw
+    collection = collection if collection is not None else document_cls._get_collection()
+    raw = collection.find_one({'_id': object_id})
+    if raw is None:
+        return None
+    decode_documents(document_cls, [raw], collection)
+    version_cache.put(document_cls, raw)
+    return raw
+
+def load_cached_many(document_cls: type, object_ids: Iterable[ObjectId], collection=None, session=None) -> Dict[ObjectId, dict]:
+    """
+    Batched load_cached: returns the decoded raw documents by ID, loading
+    the ones missing from the cache with one '$in' query. Unknown IDs are
+    left out.
+    """
+    found = {}
+    missing = []
+    for object_id in dict.fromkeys(object_ids):
+        raw = version_cache.get(document_cls, object_id)
+        if raw is None:
+            missing.append(object_id)
+        else:
+            found[object_id] = raw
+    if missing:
+        collection = collection if collection is not None else document_cls._get_collection()
+        raws = list(collection.find({'_id': {'$in': missing}}, session=session))
+        decode_documents(document_cls, raws, collection)
+        for raw in raws:
+            version_cache.put(document_cls, raw)
+            found[raw['_id']] = raw
+    return found
+
+class CachedQuerySet(DeltaQuerySet):
+    """
+    QuerySet of immutable documents. get(id=...) and with_id() on an
+    unfiltered queryset are served from the version cache; updates and
+    deletes through the queryset invalidate the cached documents of the
+    collection.
+    """
+    def _cached_id(self, q_objs: tuple, query: dict) -> Optional[ObjectId]:
+        if q_objs or len(query) != 1 or not version_cache.enabled_for(self._document):
+            return None
+        if self._query_obj or self._loaded_fields or self._none or self._as_pymongo or self._scalar:
+            return None
+        value = query.get('id', query.get('pk'))
+        if isinstance(value, ObjectId):
+            return value
+        return ObjectId(value) if isinstance(value, str) and ObjectId.is_valid(value) else None
+
+    def _from_cache(self, object_id: ObjectId):
+        raw = load_cached(self._document, object_id, self._collection)
+        return self._document._from_son(raw, _auto_dereference=self._auto_dereference) if raw is not None else None
+
+    def get(self, *q_objs, **query):
+        object_id = self._cached_id(q_objs, query)
+        if object_id is None:
+            return super().get(*q_objs, **query)
+        document = self._from_cache(object_id)
+        if document is None:
+            raise self._document.DoesNotExist(f"{self._document._class_name} matching query does not exist.")
+        return document
+
+    def with_id(self, object_id):
+        cached_id = self._cached_id((), {'id': object_id})
+        if cached_id is None:
+            return super().with_id(object_id)
+        return self._from_cache(cached_id)
+
+    def update(self, *args, **kwargs):
+        version_cache.invalidate(self._document)
+        return super().update(*args, **kwargs)
+
+    def modify(self, *args, **kwargs):
+        version_cache.invalidate(self._document)
+        return super().modify(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        version_cache.invalidate(self._document)
+        return super().delete(*args, **kwargs)
+
+class CachedDocument:
+    """
+    Mixin for models of immutable documents served from the version cache.
+    Saving or deleting a document through the ORM evicts it.
+    """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _cached_documents.add(cls)
+
+    def save(self, *args, **kwargs):
+        try:
+            return super().save(*args, **kwargs)
+        finally:
+            if self.pk is not None:
+                version_cache.invalidate(type(self), self.pk)
+
+    def delete(self, *args, **kwargs):
+        version_cache.invalidate(type(self), self.pk)
+        return super().delete(*args, **kwargs)
@@ -12,7 +12,8 @@ class BulletinReviews(Document):
         'indexes': [
             'bulletin_master_id',
             'reviewer_user_id',
-            'completed_at'
+            'completed_at',
+            {'fields': ['bulletin_master_id', 'log.created_at', 'id']}
         ]
     }
 
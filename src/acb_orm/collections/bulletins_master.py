@@ -13,7 +13,10 @@ class BulletinsMaster(Document):
         'indexes': [
             'bulletin_name',
             'base_template_master_id',
-            'current_version_id'
+            'current_version_id',
+            {'fields': ['log.created_at', 'id']},
+            {'fields': ['access_config.access_type', 'log.created_at', 'id']},
+            {'fields': ['access_config.allowed_groups', 'log.created_at', 'id']}
         ]
     }
     
@@ -1,22 +1,40 @@
-from mongoengine import Document, StringField, EmbeddedDocumentField, ReferenceField, EnumField, DictField
+from mongoengine import Document, IntField, StringField, EmbeddedDocumentField, ReferenceField, EnumField, DictField, ObjectIdField, ListField
 from acb_orm.auxiliaries.log import Log
+from acb_orm.cache.version_cache import CachedDocument, CachedQuerySet
+from acb_orm.storage.compression import CompressedDictField, CompressedFields
+from acb_orm.storage.delta import DeltaEncodedVersion
 
-class BulletinsVersion(Document):
+class BulletinsVersion(CachedDocument, DeltaEncodedVersion, CompressedFields, Document):
     """
     This model maps to the 'bulletins_versions' collection. It stores each
     immutable version of a bulletin, with the specific data entered by the
     user.
     """
+    _delta_field = 'data'
     meta = {
         'collection': 'bulletins_versions',
+        'queryset_class': CachedQuerySet,
         'indexes': [
             'bulletin_master_id',
-            'version_num'
+            'version_num',
+            {'fields': ['bulletin_master_id', 'log.created_at', 'id']},
+            {
+                'fields': ['bulletin_master_id', '-version_num_int'],
+                'unique': True,
+                'partialFilterExpression': {'version_num_int': {'$exists': True}}
+            },
+            {'fields': ['delta_base_id'], 'sparse': True}
         ]
     }
 
     bulletin_master_id = ReferenceField('BulletinsMaster', required=True)
     version_num = StringField(required=True)
+    version_num_int = IntField(min_value=1)
     previous_version_id = ReferenceField('self')
     log = EmbeddedDocumentField(Log, required=True)
-    data = DictField(required=True)
+    data = CompressedDictField(required=True)
+    # Delta storage: set when the payload is stored as a patch against the
+    # snapshot delta_base_id (see acb_orm.storage.delta).
+    delta_base_id = ObjectIdField()
+    delta = ListField(DictField(), default=None)
+    delta_depth = IntField()
@@ -1,19 +1,26 @@
-from mongoengine import Document, StringField, ListField, EmbeddedDocumentField, ReferenceField, DictField
+from mongoengine import Document, StringField, ListField, EmbeddedDocumentField, ReferenceField
 from acb_orm.auxiliaries.access_config import AccessConfig
 from acb_orm.auxiliaries.log import Log
 from acb_orm.collections.templates_master import TemplatesMaster
+from acb_orm.storage.blocks import BlockStoredContent
+from acb_orm.storage.compression import CompressedDictField, CompressedFields
 
-class Cards(Document):
+class Cards(BlockStoredContent, CompressedFields, Document):
     """
     Model for the 'cards' collection.
     Predefined content library for insertion into bulletins.
     """
+    _block_field = 'content'
     meta = {
         'collection': 'cards',
         'indexes': [
             {'fields': ['card_name'], 'unique': True},
             'card_type',
-            'templates_master_ids'
+            'templates_master_ids',
+            {'fields': ['card_type', 'log.created_at', 'id']},
+            {'fields': ['log.created_at', 'id']},
+            {'fields': ['access_config.access_type', 'log.created_at', 'id']},
+            {'fields': ['access_config.allowed_groups', 'log.created_at', 'id']}
         ]
     }
 
@@ -21,5 +28,5 @@ class Cards(Document):
     card_type = StringField(required=True)
     templates_master_ids = ListField(ReferenceField(TemplatesMaster), required=True)
     access_config = EmbeddedDocumentField(AccessConfig, required=True)
-    content = DictField(required=True)
+    content = CompressedDictField(required=True)
     log = EmbeddedDocumentField(Log, required=True)
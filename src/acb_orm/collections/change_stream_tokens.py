@@ -0,0 +1,14 @@
+from datetime import datetime
+from mongoengine import Document, StringField, DictField, DateTimeField
+
+class ChangeStreamToken(Document):
+    """
+    This model maps to the 'change_stream_tokens' collection. It keeps the
+    resume token of the last change event processed by each change stream
+    subscriber, keyed by the subscriber name.
+    """
+    meta = {'collection': 'change_stream_tokens'}
+
+    id = StringField(primary_key=True)
+    token = DictField(required=True)
+    updated_at = DateTimeField(default=datetime.now)
@@ -0,0 +1,18 @@
+from mongoengine import Document, StringField, DictField, ListField, IntField, DateTimeField
+
+class ContentBlock(Document):
+    """
+    This model maps to the 'content_blocks' collection. It stores the
+    sub-documents shared by template and card contents once, keyed by the
+    SHA-256 hash of their canonical JSON.
+    """
+    meta = {
+        'collection': 'content_blocks',
+        'indexes': ['stored_at']
+    }
+
+    id = StringField(primary_key=True)
+    content = DictField(required=True)
+    children = ListField(StringField())
+    size = IntField()
+    stored_at = DateTimeField()
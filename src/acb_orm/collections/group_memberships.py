@@ -0,0 +1,24 @@
+from mongoengine import CASCADE, Document, ReferenceField
+from acb_orm.collections.groups import Group
+from acb_orm.collections.roles import Role
+from acb_orm.collections.users import User
+
+class GroupMembership(Document):
+    """
+    This model maps to the 'group_memberships' collection. It holds the
+    members of groups in external membership mode, one document per
+    (group, user, role), instead of the group's embedded users_access.
+    Deleting a group through the ORM deletes its memberships.
+    """
+    meta = {
+        'collection': 'group_memberships',
+        'indexes': [
+            {'fields': ['group_id', 'user_id', 'role_id'], 'unique': True},
+            {'fields': ['group_id', 'id']},
+            'user_id'
+        ]
+    }
+
+    group_id = ReferenceField(Group, required=True, reverse_delete_rule=CASCADE)
+    user_id = ReferenceField(User, required=True)
+    role_id = ReferenceField(Role, required=True)
@@ -1,17 +1,23 @@
-from mongoengine import Document, StringField, ListField, EmbeddedDocumentField
+from mongoengine import Document, StringField, ListField, EmbeddedDocumentField, EnumField
 from acb_orm.auxiliaries.log import Log
 from acb_orm.auxiliaries.user_access import UserAccess
+from acb_orm.cache.invalidation import InvalidatingDocument, InvalidatingQuerySet, notify_invalidation
+from acb_orm.enums.membership_mode import MembershipMode
 
-class Group(Document):
+class Group(InvalidatingDocument, Document):
     """
     This model maps to the 'groups' collection. It organizes users by
-    affiliation and stores their roles within the group.
+    affiliation and stores their roles within the group. Groups in external
+    membership mode keep their members in 'group_memberships' instead of
+    users_access.
     """
     meta = {
         'collection': 'groups',
+        'queryset_class': InvalidatingQuerySet,
         'indexes': [
             {'fields': ['group_name'], 'unique': True},
-            'country'
+            'country',
+            'users_access.user_id'
         ]
     }
 
@@ -19,4 +25,18 @@ class Group(Document):
     country = StringField(required=True)
     description = StringField(required=False)
     users_access = ListField(EmbeddedDocumentField(UserAccess), default=list)
-    log = EmbeddedDocumentField(Log, required=True)
\ No newline at end of file
+    membership_mode = EnumField(MembershipMode, default=MembershipMode.EMBEDDED)
+    log = EmbeddedDocumentField(Log, required=True)
+
+    def save(self, *args, **kwargs):
+        members_changed = self._created or any(field.split('.')[0] == 'users_access' for field in self._get_changed_fields())
+        result = super().save(*args, **kwargs)
+        if members_changed:
+            # Cached permissions of new members do not list this group yet.
+            for user_id in dict.fromkeys(str(access['user_id']) for access in self.to_mongo().get('users_access', [])):
+                notify_invalidation('users', user_id)
+        return result
+
+# Registers the cascade from groups to their external memberships whenever
+# Group is loaded, even if GroupMembership is never imported directly.
+from acb_orm.collections import group_memberships
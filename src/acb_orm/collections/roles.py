@@ -1,12 +1,14 @@
 from mongoengine import Document, StringField, DictField, EmbeddedDocumentField
+from acb_orm.cache.invalidation import InvalidatingDocument, InvalidatingQuerySet
 
-class Role(Document):
+class Role(InvalidatingDocument, Document):
     """
     This model maps to the 'roles' collection. It defines the different
     roles available in the system and their associated permissions.
     """
     meta = {
         'collection': 'roles',
+        'queryset_class': InvalidatingQuerySet,
         'indexes': [
             {'fields': ['role_name'], 'unique': True}
         ]
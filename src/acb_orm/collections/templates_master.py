@@ -13,7 +13,9 @@ class TemplatesMaster(Document):
         'collection': 'templates_master',
         'indexes': [
             'template_name',
-            'current_version_id'
+            'current_version_id',
+            {'fields': ['access_config.access_type', 'log.created_at', 'id']},
+            {'fields': ['access_config.allowed_groups', 'log.created_at', 'id']}
         ]
     }
 
@@ -1,24 +1,43 @@
-from mongoengine import Document, StringField, ObjectIdField, EmbeddedDocumentField, EmbeddedDocument, DictField, ReferenceField
+from mongoengine import Document, IntField, StringField, ObjectIdField, EmbeddedDocumentField, EmbeddedDocument, DictField, ReferenceField, ListField
 from acb_orm.auxiliaries.log import Log
+from acb_orm.cache.version_cache import CachedDocument, CachedQuerySet
+from acb_orm.storage.blocks import BlockStoredContent
+from acb_orm.storage.compression import CompressedDictField, CompressedFields
+from acb_orm.storage.delta import DeltaEncodedVersion
 
-class TemplatesVersion(Document):
+class TemplatesVersion(CachedDocument, DeltaEncodedVersion, BlockStoredContent, CompressedFields, Document):
     """
     This model maps to the 'templates_versions' collection. It stores each
     immutable version of a template, including its complete structure and
     design at a specific point in time.
     """
+    _delta_field = 'content'
+    _block_field = 'content'
     meta = {
         'collection': 'templates_versions',
+        'queryset_class': CachedQuerySet,
         'indexes': [
             'template_master_id',
             'version_num',
-            'previous_version_id'
+            'previous_version_id',
+            {
+                'fields': ['template_master_id', '-version_num_int'],
+                'unique': True,
+                'partialFilterExpression': {'version_num_int': {'$exists': True}}
+            },
+            {'fields': ['delta_base_id'], 'sparse': True}
         ]
     }
 
     template_master_id = ReferenceField('TemplatesMaster')
     previous_version_id = ReferenceField('self')
     version_num = StringField()
+    version_num_int = IntField(min_value=1)
     commit_message = StringField(required=True)
-    content = DictField(required=True)
-    log = EmbeddedDocumentField(Log)
\ No newline at end of file
+    content = CompressedDictField(required=True)
+    log = EmbeddedDocumentField(Log)
+    # Delta storage: set when the payload is stored as a patch against the
+    # snapshot delta_base_id (see acb_orm.storage.delta).
+    delta_base_id = ObjectIdField()
+    delta = ListField(DictField(), default=None)
+    delta_depth = IntField()
@@ -1,13 +1,15 @@
 from mongoengine import Document, StringField, BooleanField, EmbeddedDocumentField
 from acb_orm.auxiliaries.log import Log
+from acb_orm.cache.invalidation import InvalidatingDocument, InvalidatingQuerySet
 
-class User(Document):
+class User(InvalidatingDocument, Document):
     """
     This model maps to the 'users' collection. It stores user information
     and a link to an external ID.
     """
     meta = {
         'collection': 'users',
+        'queryset_class': InvalidatingQuerySet,
         'indexes': [
             {'fields': ['ext_id'], 'unique': True}
         ]
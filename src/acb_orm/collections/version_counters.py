@@ -0,0 +1,12 @@
+from mongoengine import Document, StringField, IntField
+
+class VersionCounter(Document):
+    """
+    This model maps to the 'version_counters' collection. It keeps the last
+    version number allocated to each bulletin or template master, keyed by
+    '<versions collection>:<master id>'.
+    """
+    meta = {'collection': 'version_counters'}
+
+    id = StringField(primary_key=True)
+    seq = IntField(default=0)
@@ -9,7 +9,13 @@ class VisualResources(Document):
     Model for the 'visual_resources' collection.
     Metadata catalog for visual files stored on the server.
     """
-    meta = {'collection': 'visual_resources'}
+    meta = {
+        'collection': 'visual_resources',
+        'indexes': [
+            {'fields': ['access_config.access_type', 'log.created_at', 'id']},
+            {'fields': ['access_config.allowed_groups', 'log.created_at', 'id']}
+        ]
+    }
 
     file_url = StringField(required=True)
     file_name = StringField(required=True)
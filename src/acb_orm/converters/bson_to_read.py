@@ -0,0 +1,67 @@
+from typing import Any, Iterable, Iterator, List, Optional
+from bson import DBRef, ObjectId
+from pydantic import BaseModel
+from acb_orm.database.read_routing import route_read
+from acb_orm.storage.compression import decompress_value
+from acb_orm.storage.payloads import iter_decoded
+
+# Free-form payloads stored as given by the user. They are passed through
+# untouched instead of being walked value by value, once decompressed.
+OPAQUE_FIELDS = frozenset({'content', 'data'})
+
+def to_plain(value: Any) -> Any:
+    """
+    Converts BSON values into values accepted by the *Read schemas.
+    ObjectIds and DBRefs of reference fields become strings and embedded
+    documents (Log, AccessConfig, UserAccess, Comment...) become plain dicts.
+    """
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_plain(item) for item in value]
+    if isinstance(value, DBRef):
+        return str(value.id)
+    return value
+
+def to_read_dict(raw: dict) -> dict:
+    """
+    Converts a raw document, as returned by pymongo or as_pymongo(), into
+    the dict expected by its *Read schema: '_id' becomes 'id'.
+    """
+    plain = {}
+    for key, value in raw.items():
+        if key == '_id':
+            plain['id'] = str(value)
+        elif key in OPAQUE_FIELDS:
+            plain[key] = decompress_value(value)
+        else:
+            plain[key] = to_plain(value)
+    return plain
+
+def to_read(schema_cls: type, raw: dict) -> BaseModel:
+    """
+    Builds a *Read schema straight from a raw BSON document, without
+    hydrating a MongoEngine document.
+    """
+    return schema_cls.model_validate(to_read_dict(raw))
+
+def iter_read(schema_cls: type, raws: Iterable[dict]) -> Iterator[BaseModel]:
+    """
+    Converts a cursor, or any iterable of raw documents, lazily.
+    """
+    for raw in raws:
+        yield to_read(schema_cls, raw)
+
+def read_queryset(queryset, schema_cls: type, secondary: Optional[bool] = None) -> Iterator[BaseModel]:
+    """
+    Runs a MongoEngine queryset as raw documents and converts each one to
+    schema_cls. The query follows the read routing rules of route_read.
+    Stored payloads (content blocks, delta versions) are decoded in batches.
+    """
+    raws = route_read(queryset, secondary).as_pymongo()
+    return iter_read(schema_cls, iter_decoded(queryset._document, raws))
+
+def read_all(queryset, schema_cls: type, secondary: Optional[bool] = None) -> List[BaseModel]:
+    return list(read_queryset(queryset, schema_cls, secondary))
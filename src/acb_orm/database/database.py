@@ -1,19 +1,110 @@
 import os
 from dotenv import load_dotenv
-from mongoengine import connect
+from mongoengine import connect, DEFAULT_CONNECTION_NAME
 
 load_dotenv()
 
-def init_db():
+READ_ALIAS = "read_replica"
+
+# Client options that can be set through environment variables.
+# The variable name is the alias prefix followed by the suffix below, e.g.
+# DATABASE_MAX_POOL_SIZE for the default alias or
+# DATABASE_READ_REPLICA_MAX_POOL_SIZE for the read replica alias.
+CLIENT_OPTIONS = {
+    'maxPoolSize': ('MAX_POOL_SIZE', int),
+    'minPoolSize': ('MIN_POOL_SIZE', int),
+    'maxIdleTimeMS': ('MAX_IDLE_TIME_MS', int),
+    'waitQueueTimeoutMS': ('WAIT_QUEUE_TIMEOUT_MS', int),
+    'connectTimeoutMS': ('CONNECT_TIMEOUT_MS', int),
+    'serverSelectionTimeoutMS': ('SERVER_SELECTION_TIMEOUT_MS', int),
+    'socketTimeoutMS': ('SOCKET_TIMEOUT_MS', int),
+    'compressors': ('COMPRESSORS', str),
+    'zlibCompressionLevel': ('ZLIB_COMPRESSION_LEVEL', int),
+    'readPreference': ('READ_PREFERENCE', str),
+    'readPreferenceTags': ('READ_PREFERENCE_TAGS', str),
+    'maxStalenessSeconds': ('MAX_STALENESS_SECONDS', int),
+    'w': ('WRITE_CONCERN', str),
+    'wTimeoutMS': ('WRITE_CONCERN_TIMEOUT_MS', int),
+    'journal': ('JOURNAL', str),
+}
+
+def _env_prefix(alias: str) -> str:
+    if alias == DEFAULT_CONNECTION_NAME:
+        return "DATABASE_"
+    return f"DATABASE_{alias.upper()}_"
+
+def _parse_read_preference_tags(value: str) -> list:
+    """
+    Splits tag sets written as 'dc:ny,rack:1;dc:ny' into the list of
+    'key:value,...' strings pymongo accepts for readPreferenceTags.
+    Tag sets are tried in order; an empty tag set ('') matches any member.
+    """
+    tag_sets = []
+    for tag_set in value.split(';'):
+        pairs = [':'.join(part.strip() for part in pair.partition(':')[::2]) for pair in filter(None, tag_set.split(','))]
+        tag_sets.append(','.join(pairs))
+    return tag_sets
+
+def _parse_option(name: str, value: str, cast: type):
+    if name == 'readPreferenceTags':
+        return _parse_read_preference_tags(value)
+    if name == 'w':
+        return int(value) if value.isdigit() else value
+    if name == 'journal':
+        return value.lower() in ('1', 'true', 'yes')
+    return cast(value)
+
+def get_connection_settings(alias: str = DEFAULT_CONNECTION_NAME, **overrides) -> dict:
+    """
+    Builds the keyword arguments passed to mongoengine.connect for an alias.
+
+    The connection string and database name are read from <PREFIX>URI and
+    <PREFIX>NAME, where the prefix is 'DATABASE_' for the default alias and
+    'DATABASE_<ALIAS>_' for named aliases. Named aliases fall back to
+    DATABASE_URI and DATABASE_NAME, so a read replica alias can share the
+    cluster of the default one and only change its read preference.
+    Keyword arguments take precedence over environment variables.
+    """
+    prefix = _env_prefix(alias)
+    uri = overrides.pop('host', None) or os.getenv(f"{prefix}URI") or os.getenv("DATABASE_URI")
+    db_name = overrides.pop('db', None) or os.getenv(f"{prefix}NAME") or os.getenv("DATABASE_NAME")
+    if not uri or not db_name:
+        raise EnvironmentError("DATABASE_URI and DATABASE_NAME must be set as environment variables.")
+
+    settings = {'db': db_name, 'host': uri, 'alias': alias}
+    if alias == READ_ALIAS:
+        settings['readPreference'] = 'secondaryPreferred'
+    for name, (suffix, cast) in CLIENT_OPTIONS.items():
+        value = os.getenv(f"{prefix}{suffix}")
+        if value:
+            settings[name] = _parse_option(name, value, cast)
+    settings.update(overrides)
+    return settings
+
+def init_db(alias: str = DEFAULT_CONNECTION_NAME, **overrides):
     """
     Initialize the MongoDB connection using environment variables.
 
     Required environment variables:
     - DATABASE_URI: The full MongoDB connection string.
     - DATABASE_NAME: The name of the database to connect to.
+
+    Optional environment variables (see CLIENT_OPTIONS for the full list):
+    - DATABASE_MAX_POOL_SIZE, DATABASE_MIN_POOL_SIZE, DATABASE_MAX_IDLE_TIME_MS,
+      DATABASE_WAIT_QUEUE_TIMEOUT_MS: Connection pool sizing and timeouts.
+    - DATABASE_COMPRESSORS: Network compressors, e.g. 'zstd,snappy,zlib'.
+    - DATABASE_READ_PREFERENCE, DATABASE_READ_PREFERENCE_TAGS: Read routing.
+    - DATABASE_WRITE_CONCERN: Write concern, e.g. 'majority' or '1'.
+
+    Any pymongo client option can also be passed as a keyword argument.
+    Returns the MongoClient registered under the alias.
     """
-    uri = os.getenv("DATABASE_URI")
-    db_name = os.getenv("DATABASE_NAME")
-    if not uri or not db_name:
-        raise EnvironmentError("DATABASE_URI and DATABASE_NAME must be set as environment variables.")
-    connect(db=db_name, host=uri)
\ No newline at end of file
+    return connect(**get_connection_settings(alias, **overrides))
+
+def init_read_replica(**overrides):
+    """
+    Registers the read replica connection under READ_ALIAS.
+    It is configured with the DATABASE_READ_REPLICA_* variables and reads
+    from secondaries ('secondaryPreferred') unless told otherwise.
+    """
+    return init_db(READ_ALIAS, **overrides)
@@ -0,0 +1,89 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from mongoengine import DEFAULT_CONNECTION_NAME, get_connection, get_db
+from mongoengine.connection import ConnectionFailure
+from pymongo.read_preferences import SecondaryPreferred
+from acb_orm.database.database import READ_ALIAS
+
+# MongoDB rejects a maxStalenessSeconds lower than 90 seconds.
+DEFAULT_MAX_STALENESS_SECONDS = 90
+
+_secondary_reads: ContextVar[Optional[int]] = ContextVar('acb_orm_secondary_reads', default=None)
+_causal_session: ContextVar = ContextVar('acb_orm_causal_session', default=None)
+
+@contextmanager
+def secondary_reads(max_staleness_seconds: int = DEFAULT_MAX_STALENESS_SECONDS):
+    """
+    Marks every read routed through route_read or read_collection inside the
+    block as eligible for secondary reads, with a bounded staleness.
+    Meant to wrap whole read-only paths such as listing documents or
+    converting them to their *Read schemas for rendering.
+    """
+    token = _secondary_reads.set(max_staleness_seconds)
+    try:
+        yield
+    finally:
+        _secondary_reads.reset(token)
+
+@contextmanager
+def primary_reads(alias: str = DEFAULT_CONNECTION_NAME):
+    """
+    Keeps every routed read inside the block on the primary, even within a
+    secondary_reads block, and opens a causally consistent session that the
+    raw pymongo helpers of this package pass to their operations.
+    Use it for flows that must read their own writes.
+    """
+    with get_connection(alias).start_session(causal_consistency=True) as session:
+        token = _causal_session.set(session)
+        try:
+            yield session
+        finally:
+            _causal_session.reset(token)
+
+def current_session():
+    """
+    Returns the causally consistent session opened by primary_reads, if any.
+    """
+    return _causal_session.get()
+
+def _read_preference(secondary: Optional[bool], max_staleness_seconds: Optional[int]) -> Optional[SecondaryPreferred]:
+    if _causal_session.get() is not None or secondary is False:
+        return None
+    staleness = max_staleness_seconds or _secondary_reads.get()
+    if secondary is None and staleness is None:
+        return None
+    return SecondaryPreferred(max_staleness=staleness or DEFAULT_MAX_STALENESS_SECONDS)
+
+def _read_alias_available() -> bool:
+    try:
+        get_connection(READ_ALIAS)
+    except ConnectionFailure:
+        return False
+    return True
+
+def route_read(queryset, secondary: Optional[bool] = None, max_staleness_seconds: Optional[int] = None):
+    """
+    Returns the queryset routed to secondaries when it is explicitly marked
+    (secondary=True) or runs inside a secondary_reads block.
+    Reads are sent through the read replica alias when it is registered.
+    """
+    read_preference = _read_preference(secondary, max_staleness_seconds)
+    if read_preference is None:
+        return queryset
+    if _read_alias_available():
+        queryset = queryset.using(READ_ALIAS)
+    return queryset.read_preference(read_preference)
+
+def read_collection(document_cls: type, secondary: Optional[bool] = None, max_staleness_seconds: Optional[int] = None):
+    """
+    Returns the pymongo collection of document_cls with the same routing
+    rules as route_read, for helpers that query raw documents.
+    """
+    collection = document_cls._get_collection()
+    read_preference = _read_preference(secondary, max_staleness_seconds)
+    if read_preference is None:
+        return collection
+    if _read_alias_available():
+        collection = get_db(READ_ALIAS)[collection.name]
+    return collection.with_options(read_preference=read_preference)
@@ -0,0 +1,5 @@
+from enum import Enum
+
+class MembershipMode(Enum):
+    EMBEDDED = "embedded"
+    EXTERNAL = "external"
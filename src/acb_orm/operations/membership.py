@@ -0,0 +1,214 @@
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from acb_orm.cache.invalidation import notify_invalidation
+from acb_orm.collections.group_memberships import GroupMembership
+from acb_orm.collections.groups import Group
+from acb_orm.collections.users import User
+from acb_orm.enums.membership_mode import MembershipMode
+from acb_orm.queries.memberships import membership_mode
+
+DUPLICATE_KEY = 11000
+
+def _stamp(updater_user_id: Optional[str]) -> dict:
+    stamp = {'log.updated_at': datetime.now()}
+    if updater_user_id is not None:
+        stamp['log.updater_user_id'] = ObjectId(updater_user_id)
+    return stamp
+
+def _access(user_id: str, role_id: str) -> dict:
+    # Same field order as UserAccess, so '$addToSet' sees equal entries as equal.
+    return {'user_id': ObjectId(user_id), 'role_id': ObjectId(role_id)}
+
+def _update(group_id: str, query: dict, update: dict) -> bool:
+    result = Group._get_collection().update_one({'_id': ObjectId(group_id), **query}, update)
+    if result.modified_count:
+        notify_invalidation(Group._get_collection_name(), str(group_id))
+    return bool(result.modified_count)
+
+def _notify_members(accesses: List[dict]) -> None:
+    # Cached permissions of new members do not list the group yet.
+    for user_id in dict.fromkeys(str(access['user_id']) for access in accesses):
+        notify_invalidation(User._get_collection_name(), user_id)
+
+def _is_external(group_id: str) -> bool:
+    return membership_mode(group_id) == MembershipMode.EXTERNAL
+
+def _update_embedded(group_id: str, query: dict, update: dict) -> Optional[bool]:
+    """
+    Applies an update to the users_access of a group in embedded mode and
+    returns whether it changed, or None if the group is in external mode,
+    including when it switched since the caller checked.
+    """
+    if _is_external(group_id):
+        return None
+    if _update(group_id, {'membership_mode': {'$ne': MembershipMode.EXTERNAL.value}, **query}, update):
+        return True
+    return None if _is_external(group_id) else False
+
+def _touch(group_id: str, updater_user_id: Optional[str]) -> bool:
+    # Stamps the log of an external group whose memberships changed.
+    _update(group_id, {}, {'$set': _stamp(updater_user_id)})
+    return True
+
+def _insert_memberships(group_id: str, accesses: List[dict]) -> int:
+    """
+    Inserts the memberships that do not exist yet and returns how many were
+    inserted; duplicates are skipped by the unique index.
+    """
+    documents = [{'group_id': ObjectId(group_id), **access} for access in accesses]
+    try:
+        return len(GroupMembership._get_collection().insert_many(documents, ordered=False).inserted_ids)
+    except BulkWriteError as exc:
+        if any(error['code'] != DUPLICATE_KEY for error in exc.details['writeErrors']):
+            raise
+        return exc.details['nInserted']
+
+def add_members(group_id: str, members: Iterable[Tuple[str, str]], updater_user_id: Optional[str] = None) -> bool:
+    """
+    Grants each (user_id, role_id) pair in the group with a single
+    '$addToSet', without reading or rewriting the other members. Pairs
+    already present are left as they are. Returns whether the group changed.
+    """
+    accesses = [_access(user_id, role_id) for user_id, role_id in members]
+    if not accesses:
+        return False
+    # Only match the group if a pair is missing, so no-ops leave the log alone.
+    missing = {'$or': [{'users_access': {'$not': {'$elemMatch': access}}} for access in accesses]}
+    changed = _update_embedded(group_id, missing, {
+        '$addToSet': {'users_access': {'$each': accesses}},
+        '$set': _stamp(updater_user_id)
+    })
+    if changed is None:
+        changed = _insert_memberships(group_id, accesses) > 0 and _touch(group_id, updater_user_id)
+    if changed:
+        _notify_members(accesses)
+    return changed
+
+def add_member(group_id: str, user_id: str, role_id: str, updater_user_id: Optional[str] = None) -> bool:
+    return add_members(group_id, [(user_id, role_id)], updater_user_id)
+
+def remove_members(group_id: str, user_ids: Iterable[str], updater_user_id: Optional[str] = None) -> bool:
+    """
+    Removes every entry of the given users from the group with a single
+    '$pull'. Returns whether any of them was a member.
+    """
+    user_ids = [ObjectId(user_id) for user_id in user_ids]
+    if not user_ids:
+        return False
+    changed = _update_embedded(group_id, {'users_access.user_id': {'$in': user_ids}}, {
+        '$pull': {'users_access': {'user_id': {'$in': user_ids}}},
+        '$set': _stamp(updater_user_id)
+    })
+    if changed is not None:
+        return changed
+    result = GroupMembership._get_collection().delete_many({'group_id': ObjectId(group_id), 'user_id': {'$in': user_ids}})
+    return result.deleted_count > 0 and _touch(group_id, updater_user_id)
+
+def remove_member(group_id: str, user_id: str, updater_user_id: Optional[str] = None) -> bool:
+    return remove_members(group_id, [user_id], updater_user_id)
+
+def set_member_role(group_id: str, user_id: str, role_id: str, updater_user_id: Optional[str] = None) -> bool:
+    """
+    Changes the role of a member in place with a positional '$set'. For a
+    user holding several roles in the group, the first entry with another
+    role is changed, or removed if the user already holds the new role, so
+    no (user, role) pair is ever listed twice.
+    Returns False if the user is not a member or already has the role.
+    """
+    changed = _set_embedded_role(group_id, user_id, role_id, updater_user_id)
+    if changed is None:
+        return _set_external_role(group_id, user_id, role_id, updater_user_id)
+    return changed
+
+def _set_embedded_role(group_id: str, user_id: str, role_id: str, updater_user_id: Optional[str]) -> Optional[bool]:
+    user_id, role_id = ObjectId(user_id), ObjectId(role_id)
+    held = {'users_access': {'$elemMatch': {'user_id': user_id, 'role_id': role_id}}}
+    other = {'$elemMatch': {'user_id': user_id, 'role_id': {'$ne': role_id}}}
+    # '$nor' keeps the positional match on the entry with another role.
+    changed = _update_embedded(group_id, {'users_access': other, '$nor': [held]}, {
+        '$set': {'users_access.$.role_id': role_id, **_stamp(updater_user_id)}
+    })
+    if changed is not False:
+        return changed
+    raw = Group._get_collection().find_one({'_id': ObjectId(group_id), **held}, {'users_access': other})
+    if raw is None or not raw.get('users_access'):
+        return None if _is_external(group_id) else False
+    previous = _access(user_id, raw['users_access'][0]['role_id'])
+    return _update_embedded(group_id, held, {
+        '$pull': {'users_access': previous},
+        '$set': _stamp(updater_user_id)
+    })
+
+def _set_external_role(group_id: str, user_id: str, role_id: str, updater_user_id: Optional[str]) -> bool:
+    memberships = GroupMembership._get_collection()
+    query = {'group_id': ObjectId(group_id), 'user_id': ObjectId(user_id), 'role_id': {'$ne': ObjectId(role_id)}}
+    try:
+        changed = memberships.find_one_and_update(query, {'$set': {'role_id': ObjectId(role_id)}},
+                                                  sort=[('_id', 1)], return_document=ReturnDocument.AFTER)
+    except DuplicateKeyError:
+        # The user already holds the role in another entry; drop this one.
+        changed = memberships.find_one_and_delete(query, sort=[('_id', 1)])
+    return changed is not None and _touch(group_id, updater_user_id)
+
+def externalize_members(group_id: str, batch_size: int = 1000) -> int:
+    """
+    Migrates a group from embedded to external membership mode and returns
+    its number of memberships. Members are copied to group_memberships in
+    batches, then the mode is switched and users_access removed in one
+    update. The pairs added or removed while copying are reconciled
+    against the users_access removed by that update, so concurrent edits
+    are not lost; memberships changed after the switch are left alone.
+    Running it again on an external group does nothing.
+    """
+    groups = Group._get_collection()
+    raw = groups.find_one({'_id': ObjectId(group_id)}, {'users_access': 1, 'membership_mode': 1})
+    if raw is None:
+        raise ValueError(f"Group {group_id} does not exist.")
+    if raw.get('membership_mode') == MembershipMode.EXTERNAL.value:
+        return GroupMembership._get_collection().count_documents({'group_id': ObjectId(group_id)})
+    accesses = raw.get('users_access', [])
+    for start in range(0, len(accesses), batch_size):
+        _insert_memberships(group_id, [_access(a['user_id'], a['role_id']) for a in accesses[start:start + batch_size]])
+    # Memberships added in external mode after the switch sort after this.
+    switched_at = ObjectId()
+    before = groups.find_one_and_update(
+        {'_id': ObjectId(group_id), 'membership_mode': {'$ne': MembershipMode.EXTERNAL.value}},
+        {'$set': {'membership_mode': MembershipMode.EXTERNAL.value}, '$unset': {'users_access': ''}},
+        projection={'users_access': 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        # Another migration switched the group first.
+        return externalize_members(group_id, batch_size)
+    # Only the pairs edited while copying are reconciled; the others may
+    # already have been changed in external mode since the switch.
+    copied = {(access['user_id'], access['role_id']) for access in accesses}
+    final = {(access['user_id'], access['role_id']) for access in before.get('users_access', [])}
+    added = [_access(user_id, role_id) for user_id, role_id in final - copied]
+    if added:
+        _insert_memberships(group_id, added)
+    removed = copied - final
+    memberships = GroupMembership._get_collection()
+    if removed:
+        memberships.delete_many({'group_id': ObjectId(group_id), '_id': {'$lt': switched_at}, '$or': [
+            {'user_id': user_id, 'role_id': role_id} for user_id, role_id in removed
+        ]})
+    notify_invalidation(Group._get_collection_name(), str(group_id))
+    return memberships.count_documents({'group_id': ObjectId(group_id)})
+
+def externalize_large_groups(min_members: int = 1000, batch_size: int = 1000) -> List[str]:
+    """
+    Migrates every embedded group with at least min_members entries in
+    users_access to external membership mode. Returns their IDs.
+    """
+    query = {
+        'membership_mode': {'$ne': MembershipMode.EXTERNAL.value},
+        f'users_access.{min_members - 1}': {'$exists': True}
+    }
+    group_ids = [str(raw['_id']) for raw in Group._get_collection().find(query, {'_id': 1})]
+    for group_id in group_ids:
+        externalize_members(group_id, batch_size)
+    return group_ids
@@ -0,0 +1,83 @@
+from bson import DBRef, ObjectId
+from mongoengine import Document
+from pymongo import ReturnDocument
+from acb_orm.collections.bulletins_version import BulletinsVersion
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.collections.version_counters import VersionCounter
+
+MASTER_FIELDS = {
+    BulletinsVersion: 'bulletin_master_id',
+    TemplatesVersion: 'template_master_id',
+}
+
+def _legacy_max_version(version_cls: type, master_id: ObjectId) -> int:
+    """
+    Returns the highest version number already used by a master, reading
+    version_num_int and, for versions created before it existed, the
+    numeric value of version_num.
+    """
+    highest = 0
+    cursor = version_cls._get_collection().find({MASTER_FIELDS[version_cls]: master_id}, {'version_num': 1, 'version_num_int': 1})
+    for raw in cursor:
+        number = raw.get('version_num_int')
+        if number is None:
+            try:
+                number = int(float(raw.get('version_num')))
+            except (TypeError, ValueError):
+                continue
+        highest = max(highest, number)
+    return highest
+
+def allocate_version_num(version_cls: type, master_id: str) -> int:
+    """
+    Atomically allocates the next version number of a bulletin or template
+    master with find_one_and_update on its counter document, so concurrent
+    editors never get the same number. The counter of a master is seeded
+    with '$max' from its existing versions the first time it is used.
+    Raises ValueError if master_id is missing or not a valid ObjectId.
+    """
+    if master_id is None or not ObjectId.is_valid(master_id):
+        raise ValueError(f"A valid {MASTER_FIELDS[version_cls]} is required to allocate a version number, got {master_id!r}.")
+    master_id = ObjectId(master_id)
+    key = f"{version_cls._get_collection_name()}:{master_id}"
+    counters = VersionCounter._get_collection()
+    if counters.count_documents({'_id': key}, limit=1) == 0:
+        counters.update_one({'_id': key}, {'$max': {'seq': _legacy_max_version(version_cls, master_id)}}, upsert=True)
+    counter = counters.find_one_and_update(
+        {'_id': key},
+        {'$inc': {'seq': 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter['seq']
+
+def assign_version_num(version):
+    """
+    Sets version_num_int, and version_num as its string form, on a new
+    BulletinsVersion or TemplatesVersion before it is saved. Raises
+    ValueError if the version has no master.
+    """
+    version_cls = type(version)
+    # Read the raw value to avoid dereferencing the master document.
+    master = version._data.get(MASTER_FIELDS[version_cls])
+    if isinstance(master, DBRef):
+        master = master.id
+    elif isinstance(master, Document):
+        master = master.pk
+    number = allocate_version_num(version_cls, master)
+    version.version_num_int = number
+    version.version_num = str(number)
+    return version
+
+def get_latest_version(version_cls: type, master_id: str):
+    """
+    Returns the version with the highest version number of a master, with a
+    single seek on the (master, version_num_int) index.
+    """
+    return version_cls.objects(**{MASTER_FIELDS[version_cls]: master_id, 'version_num_int__exists': True}).order_by('-version_num_int').first()
+
+def get_version(version_cls: type, master_id: str, version_num: int):
+    """
+    Returns version number version_num of a master, or None.
+    """
+    return version_cls.objects(**{MASTER_FIELDS[version_cls]: master_id, 'version_num_int': version_num}).first()
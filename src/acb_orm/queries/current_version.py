@@ -0,0 +1,97 @@
+from typing import List, Optional
+from bson import ObjectId
+from acb_orm.cache.version_cache import load_cached_many
+from acb_orm.collections.bulletins_master import BulletinsMaster
+from acb_orm.collections.bulletins_version import BulletinsVersion
+from acb_orm.collections.templates_master import TemplatesMaster
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.converters.bson_to_read import to_read
+from acb_orm.database.read_routing import current_session, read_collection
+from acb_orm.schemas.bulletin_view_schema import BulletinViewRead, TemplateViewRead
+from acb_orm.schemas.bulletins_master_schema import BulletinsMasterRead
+from acb_orm.schemas.bulletins_version_schema import BulletinsVersionRead
+from acb_orm.schemas.templates_master_schema import TemplatesMasterRead
+from acb_orm.schemas.templates_version_schema import TemplatesVersionRead
+from acb_orm.storage.payloads import decode_documents
+
+def _lookup(document_cls: type, local_field: str, alias: str) -> dict:
+    return {'$lookup': {
+        'from': document_cls._get_collection_name(),
+        'localField': local_field,
+        'foreignField': '_id',
+        'as': alias
+    }}
+
+def _decode(raws: List[dict], alias: str, version_cls: type) -> None:
+    decode_documents(version_cls, [match for raw in raws for match in raw.get(alias, [])])
+
+def _first(raw: dict, alias: str, schema_cls: type):
+    matches = raw.pop(alias, None)
+    return to_read(schema_cls, matches[0]) if matches else None
+
+def _template_versions(raws: List[dict], field: str, secondary: Optional[bool]) -> dict:
+    # Template versions are immutable and shared by many bulletins, so they
+    # are served from the version cache rather than joined.
+    ids = [raw[field] for raw in raws if isinstance(raw.get(field), ObjectId)]
+    if not ids:
+        return {}
+    return load_cached_many(TemplatesVersion, ids, read_collection(TemplatesVersion, secondary), current_session())
+
+def _template_version(versions: dict, raw: dict, field: str) -> Optional[TemplatesVersionRead]:
+    version = versions.get(raw.get(field))
+    return to_read(TemplatesVersionRead, version) if version is not None else None
+
+def get_bulletin_views(bulletin_ids: List[str], secondary: Optional[bool] = None) -> List[BulletinViewRead]:
+    """
+    Resolves bulletin masters together with their current version in a
+    single aggregation using '$lookup', instead of sequential round-trips
+    per bulletin. Base template versions come from the version cache, with
+    one batched query for the misses.
+    Results follow the order of bulletin_ids; unknown IDs are skipped.
+    """
+    pipeline = [
+        {'$match': {'_id': {'$in': [ObjectId(bulletin_id) for bulletin_id in bulletin_ids]}}},
+        _lookup(BulletinsVersion, 'current_version_id', '_current_version'),
+    ]
+    raws = list(read_collection(BulletinsMaster, secondary).aggregate(pipeline, session=current_session()))
+    _decode(raws, '_current_version', BulletinsVersion)
+    template_versions = _template_versions(raws, 'base_template_version_id', secondary)
+    views = {}
+    for raw in raws:
+        current_version = _first(raw, '_current_version', BulletinsVersionRead)
+        views[str(raw['_id'])] = BulletinViewRead(
+            bulletin=to_read(BulletinsMasterRead, raw),
+            current_version=current_version,
+            base_template_version=_template_version(template_versions, raw, 'base_template_version_id')
+        )
+    return [views[bulletin_id] for bulletin_id in map(str, bulletin_ids) if bulletin_id in views]
+
+def get_bulletin_view(bulletin_id: str, secondary: Optional[bool] = None) -> Optional[BulletinViewRead]:
+    """
+    Returns a bulletin with its current version and base template version,
+    or None if the bulletin does not exist.
+    """
+    views = get_bulletin_views([bulletin_id], secondary)
+    return views[0] if views else None
+
+def get_template_views(template_ids: List[str], secondary: Optional[bool] = None) -> List[TemplateViewRead]:
+    """
+    Resolves template masters together with their current version: one
+    query for the masters, and the versions from the version cache with
+    one batched query for the misses.
+    """
+    query = {'_id': {'$in': [ObjectId(template_id) for template_id in template_ids]}}
+    raws = list(read_collection(TemplatesMaster, secondary).find(query, session=current_session()))
+    versions = _template_versions(raws, 'current_version_id', secondary)
+    views = {}
+    for raw in raws:
+        current_version = _template_version(versions, raw, 'current_version_id')
+        views[str(raw['_id'])] = TemplateViewRead(template=to_read(TemplatesMasterRead, raw), current_version=current_version)
+    return [views[template_id] for template_id in map(str, template_ids) if template_id in views]
+
+def get_template_view(template_id: str, secondary: Optional[bool] = None) -> Optional[TemplateViewRead]:
+    """
+    Returns a template with its current version, or None if it does not exist.
+    """
+    views = get_template_views([template_id], secondary)
+    return views[0] if views else None
@@ -0,0 +1,122 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+from bson import ObjectId
+from acb_orm.collections.group_memberships import GroupMembership
+from acb_orm.collections.groups import Group
+from acb_orm.converters.bson_to_read import to_read
+from acb_orm.enums.membership_mode import MembershipMode
+from acb_orm.queries.pagination import ID_SORT, decode_token, encode_token, paginate
+from acb_orm.schemas.page_schema import Page
+from acb_orm.schemas.user_access_schema import UserAccessRead
+
+# Sort key recorded in the continuation tokens of embedded member listings.
+EMBEDDED_SORT = ('users_access',)
+
+class Membership(NamedTuple):
+    group_id: str
+    role_id: str
+
+def groups_for_users(user_ids: Iterable[str]) -> Dict[str, List[Membership]]:
+    """
+    Returns the group memberships of each user. Embedded memberships are
+    read with a single aggregation that seeks the 'users_access.user_id'
+    index and keeps only the matching entries of each group's users_access,
+    so large groups are not sent in full; external ones with a seek on the
+    'user_id' index of group_memberships. Users without groups map to an
+    empty list.
+    """
+    user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+    memberships: Dict[str, List[Membership]] = {user_id: [] for user_id in user_ids}
+    if not user_ids:
+        return memberships
+    object_ids = [ObjectId(user_id) for user_id in user_ids]
+    pipeline = [
+        {'$match': {'users_access.user_id': {'$in': object_ids}}},
+        {'$project': {'users_access': {'$filter': {
+            'input': '$users_access',
+            'as': 'access',
+            'cond': {'$in': ['$$access.user_id', object_ids]}
+        }}}}
+    ]
+    for group in Group._get_collection().aggregate(pipeline):
+        for access in group['users_access']:
+            memberships[str(access['user_id'])].append(Membership(str(group['_id']), str(access['role_id'])))
+    cursor = GroupMembership._get_collection().find({'user_id': {'$in': object_ids}}, {'_id': 0})
+    for access in cursor:
+        memberships[str(access['user_id'])].append(Membership(str(access['group_id']), str(access['role_id'])))
+    return memberships
+
+def groups_for_user(user_id: str) -> List[Membership]:
+    """
+    Returns the groups of a user with the role held in each one.
+    """
+    return groups_for_users([user_id])[str(user_id)]
+
+def membership_mode(group_id: str) -> Optional[MembershipMode]:
+    """
+    Returns the membership mode of a group, or None if it does not exist.
+    """
+    raw = Group._get_collection().find_one({'_id': ObjectId(group_id)}, {'membership_mode': 1})
+    if raw is None:
+        return None
+    return MembershipMode(raw.get('membership_mode', MembershipMode.EMBEDDED.value))
+
+def _is_external(raw: dict) -> bool:
+    return raw.get('membership_mode') == MembershipMode.EXTERNAL.value
+
+def members_among(group_id: str, user_ids: Iterable[str]) -> Set[str]:
+    """
+    Returns which of the given users are members of a group.
+    """
+    object_ids = [ObjectId(user_id) for user_id in user_ids]
+    if not object_ids:
+        return set()
+    if membership_mode(group_id) == MembershipMode.EXTERNAL:
+        cursor = GroupMembership._get_collection().find({'group_id': ObjectId(group_id), 'user_id': {'$in': object_ids}}, {'user_id': 1})
+        return {str(access['user_id']) for access in cursor}
+    pipeline = [
+        {'$match': {'_id': ObjectId(group_id)}},
+        {'$project': {'users_access': {'$filter': {
+            'input': '$users_access',
+            'as': 'access',
+            'cond': {'$in': ['$$access.user_id', object_ids]}
+        }}}}
+    ]
+    return {str(access['user_id']) for group in Group._get_collection().aggregate(pipeline) for access in group['users_access']}
+
+def load_users_access(raws: List[dict]) -> List[dict]:
+    """
+    Fills in place the users_access of the raw groups in external
+    membership mode from group_memberships, with one query, so they build
+    the same GroupsRead as embedded groups.
+    """
+    external = {raw['_id']: raw for raw in raws if _is_external(raw)}
+    if not external:
+        return raws
+    for raw in external.values():
+        raw['users_access'] = []
+    cursor = GroupMembership._get_collection().find({'group_id': {'$in': list(external)}}).sort('_id', 1)
+    for access in cursor:
+        external[access['group_id']]['users_access'].append({'user_id': access['user_id'], 'role_id': access['role_id']})
+    return raws
+
+def list_members(group_id: str, limit: int = 100, token: Optional[str] = None) -> Page[UserAccessRead]:
+    """
+    Returns one page of the members of a group in either membership mode.
+    External members are paged by keyset on the (group_id, _id) index;
+    embedded ones with a '$slice' of users_access, so only the page is
+    transferred. Raises ValueError if the group does not exist, or if the
+    token was issued before the group changed mode.
+    """
+    if membership_mode(group_id) == MembershipMode.EXTERNAL:
+        return paginate(GroupMembership, UserAccessRead, limit=limit, token=token, sort=ID_SORT,
+                        filters={'group_id': ObjectId(group_id)})
+    offset = decode_token(token, EMBEDDED_SORT)[0] if token else 0
+    raw = Group._get_collection().find_one(
+        {'_id': ObjectId(group_id)},
+        {'users_access': {'$slice': [offset, limit + 1]}, 'membership_mode': 1}
+    )
+    if raw is None:
+        raise ValueError(f"Group {group_id} does not exist.")
+    accesses = raw.get('users_access', [])
+    next_token = encode_token(EMBEDDED_SORT, [offset + limit]) if len(accesses) > limit else None
+    return Page[UserAccessRead](items=[to_read(UserAccessRead, access) for access in accesses[:limit]], next_token=next_token)
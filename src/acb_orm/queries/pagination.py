@@ -0,0 +1,153 @@
+import base64
+from typing import Dict, Optional, Sequence, Tuple
+from bson import json_util
+from pymongo import ASCENDING, DESCENDING
+from acb_orm.converters.bson_to_read import to_read
+from acb_orm.database.read_routing import current_session, read_collection
+from acb_orm.queries.projections import projection_for
+from acb_orm.schemas.page_schema import Page
+from acb_orm.storage.payloads import decode_documents
+
+ID_SORT = ('_id',)
+CREATED_AT_SORT = ('log.created_at', '_id')
+
+def encode_token(sort: Sequence[str], values: list) -> str:
+    """
+    Encodes the sort keys of the last document of a page as an opaque token.
+    """
+    payload = json_util.dumps({'s': list(sort), 'v': values})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_token(token: str, sort: Sequence[str]) -> list:
+    """
+    Decodes a token created by encode_token for the same sort keys.
+    """
+    try:
+        payload = json_util.loads(base64.urlsafe_b64decode(token.encode()).decode())
+    except (ValueError, TypeError):
+        raise ValueError("Invalid continuation token.")
+    if payload.get('s') != list(sort):
+        raise ValueError("Continuation token does not match the requested sort.")
+    return payload['v']
+
+# Largest '$in' list the server expands into equality matches to avoid a sort.
+MAX_SORT_MERGE_VALUES = 200
+
+def _is_equality(value) -> bool:
+    if not isinstance(value, dict) or not any(key.startswith('$') for key in value):
+        return True
+    return list(value) == ['$in'] and len(value['$in']) <= MAX_SORT_MERGE_VALUES
+
+def _equality_fields(filters: dict) -> set:
+    return {key for key, value in filters.items() if not key.startswith('$') and _is_equality(value)}
+
+# Verdicts of has_supporting_index by model, sort keys, filtered fields and
+# equality-filtered fields.
+_supported: Dict[Tuple[type, tuple, frozenset, frozenset], bool] = {}
+
+def clear_index_cache() -> None:
+    """
+    Forgets the cached index checks, e.g. after creating or dropping indexes.
+    """
+    _supported.clear()
+
+def _index_supports(document_cls: type, sort: tuple, fields: frozenset, equality: frozenset) -> bool:
+    key = (document_cls, sort, fields, equality)
+    if key in _supported:
+        return _supported[key]
+    supported = False
+    for index in document_cls._get_collection().index_information().values():
+        keys = [field for field, _ in index['key']]
+        skipped = set()
+        while keys and keys[0] in equality and keys[0] not in sort:
+            skipped.add(keys.pop(0))
+        # Equality filters the index cannot seek would scan the whole sort.
+        if keys[:len(sort)] == list(sort) and equality <= skipped | set(sort):
+            directions = {direction for field, direction in index['key'] if field in sort}
+            if len(directions) == 1:
+                supported = True
+                break
+    _supported[key] = supported
+    return supported
+
+def has_supporting_index(document_cls: type, sort: Sequence[str], filters: Optional[dict] = None) -> bool:
+    """
+    Checks that an index can serve the sort without an in-memory sort.
+    Leading index fields that are matched by equality in filters are skipped,
+    so an index on (bulletin_master_id, log.created_at, _id) supports paging
+    the versions of one bulletin by creation date; every field matched by
+    equality must be one of them or a sort key. Short '$in' lists count
+    as equality, and a top-level '$or' is supported when every branch is.
+    The indexes of each model are read once per sort and set of filtered
+    fields; call clear_index_cache after changing them.
+    """
+    filters = filters or {}
+    if list(sort) == ['_id'] and not filters:
+        return True
+    if '$or' in filters:
+        rest = {key: value for key, value in filters.items() if key != '$or'}
+        return all(has_supporting_index(document_cls, sort, {**rest, **branch}) for branch in filters['$or'])
+    fields = frozenset(key for key in filters if not key.startswith('$'))
+    return _index_supports(document_cls, tuple(sort), fields, frozenset(_equality_fields(filters)))
+
+def _sort_value(raw: dict, field: str):
+    value = raw
+    for part in field.split('.'):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+def _after(sort: Sequence[str], values: list, descending: bool) -> dict:
+    """
+    Builds the keyset condition selecting documents after the given sort
+    values: (k1 > v1) or (k1 == v1 and k2 > v2) ... Null and missing
+    values sort first, as in MongoDB: nothing is below null, and every
+    null value is below the others.
+    """
+    branches = []
+    for position, field in enumerate(sort):
+        prefix = {sort[index]: values[index] for index in range(position)}
+        value = values[position]
+        if not descending:
+            branches.append({**prefix, field: {'$gt': value} if value is not None else {'$ne': None}})
+        elif value is not None:
+            branches.append({**prefix, field: {'$lt': value}})
+            branches.append({**prefix, field: None})
+    return {'$or': branches} if len(branches) > 1 else branches[0]
+
+def paginate(document_cls: type, schema_cls: type, limit: int = 50, token: Optional[str] = None,
+             sort: Sequence[str] = ID_SORT, descending: bool = False, filters: Optional[dict] = None,
+             require_index: bool = True, secondary: Optional[bool] = None) -> Page:
+    """
+    Returns one page of documents as schema_cls, using keyset pagination.
+    Instead of skipping documents, each page starts right after the sort
+    keys stored in the token, so deep pages cost the same as the first one.
+
+    sort must end with '_id' so that the keys are unique, e.g. ID_SORT or
+    CREATED_AT_SORT. filters is a raw MongoDB filter. Only the fields of
+    schema_cls are projected, so summary schemas keep pages light.
+    Raises ValueError when no index supports the sort, unless require_index
+    is False.
+    """
+    sort = tuple(sort)
+    if sort[-1] != '_id':
+        raise ValueError("The sort keys must end with '_id' to be unique.")
+    filters = filters or {}
+    if require_index and not has_supporting_index(document_cls, sort, filters):
+        raise ValueError(f"No index on {document_cls._get_collection_name()} supports sorting by {', '.join(sort)}.")
+
+    query = filters
+    if token:
+        after = _after(sort, decode_token(token, sort), descending)
+        query = {'$and': [filters, after]} if filters else after
+    projection = projection_for(document_cls, schema_cls)
+    projection.update({field.split('.')[0]: 1 for field in sort})
+    direction = DESCENDING if descending else ASCENDING
+
+    collection = read_collection(document_cls, secondary)
+    raws = list(collection.find(query, projection, session=current_session()).sort([(field, direction) for field in sort]).limit(limit + 1))
+    next_token = None
+    if len(raws) > limit:
+        raws = raws[:limit]
+        next_token = encode_token(sort, [_sort_value(raws[-1], field) for field in sort])
+    decode_documents(document_cls, raws, collection)
+    return Page[schema_cls](items=[to_read(schema_cls, raw) for raw in raws], next_token=next_token)
@@ -0,0 +1,56 @@
+from typing import Dict, List, Optional
+from acb_orm.collections.bulletins_master import BulletinsMaster
+from acb_orm.collections.templates_master import TemplatesMaster
+from acb_orm.collections.cards import Cards
+from acb_orm.collections.groups import Group
+from acb_orm.converters.bson_to_read import read_all
+from acb_orm.schemas.bulletins_master_schema import BulletinsMasterSummaryRead
+from acb_orm.schemas.templates_master_schema import TemplatesMasterSummaryRead
+from acb_orm.schemas.cards_schema import CardsSummaryRead
+from acb_orm.schemas.groups_schema import GroupsSummaryRead
+from acb_orm.storage.delta import DELTA_FIELDS
+
+SUMMARY_SCHEMAS = {
+    BulletinsMaster: BulletinsMasterSummaryRead,
+    TemplatesMaster: TemplatesMasterSummaryRead,
+    Cards: CardsSummaryRead,
+    Group: GroupsSummaryRead,
+}
+
+def projection_fields(document_cls: type, schema_cls: type) -> List[str]:
+    """
+    Returns the document fields needed to build schema_cls, in the form
+    accepted by QuerySet.only(). The delta fields are added when a
+    delta-encoded payload is requested, so that it can be rebuilt.
+    """
+    fields = [name for name in schema_cls.model_fields if name in document_cls._fields]
+    if getattr(document_cls, '_delta_field', None) in fields:
+        fields.extend(DELTA_FIELDS)
+    return fields
+
+def projection_for(document_cls: type, schema_cls: type) -> Dict[str, int]:
+    """
+    Returns the raw MongoDB projection needed to build schema_cls.
+    """
+    projection = {document_cls._fields[name].db_field: 1 for name in projection_fields(document_cls, schema_cls)}
+    projection['_id'] = 1
+    projection.pop('id', None)
+    return projection
+
+def list_summaries(document_cls: type, schema_cls: Optional[type] = None, order_by: Optional[List[str]] = None,
+                   skip: int = 0, limit: int = 0, secondary: Optional[bool] = None, **filters) -> list:
+    """
+    Lists documents as lightweight summary schemas. Only the fields of the
+    summary schema are requested from MongoDB, so heavy fields such as
+    Cards.content are neither transferred nor deserialized.
+    filters are MongoEngine query keyword arguments.
+    """
+    schema_cls = schema_cls or SUMMARY_SCHEMAS[document_cls]
+    queryset = document_cls.objects(**filters).only(*projection_fields(document_cls, schema_cls))
+    if order_by:
+        queryset = queryset.order_by(*order_by)
+    if skip:
+        queryset = queryset.skip(skip)
+    if limit:
+        queryset = queryset.limit(limit)
+    return read_all(queryset, schema_cls, secondary)
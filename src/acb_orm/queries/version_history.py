@@ -0,0 +1,78 @@
+from typing import List, Optional
+from bson import ObjectId
+from acb_orm.collections.bulletins_version import BulletinsVersion
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.converters.bson_to_read import to_read
+from acb_orm.database.read_routing import current_session, read_collection
+from acb_orm.schemas.bulletins_version_schema import BulletinsVersionRead
+from acb_orm.schemas.templates_version_schema import TemplatesVersionRead
+from acb_orm.storage.payloads import decode_documents
+
+class VersionChainError(ValueError):
+    """
+    Raised when a version history has a cycle, a broken link or more than
+    one possible head.
+    """
+
+def _find_head(links: dict) -> ObjectId:
+    referenced = {previous for previous in links.values() if previous is not None}
+    heads = [version_id for version_id in links if version_id not in referenced]
+    if len(heads) != 1:
+        raise VersionChainError(f"Expected one head version, found {len(heads)}.")
+    return heads[0]
+
+def walk_version_chain(links: dict, head_id: ObjectId, limit: Optional[int] = None) -> List[ObjectId]:
+    """
+    Follows previous_version_id links from head_id and returns the version
+    IDs from newest to oldest. links maps each version ID to its previous
+    version ID.
+    """
+    chain = []
+    seen = set()
+    current = head_id
+    while current is not None and (limit is None or len(chain) < limit):
+        if current in seen:
+            raise VersionChainError(f"Cycle detected at version '{current}'.")
+        if current not in links:
+            raise VersionChainError(f"Broken link: version '{current}' does not belong to this history.")
+        seen.add(current)
+        chain.append(current)
+        current = links[current]
+    return chain
+
+def _history(version_cls: type, schema_cls: type, master_field: str, master_id: str, limit: Optional[int],
+             head_version_id: Optional[str], secondary: Optional[bool]) -> list:
+    collection = read_collection(version_cls, secondary)
+    session = current_session()
+    # One indexed query on the master ID for the links only, then one '$in'
+    # query for the bodies of the versions to return.
+    links = {raw['_id']: raw.get('previous_version_id')
+             for raw in collection.find({master_field: ObjectId(master_id)}, {'previous_version_id': 1}, session=session)}
+    if not links:
+        return []
+    head_id = ObjectId(head_version_id) if head_version_id else _find_head(links)
+    chain = walk_version_chain(links, head_id, limit)
+    raws = decode_documents(version_cls, list(collection.find({'_id': {'$in': chain}}, session=session)), collection)
+    versions = {raw['_id']: raw for raw in raws}
+    return [to_read(schema_cls, versions[version_id]) for version_id in chain]
+
+def get_bulletin_history(bulletin_master_id: str, limit: Optional[int] = None, head_version_id: Optional[str] = None,
+                         secondary: Optional[bool] = None) -> List[BulletinsVersionRead]:
+    """
+    Returns the versions of a bulletin from newest to oldest, following
+    previous_version_id from head_version_id (by default, the only version
+    that no other version points to). limit returns only the last N versions.
+    The whole chain costs two queries regardless of its length.
+    Raises VersionChainError on cycles or broken links.
+    """
+    return _history(BulletinsVersion, BulletinsVersionRead, 'bulletin_master_id', bulletin_master_id,
+                    limit, head_version_id, secondary)
+
+def get_template_history(template_master_id: str, limit: Optional[int] = None, head_version_id: Optional[str] = None,
+                         secondary: Optional[bool] = None) -> List[TemplatesVersionRead]:
+    """
+    Returns the versions of a template from newest to oldest.
+    See get_bulletin_history.
+    """
+    return _history(TemplatesVersion, TemplatesVersionRead, 'template_master_id', template_master_id,
+                    limit, head_version_id, secondary)
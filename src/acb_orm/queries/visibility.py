@@ -0,0 +1,62 @@
+from typing import Iterable, Optional, Sequence
+from bson import ObjectId
+from acb_orm.access.permissions import get_permissions
+from acb_orm.collections.bulletins_master import BulletinsMaster
+from acb_orm.collections.cards import Cards
+from acb_orm.collections.templates_master import TemplatesMaster
+from acb_orm.collections.visual_resources import VisualResources
+from acb_orm.enums.access_type import AccessType
+from acb_orm.queries.pagination import CREATED_AT_SORT, paginate
+from acb_orm.schemas.page_schema import Page
+
+# Models with an 'access_config' and the indexes visibility_filter relies on.
+VISIBILITY_DOCUMENTS = (BulletinsMaster, TemplatesMaster, Cards, VisualResources)
+
+def visibility_filter(group_ids: Iterable[str]) -> dict:
+    """
+    Builds the raw filter matching public documents and documents restricted
+    to any of the given groups. Each branch of the '$or' is served by its
+    own index, (access_config.access_type, log.created_at, _id) and
+    (access_config.allowed_groups, log.created_at, _id), which also keep
+    catalog pages sorted by creation date without an in-memory sort.
+    """
+    public = {'access_config.access_type': AccessType.PUBLIC.value}
+    group_ids = [ObjectId(group_id) for group_id in dict.fromkeys(str(value) for value in group_ids)]
+    if not group_ids:
+        return public
+    return {'$or': [public, {'access_config.allowed_groups': {'$in': group_ids}}]}
+
+def visible_to(user_id: str) -> dict:
+    """
+    Returns the visibility filter for the groups of a user.
+    """
+    return visibility_filter(get_permissions(user_id).group_ids)
+
+def _check(document_cls: type) -> None:
+    if document_cls not in VISIBILITY_DOCUMENTS:
+        raise ValueError(f"{document_cls.__name__} has no access configuration.")
+
+def visible_documents(document_cls: type, user_id: str):
+    """
+    Returns a queryset of the documents of document_cls the user can see.
+    """
+    _check(document_cls)
+    return document_cls.objects(__raw__=visible_to(user_id))
+
+def paginate_visible(document_cls: type, schema_cls: type, user_id: str, limit: int = 50,
+                     token: Optional[str] = None, sort: Sequence[str] = CREATED_AT_SORT, descending: bool = False,
+                     filters: Optional[dict] = None, require_index: bool = True,
+                     secondary: Optional[bool] = None) -> Page:
+    """
+    Returns one page of the documents the user can see, restricted further
+    by the raw filters if given, by default in creation order, which the
+    visibility indexes serve. See paginate for the other arguments.
+    """
+    _check(document_cls)
+    visible = visible_to(user_id)
+    if filters and (set(filters) & set(visible)):
+        query = {'$and': [visible, filters]}
+    else:
+        query = {**(filters or {}), **visible}
+    return paginate(document_cls, schema_cls, limit=limit, token=token, sort=sort, descending=descending,
+                    filters=query, require_index=require_index, secondary=secondary)
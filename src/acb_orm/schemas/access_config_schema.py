@@ -1,10 +1,10 @@
 from typing import Optional, List
-from pydantic import BaseModel, Field, model_validator, field_validator
+from pydantic import BaseModel, Field, model_validator, field_validator, ValidationInfo
 from acb_orm.enums.access_type import AccessType
-from acb_orm.validations.valid_reference_id import validate_reference_id
+from acb_orm.validations.valid_reference_id import validate_reference_ids, ReferenceSchema
 from acb_orm.collections.groups import Group
 
-class AccessConfigCreate(BaseModel):
+class AccessConfigCreate(ReferenceSchema):
     """
     Creation schema for access configuration.
     It inherits the base validation logic.
@@ -13,9 +13,9 @@ class AccessConfigCreate(BaseModel):
     allowed_groups: List[str] = Field([], description="List of allowed group IDs.")
 
     @field_validator('allowed_groups', mode='before')
-    def validate_allowed_groups(cls, v):
+    def validate_allowed_groups(cls, v, info: ValidationInfo):
         # v is a list of group ids
-        return [validate_reference_id(group_id, Group) for group_id in v]
+        return validate_reference_ids(v, Group, info)
 
     @model_validator(mode='after')
     def validate_groups_for_access_type(self):
@@ -29,7 +29,7 @@ class AccessConfigCreate(BaseModel):
             raise ValueError("allowed_groups must not be empty for non-public access.")
         return self
 
-class AccessConfigUpdate(BaseModel):
+class AccessConfigUpdate(ReferenceSchema):
     """
     Update schema for access configuration.
     All fields are optional to allow for partial updates.
@@ -38,10 +38,10 @@ class AccessConfigUpdate(BaseModel):
     allowed_groups: Optional[List[str]] = Field(None, description="List of allowed group IDs.")
 
     @field_validator('allowed_groups', mode='before')
-    def validate_allowed_groups(cls, v):
+    def validate_allowed_groups(cls, v, info: ValidationInfo):
         if v is None:
             return v
-        return [validate_reference_id(group_id, Group) for group_id in v]
+        return validate_reference_ids(v, Group, info)
 
     @model_validator(mode='after')
     def validate_groups_on_update(self):
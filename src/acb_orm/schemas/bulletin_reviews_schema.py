@@ -1,10 +1,10 @@
 from typing import Optional, List, Any
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, ValidationInfo
 from acb_orm.schemas.log_schema import LogCreate, LogRead, LogUpdate
 from acb_orm.schemas.comment_schema import CommentCreate, CommentRead, CommentUpdate
 from acb_orm.collections.bulletins_master import BulletinsMaster
 from acb_orm.collections.users import User
-from acb_orm.validations.valid_reference_id import validate_reference_id
+from acb_orm.validations.valid_reference_id import validate_reference_id, ReferenceSchema
 from datetime import datetime
 
 class BulletinReviewsBase(BaseModel):
@@ -13,7 +13,7 @@ class BulletinReviewsBase(BaseModel):
     """
     completed_at: Optional[datetime] = Field(None, description="Date and time when the review was completed.")
 
-class BulletinReviewsCreate(BulletinReviewsBase):
+class BulletinReviewsCreate(BulletinReviewsBase, ReferenceSchema):
     """
     Creation schema for the bulletin reviews document.
     All fields are required for creating a new document.
@@ -24,14 +24,14 @@ class BulletinReviewsCreate(BulletinReviewsBase):
     comments: List[CommentCreate] = Field(..., description="Array of comments.")
 
     @field_validator('bulletin_master_id')
-    def validate_bulletin_master_id(cls, v):
-        return validate_reference_id(v, BulletinsMaster)
+    def validate_bulletin_master_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, BulletinsMaster, info)
 
     @field_validator('reviewer_user_id')
-    def validate_reviewer_user_id(cls, v):
-        return validate_reference_id(v, User)
+    def validate_reviewer_user_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, User, info)
 
-class BulletinReviewsUpdate(BaseModel):
+class BulletinReviewsUpdate(ReferenceSchema):
     """
     Update schema for the bulletin reviews document.
     The log and comments will be handled by the service layer.
@@ -0,0 +1,22 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+from acb_orm.schemas.bulletins_master_schema import BulletinsMasterRead
+from acb_orm.schemas.bulletins_version_schema import BulletinsVersionRead
+from acb_orm.schemas.templates_master_schema import TemplatesMasterRead
+from acb_orm.schemas.templates_version_schema import TemplatesVersionRead
+
+class BulletinViewRead(BaseModel):
+    """
+    Read schema combining a bulletin master with its current version and
+    the template version it is based on, as needed to display it.
+    """
+    bulletin: BulletinsMasterRead = Field(..., description="Bulletin master document.")
+    current_version: Optional[BulletinsVersionRead] = Field(None, description="Current bulletin version, if any.")
+    base_template_version: Optional[TemplatesVersionRead] = Field(None, description="Template version the bulletin is based on.")
+
+class TemplateViewRead(BaseModel):
+    """
+    Read schema combining a template master with its current version.
+    """
+    template: TemplatesMasterRead = Field(..., description="Template master document.")
+    current_version: Optional[TemplatesVersionRead] = Field(None, description="Current template version, if any.")
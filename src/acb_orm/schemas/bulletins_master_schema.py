@@ -1,12 +1,12 @@
 from typing import Optional, List
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, ValidationInfo
 from acb_orm.schemas.log_schema import LogCreate, LogUpdate, LogRead
 from acb_orm.enums.status_bulletin import StatusBulletin
 from acb_orm.schemas.access_config_schema import AccessConfigCreate, AccessConfigUpdate, AccessConfigRead
 from acb_orm.collections.templates_master import TemplatesMaster
 from acb_orm.collections.templates_version import TemplatesVersion
 from acb_orm.collections.bulletins_version import BulletinsVersion
-from acb_orm.validations.valid_reference_id import validate_reference_id
+from acb_orm.validations.valid_reference_id import validate_reference_id, ReferenceSchema
 
 class BulletinsMasterBase(BaseModel):
     """
@@ -16,7 +16,7 @@ class BulletinsMasterBase(BaseModel):
     bulletin_name: str = Field(..., description="Name of the bulletin.")
     status: Optional[StatusBulletin] = Field(StatusBulletin.DRAFT, description="Current status of the bulletin.")
 
-class BulletinsMasterCreate(BulletinsMasterBase):
+class BulletinsMasterCreate(BulletinsMasterBase, ReferenceSchema):
     """
     Creation schema for the bulletin master document.
     All fields are required when creating a new document.
@@ -28,20 +28,20 @@ class BulletinsMasterCreate(BulletinsMasterBase):
     log: Optional[LogCreate] = Field(None, description="Audit log.")
 
     @field_validator('base_template_master_id')
-    def validate_base_template_master_id(cls, v):
-        return validate_reference_id(v, TemplatesMaster)
+    def validate_base_template_master_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, TemplatesMaster, info)
 
     @field_validator('base_template_version_id')
-    def validate_base_template_version_id(cls, v):
-        return validate_reference_id(v, TemplatesVersion)
+    def validate_base_template_version_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, TemplatesVersion, info)
 
     @field_validator('current_version_id')
-    def validate_current_version_id(cls, v):
+    def validate_current_version_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, BulletinsVersion)
+            return validate_reference_id(v, BulletinsVersion, info)
         return v
 
-class BulletinsMasterUpdate(BaseModel):
+class BulletinsMasterUpdate(ReferenceSchema):
     """
     Update schema for the bulletin master document.
     Only contains fields that are modified during an update.
@@ -56,21 +56,21 @@ class BulletinsMasterUpdate(BaseModel):
     log: Optional[LogUpdate] = Field(None, description="Audit log.")
 
     @field_validator('base_template_master_id')
-    def validate_base_template_master_id(cls, v):
+    def validate_base_template_master_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, TemplatesMaster)
+            return validate_reference_id(v, TemplatesMaster, info)
         return v
 
     @field_validator('base_template_version_id')
-    def validate_base_template_version_id(cls, v):
+    def validate_base_template_version_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, TemplatesVersion)
+            return validate_reference_id(v, TemplatesVersion, info)
         return v
 
     @field_validator('current_version_id')
-    def validate_current_version_id(cls, v):
+    def validate_current_version_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, BulletinsVersion)
+            return validate_reference_id(v, BulletinsVersion, info)
         return v
 
 class BulletinsMasterRead(BulletinsMasterBase):
@@ -84,4 +84,14 @@ class BulletinsMasterRead(BulletinsMasterBase):
     current_version_id: Optional[str] = Field(None, description="ObjectId of the current bulletin version.")
     access_config: AccessConfigRead = Field(..., description="Access configuration.")
     log: LogRead = Field(..., description="Audit log.")
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class BulletinsMasterSummaryRead(BulletinsMasterBase):
+    """
+    Summary read schema for bulletin list views.
+    Leaves out the template and version references.
+    """
+    id: str = Field(..., description="ObjectId of the bulletin master.")
+    access_config: AccessConfigRead = Field(..., description="Access configuration.")
+    log: LogRead = Field(..., description="Audit log.")
+    model_config = ConfigDict(from_attributes=True)
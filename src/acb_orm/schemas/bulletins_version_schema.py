@@ -1,9 +1,9 @@
 from typing import Optional, Any, Dict
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, ValidationInfo
 from acb_orm.schemas.log_schema import LogCreate, LogUpdate, LogRead
 from acb_orm.collections.bulletins_master import BulletinsMaster
 from acb_orm.collections.bulletins_version import BulletinsVersion
-from acb_orm.validations.valid_reference_id import validate_reference_id
+from acb_orm.validations.valid_reference_id import validate_reference_id, ReferenceSchema
 
 class BulletinsVersionBase(BaseModel):
     """
@@ -13,7 +13,7 @@ class BulletinsVersionBase(BaseModel):
     version_num: str = Field(..., description="Version number of the bulletin.")
     data: Dict[str, Any] = Field(..., description="User-specific data for the bulletin content.")
 
-class BulletinsVersionCreate(BulletinsVersionBase):
+class BulletinsVersionCreate(BulletinsVersionBase, ReferenceSchema):
     """
     Creation schema for the bulletin version document.
     All fields are required when creating a new document.
@@ -23,16 +23,16 @@ class BulletinsVersionCreate(BulletinsVersionBase):
     log: Optional[LogCreate] = Field(None, description="Audit log.")
 
     @field_validator('bulletin_master_id')
-    def validate_bulletin_master_id(cls, v):
-        return validate_reference_id(v, BulletinsMaster)
+    def validate_bulletin_master_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, BulletinsMaster, info)
 
     @field_validator('previous_version_id')
-    def validate_previous_version_id(cls, v):
+    def validate_previous_version_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, BulletinsVersion)
+            return validate_reference_id(v, BulletinsVersion, info)
         return v
 
-class BulletinsVersionUpdate(BaseModel):
+class BulletinsVersionUpdate(ReferenceSchema):
     """
     Update schema for the bulletin version document.
     Since versions are immutable, this schema is intended for very specific
@@ -44,15 +44,15 @@ class BulletinsVersionUpdate(BaseModel):
     data: Optional[Dict[str, Any]] = Field(None, description="Updated user-specific data.")
 
     @field_validator('bulletin_master_id')
-    def validate_bulletin_master_id(cls, v):
+    def validate_bulletin_master_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, BulletinsMaster)
+            return validate_reference_id(v, BulletinsMaster, info)
         return v
 
     @field_validator('previous_version_id')
-    def validate_previous_version_id(cls, v):
+    def validate_previous_version_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, BulletinsVersion)
+            return validate_reference_id(v, BulletinsVersion, info)
         return v
 
 class BulletinsVersionRead(BulletinsVersionBase):
@@ -63,5 +63,6 @@ class BulletinsVersionRead(BulletinsVersionBase):
     id: str = Field(..., description="ObjectId of the bulletin version document.")
     bulletin_master_id: str = Field(..., description="ObjectId of the bulletin master document.")
     previous_version_id: Optional[str] = Field(None, description="ObjectId of the previous bulletin version.")
+    version_num_int: Optional[int] = Field(None, description="Numeric version number, allocated per master.")
     log: LogRead = Field(..., description="Audit log.")
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
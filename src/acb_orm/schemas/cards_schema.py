@@ -1,9 +1,9 @@
 from typing import Optional, List, Any, Dict
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, ValidationInfo
 from acb_orm.schemas.log_schema import LogCreate, LogRead, LogUpdate
 from acb_orm.schemas.access_config_schema import AccessConfigCreate, AccessConfigRead, AccessConfigUpdate
 from acb_orm.collections.templates_master import TemplatesMaster
-from acb_orm.validations.valid_reference_id import validate_reference_id
+from acb_orm.validations.valid_reference_id import validate_reference_ids, ReferenceSchema
 
 class CardsBase(BaseModel):
     """
@@ -13,7 +13,7 @@ class CardsBase(BaseModel):
     card_name: str = Field(..., description="Name of the card.")
     card_type: str = Field(..., description="Type of the card (e.g., 'pest_or_disease').")
 
-class CardsCreate(CardsBase):
+class CardsCreate(CardsBase, ReferenceSchema):
     """
     Creation schema for the cards document.
     All fields are required when creating a new document.
@@ -24,10 +24,10 @@ class CardsCreate(CardsBase):
     log: Optional[LogCreate] = Field(None, description="Audit log.")
 
     @field_validator('templates_master_ids', mode='before')
-    def validate_templates_master_ids(cls, v):
-        return [validate_reference_id(tid, TemplatesMaster) for tid in v]
+    def validate_templates_master_ids(cls, v, info: ValidationInfo):
+        return validate_reference_ids(v, TemplatesMaster, info)
 
-class CardsUpdate(BaseModel):
+class CardsUpdate(ReferenceSchema):
     """
     Update schema for the cards document.
     The log will be handled by the service layer.
@@ -40,10 +40,10 @@ class CardsUpdate(BaseModel):
     content: Optional[Dict[str, Any]] = Field(None, description="Flexible content structure of the card.")
 
     @field_validator('templates_master_ids', mode='before')
-    def validate_templates_master_ids(cls, v):
+    def validate_templates_master_ids(cls, v, info: ValidationInfo):
         if v is None:
             return v
-        return [validate_reference_id(tid, TemplatesMaster) for tid in v]
+        return validate_reference_ids(v, TemplatesMaster, info)
 
 class CardsRead(CardsBase):
     """
@@ -55,4 +55,14 @@ class CardsRead(CardsBase):
     access_config: AccessConfigRead = Field(..., description="Access configuration.")
     content: Dict[str, Any] = Field(..., description="Flexible content structure of the card.")
     log: LogRead = Field(..., description="Audit log.")
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class CardsSummaryRead(CardsBase):
+    """
+    Summary read schema for card list views.
+    Leaves out the card content and template links.
+    """
+    id: str = Field(..., description="ObjectId of the card.")
+    access_config: AccessConfigRead = Field(..., description="Access configuration.")
+    log: LogRead = Field(..., description="Audit log.")
+    model_config = ConfigDict(from_attributes=True)
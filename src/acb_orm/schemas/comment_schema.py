@@ -1,7 +1,7 @@
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel, Field, model_validator, field_validator
-from acb_orm.validations.valid_reference_id import validate_reference_id
+from pydantic import BaseModel, Field, model_validator, field_validator, ValidationInfo
+from acb_orm.validations.valid_reference_id import validate_reference_id, ReferenceSchema
 from acb_orm.collections.bulletins_version import BulletinsVersion
 from acb_orm.collections.users import User
 
@@ -34,7 +34,7 @@ class CommentBase(BaseModel):
     created_at: datetime = Field(..., description="The date and time the comment was created.")
     target_element: Optional[TargetElementSchema] = Field(None, description="The specific element in the bulletin the comment is targeting.")
     
-class CommentCreate(CommentBase):
+class CommentCreate(CommentBase, ReferenceSchema):
     """
     Creation schema for a new Comment.
     """
@@ -42,12 +42,12 @@ class CommentCreate(CommentBase):
     author_id: str = Field(..., description="ID of the user who authored the comment.")
 
     @field_validator('bulletin_version_id')
-    def validate_bulletin_version_id(cls, v):
-        return validate_reference_id(v, BulletinsVersion)
+    def validate_bulletin_version_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, BulletinsVersion, info)
 
     @field_validator('author_id')
-    def validate_author_id(cls, v):
-        return validate_reference_id(v, User)
+    def validate_author_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, User, info)
 
 class CommentUpdate(BaseModel):
     """
@@ -55,7 +55,7 @@ class CommentUpdate(BaseModel):
     """
     text: Optional[str] = Field(None, description="The updated content of the comment.")
 
-class CommentReplyUpdate(BaseModel):
+class CommentReplyUpdate(ReferenceSchema):
     """
     Update schema for adding a reply to a comment.
     """
@@ -2,6 +2,7 @@ from typing import Optional, List, Dict
 from pydantic import BaseModel, Field, ConfigDict
 from acb_orm.schemas.log_schema import LogCreate, LogRead, LogUpdate
 from acb_orm.schemas.user_access_schema import UserAccessCreate, UserAccessUpdate, UserAccessRead
+from acb_orm.validations.valid_reference_id import ReferenceSchema
 
 class GroupsBase(BaseModel):
     """
@@ -12,7 +13,7 @@ class GroupsBase(BaseModel):
     country: str = Field(..., description="Country code (e.g., 'CO').")
     description: Optional[str] = Field(None, description="Description of the group.")
 
-class GroupsCreate(GroupsBase):
+class GroupsCreate(GroupsBase, ReferenceSchema):
     """
     Creation schema for the groups document.
     All fields are required when creating a new document.
@@ -20,7 +21,7 @@ class GroupsCreate(GroupsBase):
     users_access: List[UserAccessCreate] = Field(..., description="List of users and their roles within the group.")
     log: Optional[LogCreate] = Field(None, description="Audit log.")
     
-class GroupsUpdate(BaseModel):
+class GroupsUpdate(ReferenceSchema):
     """
     Update schema for the groups document.
     The log and users_access fields will be handled by the service layer.
@@ -40,3 +41,12 @@ class GroupsRead(GroupsBase):
     users_access: List[UserAccessRead] = Field(..., description="List of users and their roles within the group.")
     log: LogRead = Field(..., description="Audit log.")
     model_config = ConfigDict(from_attributes=True)
+
+class GroupsSummaryRead(GroupsBase):
+    """
+    Summary read schema for group list views.
+    Leaves out the members, which may be thousands.
+    """
+    id: str = Field(..., description="ObjectId of the group.")
+    log: LogRead = Field(..., description="Audit log.")
+    model_config = ConfigDict(from_attributes=True)
@@ -1,10 +1,10 @@
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, Field, field_validator
-from acb_orm.validations.valid_reference_id import validate_reference_id
+from pydantic import BaseModel, Field, field_validator, ValidationInfo
+from acb_orm.validations.valid_reference_id import validate_reference_id, ReferenceSchema
 from acb_orm.collections.users import User
 
-class LogCreate(BaseModel):
+class LogCreate(ReferenceSchema):
     """
     Creation schema for the log object.
     Only contains fields that are populated on creation.
@@ -13,10 +13,10 @@ class LogCreate(BaseModel):
     creator_user_id: str = Field(..., description="The ID of the user who created the document.")
 
     @field_validator('creator_user_id')
-    def validate_creator_user_id(cls, v):
-        return validate_reference_id(v, User)
+    def validate_creator_user_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, User, info)
 
-class LogUpdate(BaseModel):
+class LogUpdate(ReferenceSchema):
     """
     Update schema for the log object.
     Only contains fields that are modified during an update.
@@ -25,8 +25,8 @@ class LogUpdate(BaseModel):
     updater_user_id: str = Field(..., description="The ID of the user who last updated the document.")
 
     @field_validator('updater_user_id')
-    def validate_updater_user_id(cls, v):
-        return validate_reference_id(v, User)
+    def validate_updater_user_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, User, info)
 
 class LogRead(BaseModel):
     """
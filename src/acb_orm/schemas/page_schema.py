@@ -0,0 +1,11 @@
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel, Field
+
+T = TypeVar('T')
+
+class Page(BaseModel, Generic[T]):
+    """
+    Schema for one page of a keyset-paginated listing.
+    """
+    items: List[T] = Field(..., description="Documents of the page, as *Read schemas.")
+    next_token: Optional[str] = Field(None, description="Opaque token to request the next page, or null on the last page.")
@@ -1,9 +1,9 @@
 from typing import Optional, List
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, ValidationInfo
 from acb_orm.schemas.log_schema import LogCreate, LogUpdate, LogRead
 from acb_orm.enums.status_template import StatusTemplate
 from acb_orm.schemas.access_config_schema import AccessConfigCreate, AccessConfigUpdate, AccessConfigRead
-from acb_orm.validations.valid_reference_id import validate_reference_id
+from acb_orm.validations.valid_reference_id import validate_reference_id, ReferenceSchema
 from acb_orm.collections.templates_version import TemplatesVersion
 
 class TemplatesMasterBase(BaseModel):
@@ -15,7 +15,7 @@ class TemplatesMasterBase(BaseModel):
     description: Optional[str] = Field(None, description="Template description.")
     status: StatusTemplate = Field(..., description="Current status of the template.")
 
-class TemplatesMasterCreate(TemplatesMasterBase):
+class TemplatesMasterCreate(TemplatesMasterBase, ReferenceSchema):
     """
     Creation schema for the template master document.
     All fields are required when creating a new document.
@@ -25,12 +25,12 @@ class TemplatesMasterCreate(TemplatesMasterBase):
     log: Optional[LogCreate] = Field(None, description="Audit log.")
 
     @field_validator('current_version_id')
-    def validate_current_version_id(cls, v):
+    def validate_current_version_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, TemplatesVersion)
+            return validate_reference_id(v, TemplatesVersion, info)
         return v
 
-class TemplatesMasterUpdate(BaseModel):
+class TemplatesMasterUpdate(ReferenceSchema):
     """
     Update schema for the template master document.
     Only contains fields that are modified during an update.
@@ -44,9 +44,9 @@ class TemplatesMasterUpdate(BaseModel):
     log: Optional[LogUpdate] = Field(None, description="Audit log.")
 
     @field_validator('current_version_id')
-    def validate_current_version_id(cls, v):
+    def validate_current_version_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, TemplatesVersion)
+            return validate_reference_id(v, TemplatesVersion, info)
         return v
 
 class TemplatesMasterRead(TemplatesMasterBase):
@@ -59,3 +59,12 @@ class TemplatesMasterRead(TemplatesMasterBase):
     current_version_id: Optional[str] = Field(None, description="ObjectId of the current version.")
     log: LogRead = Field(..., description="Audit log.")
     model_config = ConfigDict(from_attributes=True)
+
+class TemplatesMasterSummaryRead(TemplatesMasterBase):
+    """
+    Summary read schema for template list views.
+    """
+    id: str = Field(..., description="ObjectId of the template master.")
+    access_config: AccessConfigRead = Field(..., description="Access configuration.")
+    log: LogRead = Field(..., description="Audit log.")
+    model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,7 @@
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, ValidationInfo
 from acb_orm.schemas.log_schema import LogCreate, LogUpdate, LogRead
-from acb_orm.validations.valid_reference_id import validate_reference_id
+from acb_orm.validations.valid_reference_id import validate_reference_id, ReferenceSchema
 from acb_orm.collections.templates_master import TemplatesMaster
 from acb_orm.collections.templates_version import TemplatesVersion
 
@@ -14,7 +14,7 @@ class TemplatesVersionBase(BaseModel):
     commit_message: str = Field(..., description="Message describing the changes in this version.")
     content: Dict[str, Any] = Field(..., description="Complete structure and design of the template version.")
 
-class TemplatesVersionCreate(TemplatesVersionBase):
+class TemplatesVersionCreate(TemplatesVersionBase, ReferenceSchema):
     """
     Creation schema for the template version document.
     All fields are required when creating a new document.
@@ -24,16 +24,16 @@ class TemplatesVersionCreate(TemplatesVersionBase):
     log: Optional[LogCreate] = Field(None, description="Audit log.")
 
     @field_validator('template_master_id')
-    def validate_template_master_id(cls, v):
-        return validate_reference_id(v, TemplatesMaster)
+    def validate_template_master_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, TemplatesMaster, info)
 
     @field_validator('previous_version_id')
-    def validate_previous_version_id(cls, v):
+    def validate_previous_version_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, TemplatesVersion)
+            return validate_reference_id(v, TemplatesVersion, info)
         return v
 
-class TemplatesVersionUpdate(BaseModel):
+class TemplatesVersionUpdate(ReferenceSchema):
     """
     Update schema for the template version document.
     Only contains fields that are modified during an update.
@@ -46,9 +46,9 @@ class TemplatesVersionUpdate(BaseModel):
     content: Optional[Dict[str, Any]] = Field(None, description="Complete structure and design of the template version.")
 
     @field_validator('previous_version_id')
-    def validate_previous_version_id(cls, v):
+    def validate_previous_version_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, TemplatesVersion)
+            return validate_reference_id(v, TemplatesVersion, info)
         return v
 
 class TemplatesVersionRead(TemplatesVersionBase):
@@ -59,5 +59,6 @@ class TemplatesVersionRead(TemplatesVersionBase):
     id: str = Field(..., description="ObjectId of the template version.")
     template_master_id: str = Field(..., description="ObjectId of the associated template master.")
     previous_version_id: Optional[str] = Field(None, description="ObjectId of the previous version.")
+    version_num_int: Optional[int] = Field(None, description="Numeric version number, allocated per master.")
     log: LogRead = Field(..., description="Audit log.")
     model_config = ConfigDict(from_attributes=True)
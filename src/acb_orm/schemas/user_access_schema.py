@@ -1,10 +1,10 @@
 from typing import Optional
-from pydantic import BaseModel, Field, field_validator
-from acb_orm.validations.valid_reference_id import validate_reference_id
+from pydantic import BaseModel, Field, field_validator, ValidationInfo
+from acb_orm.validations.valid_reference_id import validate_reference_id, ReferenceSchema
 from acb_orm.collections.users import User
 from acb_orm.collections.roles import Role
 
-class UserAccessCreate(BaseModel):
+class UserAccessCreate(ReferenceSchema):
     """
     Creation schema for a new UserAccess document.
     """
@@ -12,14 +12,14 @@ class UserAccessCreate(BaseModel):
     role_id: str = Field(..., description="The unique ID of the role assigned to the user.")
 
     @field_validator('user_id')
-    def validate_user_id(cls, v):
-        return validate_reference_id(v, User)
+    def validate_user_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, User, info)
 
     @field_validator('role_id')
-    def validate_role_id(cls, v):
-        return validate_reference_id(v, Role)
+    def validate_role_id(cls, v, info: ValidationInfo):
+        return validate_reference_id(v, Role, info)
 
-class UserAccessUpdate(BaseModel):
+class UserAccessUpdate(ReferenceSchema):
     """
     Update schema for an existing UserAccess document.
     """
@@ -27,15 +27,15 @@ class UserAccessUpdate(BaseModel):
     role_id: Optional[str] = Field(None, description="The unique ID of the role assigned to the user.")
 
     @field_validator('user_id')
-    def validate_user_id(cls, v):
+    def validate_user_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, User)
+            return validate_reference_id(v, User, info)
         return v
 
     @field_validator('role_id')
-    def validate_role_id(cls, v):
+    def validate_role_id(cls, v, info: ValidationInfo):
         if v is not None:
-            return validate_reference_id(v, Role)
+            return validate_reference_id(v, Role, info)
         return v
 
 class UserAccessRead(BaseModel):
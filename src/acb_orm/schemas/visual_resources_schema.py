@@ -4,6 +4,7 @@ from acb_orm.schemas.log_schema import LogCreate, LogRead, LogUpdate
 from acb_orm.enums.status_visual_resource import StatusVisualResource
 from acb_orm.enums.file_type import FileType
 from acb_orm.schemas.access_config_schema import AccessConfigCreate, AccessConfigUpdate, AccessConfigRead
+from acb_orm.validations.valid_reference_id import ReferenceSchema
 
 
 class VisualResourcesBase(BaseModel):
@@ -16,7 +17,7 @@ class VisualResourcesBase(BaseModel):
     file_type: FileType = Field(..., description="Type of the file.")
     status: StatusVisualResource = Field(..., description="Status of the visual resource.")
 
-class VisualResourcesCreate(VisualResourcesBase):
+class VisualResourcesCreate(VisualResourcesBase, ReferenceSchema):
     """
     Creation schema for the visual resources document.
     All fields are required when creating a new document.
@@ -24,7 +25,7 @@ class VisualResourcesCreate(VisualResourcesBase):
     log: Optional[LogCreate] = Field(None, description="Audit log.")
     access_config: AccessConfigCreate = Field(..., description="Access configuration.")
 
-class VisualResourcesUpdate(BaseModel):
+class VisualResourcesUpdate(ReferenceSchema):
     """
     Update schema for the visual resources document.
     Only contains fields that are modified during an update.
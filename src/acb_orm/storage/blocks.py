@@ -0,0 +1,319 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from bson import json_util
+from pymongo import UpdateMany
+from pymongo.errors import BulkWriteError
+from acb_orm.collections.content_blocks import ContentBlock
+from acb_orm.storage.compression import decompress_fields
+
+# A stored sub-document replaced by a block is written as {'_block': <hash>}.
+BLOCK_MARKER = '_block'
+
+# Minimum block size, in bytes of canonical JSON, of each model with block
+# storage enabled.
+_min_sizes: Dict[type, int] = {}
+
+# Models that may hold block references, whether block storage is enabled
+# for them or not. Used by collect_garbage.
+_block_documents: List[type] = []
+
+class BlockCache:
+    """
+    Process-wide LRU of blocks by hash. Blocks never change once stored, so
+    entries are never stale.
+    """
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[dict]:
+        with self._lock:
+            block = self._entries.get(digest)
+            if block is not None:
+                self._entries.move_to_end(digest)
+            return block
+
+    def set(self, digest: str, block: dict) -> None:
+        with self._lock:
+            self._entries[digest] = block
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+block_cache = BlockCache()
+
+def configure_block_storage(document_cls: type, min_block_size: int = 1024) -> None:
+    """
+    Enables block storage for document_cls: when a document is saved, every
+    sub-document of its content whose canonical JSON takes at least
+    min_block_size bytes is stored once in 'content_blocks' and replaced by
+    its hash.
+    """
+    if min_block_size < 1:
+        raise ValueError("min_block_size must be at least 1.")
+    _min_sizes[document_cls] = min_block_size
+
+def disable_block_storage(document_cls: type) -> None:
+    """
+    Stores the content of new documents inline again. Stored block
+    references are still reassembled on read.
+    """
+    _min_sizes.pop(document_cls, None)
+
+def canonical_json(value) -> str:
+    return json_util.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+def is_block_ref(value) -> bool:
+    return isinstance(value, dict) and len(value) == 1 and isinstance(value.get(BLOCK_MARKER), str)
+
+def _split(value, min_size: int, blocks: Dict[str, dict], root: bool = False):
+    if isinstance(value, list):
+        return [_split(item, min_size, blocks) for item in value]
+    if not isinstance(value, dict):
+        return value
+    node = {key: _split(item, min_size, blocks) for key, item in value.items()}
+    if root:
+        return node
+    encoded = canonical_json(node).encode()
+    if len(encoded) < min_size:
+        return node
+    digest = hashlib.sha256(encoded).hexdigest()
+    blocks[digest] = node
+    return {BLOCK_MARKER: digest}
+
+def split_blocks(content: dict, min_block_size: int) -> Tuple[dict, Dict[str, dict]]:
+    """
+    Splits content into the value to store, with large sub-documents
+    replaced by block references, and the blocks by hash. Nested large
+    sub-documents become blocks of their own first.
+    """
+    blocks = {}
+    return _split(content, min_block_size, blocks, root=True), blocks
+
+def block_refs(value) -> Set[str]:
+    """
+    Returns the hashes of the blocks referenced directly by value.
+    """
+    if is_block_ref(value):
+        return {value[BLOCK_MARKER]}
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, list):
+        return set()
+    refs = set()
+    for item in value:
+        refs |= block_refs(item)
+    return refs
+
+def store_blocks(blocks: Dict[str, dict]) -> None:
+    """
+    Stores the blocks with one bulk upsert. Existing blocks are not
+    rewritten, only their stored_at is refreshed so that collect_garbage
+    cannot sweep a block that is being referenced again. A block swept
+    since it was last seen is simply stored again.
+    """
+    if not blocks:
+        return
+    now = datetime.now()
+    # On the unique '_id', UpdateMany upserts one block like UpdateOne, and it
+    # also runs on mongomock, whose bulk API lacks UpdateOne's sort option.
+    requests = [
+        UpdateMany({'_id': digest}, {
+            '$setOnInsert': {
+                'content': block,
+                'children': sorted(block_refs(block)),
+                'size': len(canonical_json(block).encode())
+            },
+            '$max': {'stored_at': now}
+        }, upsert=True)
+        for digest, block in blocks.items()
+    ]
+    try:
+        ContentBlock._get_collection().bulk_write(requests, ordered=False)
+    except BulkWriteError as error:
+        # Concurrent upserts of the same block: the other writer stored it.
+        if any(item['code'] != 11000 for item in error.details.get('writeErrors', [])):
+            raise
+
+def _remember(raws: Iterable[dict], known: Dict[str, dict]) -> Set[str]:
+    children = set()
+    for raw in raws:
+        known[raw['_id']] = raw['content']
+        block_cache.set(raw['_id'], raw['content'])
+        children |= block_refs(raw['content'])
+    return children
+
+def _from_cache(refs: Set[str], known: Dict[str, dict]) -> Tuple[Set[str], Set[str]]:
+    pending, children = set(), set()
+    for digest in refs - known.keys():
+        block = block_cache.get(digest)
+        if block is None:
+            pending.add(digest)
+        else:
+            known[digest] = block
+            children |= block_refs(block)
+    return pending, children
+
+def fetch_blocks(refs: Set[str], collection=None) -> Dict[str, dict]:
+    """
+    Loads the given blocks and the blocks nested in them, from the cache or
+    with one '$in' query per nesting level.
+    """
+    collection = collection if collection is not None else ContentBlock._get_collection()
+    known = {}
+    while refs:
+        pending, children = _from_cache(refs, known)
+        if pending:
+            children |= _remember(collection.find({'_id': {'$in': list(pending)}}, {'content': 1}), known)
+        refs = children - known.keys()
+    return known
+
+async def fetch_blocks_async(refs: Set[str], collection) -> Dict[str, dict]:
+    """
+    Async counterpart of fetch_blocks.
+    """
+    known = {}
+    while refs:
+        pending, children = _from_cache(refs, known)
+        if pending:
+            cursor = collection.find({'_id': {'$in': list(pending)}}, {'content': 1})
+            children |= _remember([raw async for raw in cursor], known)
+        refs = children - known.keys()
+    return known
+
+def assemble(value, blocks: Dict[str, dict]):
+    """
+    Returns a copy of value with every block reference replaced by the
+    block content.
+    """
+    if is_block_ref(value):
+        digest = value[BLOCK_MARKER]
+        if digest not in blocks:
+            raise ValueError(f"Content block '{digest}' does not exist.")
+        return assemble(blocks[digest], blocks)
+    if isinstance(value, dict):
+        return {key: assemble(item, blocks) for key, item in value.items()}
+    if isinstance(value, list):
+        return [assemble(item, blocks) for item in value]
+    return value
+
+def _content_field(document_cls: type) -> Optional[str]:
+    name = getattr(document_cls, '_block_field', None)
+    return document_cls._fields[name].db_field if name else None
+
+def _refs_of(field: str, raws: List[dict]) -> Set[str]:
+    refs = set()
+    for raw in raws:
+        if isinstance(raw.get(field), dict):
+            refs |= block_refs(raw[field])
+    return refs
+
+def _assemble_all(field: str, raws: List[dict], blocks: Dict[str, dict]) -> None:
+    for raw in raws:
+        if isinstance(raw.get(field), dict):
+            raw[field] = assemble(raw[field], blocks)
+
+def expand_blocks(document_cls: type, raws: List[dict], collection=None) -> List[dict]:
+    """
+    Reassembles, in place, the content of raw documents stored with block
+    references. collection is the 'content_blocks' collection to read from.
+    """
+    field = _content_field(document_cls)
+    refs = _refs_of(field, raws) if field else set()
+    if refs:
+        _assemble_all(field, raws, fetch_blocks(refs, collection))
+    return raws
+
+async def expand_blocks_async(document_cls: type, raws: List[dict], db) -> List[dict]:
+    """
+    Async counterpart of expand_blocks, reading blocks from db.
+    """
+    field = _content_field(document_cls)
+    refs = _refs_of(field, raws) if field else set()
+    if refs:
+        blocks = await fetch_blocks_async(refs, db[ContentBlock._get_collection_name()])
+        _assemble_all(field, raws, blocks)
+    return raws
+
+def collect_garbage(grace_period: timedelta = timedelta(hours=1)) -> int:
+    """
+    Mark and sweep: marks the blocks reachable from the contents of every
+    model that may reference blocks, then deletes the unreachable blocks not
+    stored during the grace period, which covers documents whose blocks were
+    stored but that are not saved yet. Returns the number of deleted blocks.
+    """
+    marked = set()
+    for document_cls in _block_documents:
+        field = _content_field(document_cls)
+        for raw in document_cls._get_collection().find({field: {'$exists': True}}, {field: 1}):
+            # Compressed contents hide their block references.
+            marked |= block_refs(decompress_fields(document_cls, [raw])[0].get(field))
+    blocks = ContentBlock._get_collection()
+    frontier = set(marked)
+    while frontier:
+        children = set()
+        for raw in blocks.find({'_id': {'$in': list(frontier)}}, {'children': 1}):
+            children |= set(raw.get('children', []))
+        frontier = children - marked
+        marked |= frontier
+    cutoff = datetime.now() - grace_period
+    garbage = [raw['_id'] for raw in blocks.find({'stored_at': {'$lt': cutoff}}, {'_id': 1}) if raw['_id'] not in marked]
+    if not garbage:
+        return 0
+    # A block stored again since the scan has a fresh stored_at and is kept.
+    return blocks.delete_many({'_id': {'$in': garbage}, 'stored_at': {'$lt': cutoff}}).deleted_count
+
+class BlockStoredContent:
+    """
+    Mixin for models whose content field (named by _block_field) may be
+    stored with its large sub-documents in 'content_blocks'. The content is
+    reassembled when documents are loaded.
+    """
+    _block_field: str = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls._block_field:
+            _block_documents.append(cls)
+
+    @classmethod
+    def _from_son(cls, son, *args, **kwargs):
+        if son and son.get(_content_field(cls)) is not None:
+            son = expand_blocks(cls, decompress_fields(cls, [dict(son)]))[0]
+        return super()._from_son(son, *args, **kwargs)
+
+    def _stores_content(self) -> bool:
+        # Versions stored as a delta keep no content of their own.
+        return getattr(self, 'delta_base_id', None) is None
+
+    def to_mongo(self, *args, **kwargs):
+        son = super().to_mongo(*args, **kwargs)
+        encoded = getattr(self, '_encoded_content', None)
+        field = _content_field(type(self))
+        if encoded is not None and field in son:
+            son[field] = self._fields[self._block_field].to_mongo(encoded)
+        return son
+
+    def save(self, *args, **kwargs):
+        self._encoded_content = None
+        name = self._block_field
+        min_size = _min_sizes.get(type(self))
+        changed = self._created or any(path == name or path.startswith(f"{name}.") for path in self._get_changed_fields())
+        if min_size and changed and self._stores_content():
+            encoded, blocks = split_blocks(getattr(self, name), min_size)
+            store_blocks(blocks)
+            self._encoded_content = encoded
+            if not self._created:
+                self._mark_as_changed(name)
+        try:
+            return super().save(*args, **kwargs)
+        finally:
+            self._encoded_content = None
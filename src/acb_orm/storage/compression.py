@@ -0,0 +1,123 @@
+import zlib
+from typing import Dict, List, NamedTuple, Optional
+import bson
+from bson import Binary
+from mongoengine import DictField
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# A compressed value is stored as
+# {'_compressed': <codec>, 'size': <BSON size>, 'data': <compressed BSON>}.
+COMPRESSED_MARKER = '_compressed'
+CODECS = ('zlib', 'zstd')
+
+class CompressionSettings(NamedTuple):
+    threshold: int
+    codec: str
+    level: Optional[int]
+
+# Compression settings of each model with compression enabled.
+_settings: Dict[type, CompressionSettings] = {}
+
+def configure_compression(document_cls: type, threshold: int = 4096, codec: str = 'zlib', level: Optional[int] = None) -> None:
+    """
+    Enables compression of the CompressedDictField values of document_cls
+    whose BSON takes at least threshold bytes. Smaller values stay inline.
+    codec 'zstd' requires the optional zstandard package.
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unsupported compression codec '{codec}'. Use one of: {', '.join(CODECS)}.")
+    if codec == 'zstd' and zstandard is None:
+        raise EnvironmentError("The 'zstd' codec requires the zstandard package (pip install acb_orm[zstd]).")
+    _settings[document_cls] = CompressionSettings(threshold, codec, level)
+
+def disable_compression(document_cls: type) -> None:
+    """
+    Stores new values of document_cls uncompressed again. Compressed values
+    are still decompressed on read.
+    """
+    _settings.pop(document_cls, None)
+
+def is_compressed(value) -> bool:
+    return isinstance(value, dict) and COMPRESSED_MARKER in value and isinstance(value.get('data'), bytes)
+
+def compress_value(value: dict, settings: CompressionSettings) -> dict:
+    """
+    Returns value as a compressed marker, or value itself when its BSON is
+    smaller than the threshold.
+    """
+    encoded = bson.encode(value)
+    if len(encoded) < settings.threshold:
+        return value
+    if settings.codec == 'zstd':
+        data = zstandard.ZstdCompressor(level=settings.level or 3).compress(encoded)
+    else:
+        data = zlib.compress(encoded, settings.level if settings.level is not None else 6)
+    return {COMPRESSED_MARKER: settings.codec, 'size': len(encoded), 'data': Binary(data)}
+
+def decompress_value(value):
+    """
+    Returns the dict stored in a compressed marker; other values are
+    returned as they are.
+    """
+    if not is_compressed(value):
+        return value
+    codec = value[COMPRESSED_MARKER]
+    if codec == 'zstd':
+        if zstandard is None:
+            raise EnvironmentError("Reading zstd-compressed values requires the zstandard package.")
+        encoded = zstandard.ZstdDecompressor().decompress(value['data'], max_output_size=value.get('size', 0))
+    elif codec == 'zlib':
+        encoded = zlib.decompress(value['data'])
+    else:
+        raise ValueError(f"Unsupported compression codec '{codec}'.")
+    return bson.decode(encoded)
+
+def compressed_fields(document_cls: type) -> List[str]:
+    return [field.db_field for field in document_cls._fields.values() if isinstance(field, CompressedDictField)]
+
+def decompress_fields(document_cls: type, raws: List[dict]) -> List[dict]:
+    """
+    Decompresses, in place, the compressed fields of raw documents.
+    """
+    fields = compressed_fields(document_cls)
+    for raw in raws if fields else ():
+        for field in fields:
+            if is_compressed(raw.get(field)):
+                raw[field] = decompress_value(raw[field])
+    return raws
+
+class CompressedDictField(DictField):
+    """
+    DictField whose value is stored compressed when compression is enabled
+    for its model with configure_compression and the value is large enough.
+    Projections that exclude the field skip the decompression as well.
+    """
+    def to_python(self, value):
+        return super().to_python(decompress_value(value))
+
+    def to_mongo(self, value, use_db_field=True, fields=None):
+        value = super().to_mongo(value, use_db_field, fields)
+        settings = _settings.get(self.owner_document)
+        if settings is None or not isinstance(value, dict):
+            return value
+        return compress_value(value, settings)
+
+class CompressedFields:
+    """
+    Mixin for models with CompressedDictField fields. A change inside a
+    compressed value rewrites the whole field, since its stored form cannot
+    be updated key by key.
+    """
+    def _get_changed_fields(self):
+        fields = set(compressed_fields(type(self)))
+        changed = []
+        for path in super()._get_changed_fields():
+            root = path.split('.', 1)[0]
+            path = root if root in fields else path
+            if path not in changed:
+                changed.append(path)
+        return changed
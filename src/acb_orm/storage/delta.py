@@ -0,0 +1,333 @@
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+import bson
+from bson import DBRef, ObjectId
+from mongoengine.queryset import QuerySet, transform
+from acb_orm.storage.blocks import expand_blocks, expand_blocks_async
+from acb_orm.storage.compression import decompress_fields
+from acb_orm.storage.json_patch import apply_patch, make_patch
+
+DELTA_FIELDS = ('delta_base_id', 'delta', 'delta_depth')
+
+# Documents read ahead from the cursor to rebuild their payloads together.
+REBUILD_BATCH_SIZE = 100
+
+# Keyword arguments of QuerySet.update and modify that are not updates.
+_UPDATE_OPTIONS = {'upsert', 'multi', 'write_concern', 'read_concern', 'full_result', 'array_filters',
+                   'full_response', 'remove', 'new'}
+
+# Snapshot interval of each version model with delta storage enabled.
+_intervals: Dict[type, int] = {}
+
+def configure_delta_storage(version_cls: type, snapshot_interval: int = 10) -> None:
+    """
+    Enables delta storage for new versions of version_cls. Every
+    snapshot_interval versions of a chain a full snapshot is stored; the
+    versions in between only store a JSON patch against that snapshot, so
+    rebuilding any version costs one extra read at most.
+    """
+    if snapshot_interval < 1:
+        raise ValueError("snapshot_interval must be at least 1.")
+    _intervals[version_cls] = snapshot_interval
+
+def disable_delta_storage(version_cls: type) -> None:
+    """
+    Stores new versions of version_cls in full again. Versions already
+    stored as deltas are still rebuilt on read.
+    """
+    _intervals.pop(version_cls, None)
+
+def _id_of(value) -> Optional[ObjectId]:
+    if isinstance(value, DBRef):
+        return value.id
+    if hasattr(value, 'pk'):
+        return value.pk
+    return value
+
+def _payload_field(version_cls: type) -> str:
+    return version_cls._fields[version_cls._delta_field].db_field
+
+def _pending(version_cls: type, raws: List[dict]) -> List[dict]:
+    field = _payload_field(version_cls)
+    return [raw for raw in raws if raw.get('delta_base_id') is not None and field not in raw and 'delta' in raw]
+
+def _load_snapshots(version_cls: type, collection, ids) -> Dict[ObjectId, dict]:
+    field = _payload_field(version_cls)
+    snapshots = list(collection.find({'_id': {'$in': list(ids)}}, {field: 1}))
+    snapshots = expand_blocks(version_cls, decompress_fields(version_cls, snapshots))
+    return {snapshot['_id']: snapshot[field] for snapshot in snapshots if field in snapshot}
+
+def _apply(version_cls: type, pending: List[dict], bases: Dict[ObjectId, dict]) -> None:
+    field = _payload_field(version_cls)
+    for raw in pending:
+        base = bases.get(raw['delta_base_id'])
+        if base is None:
+            raise ValueError(f"Snapshot '{raw['delta_base_id']}' of version '{raw.get('_id')}' does not exist.")
+        raw[field] = apply_patch(base, raw['delta'])
+
+def rebuild_payloads(version_cls: type, raws: List[dict], collection=None) -> List[dict]:
+    """
+    Rebuilds, in place, the payload of the raw delta-encoded versions in
+    raws with one '$in' query for their snapshots. Raw documents of other
+    models, or whose payload was not projected, are returned as they are.
+    """
+    if getattr(version_cls, '_delta_field', None) is None:
+        return raws
+    pending = _pending(version_cls, raws)
+    if pending:
+        collection = collection if collection is not None else version_cls._get_collection()
+        _apply(version_cls, pending, _load_snapshots(version_cls, collection, {raw['delta_base_id'] for raw in pending}))
+    return raws
+
+async def rebuild_payloads_async(version_cls: type, raws: List[dict], db) -> List[dict]:
+    """
+    Async counterpart of rebuild_payloads, reading from a database of
+    PyMongo's async client.
+    """
+    if getattr(version_cls, '_delta_field', None) is None:
+        return raws
+    pending = _pending(version_cls, raws)
+    if pending:
+        field = _payload_field(version_cls)
+        collection = db[version_cls._get_collection_name()]
+        cursor = collection.find({'_id': {'$in': list({raw['delta_base_id'] for raw in pending})}}, {field: 1})
+        snapshots = decompress_fields(version_cls, [raw async for raw in cursor])
+        snapshots = await expand_blocks_async(version_cls, snapshots, db)
+        _apply(version_cls, pending, {snapshot['_id']: snapshot.get(field) for snapshot in snapshots})
+    return raws
+
+def _set_snapshot(version) -> None:
+    version.delta_base_id = None
+    version.delta = None
+    version.delta_depth = None
+
+def encode_version(version) -> None:
+    """
+    Decides how a version is stored before it is saved. A new version is
+    stored as a patch against the snapshot of its previous version, unless
+    delta storage is disabled, the chain reached the snapshot interval or
+    the patch would not be smaller than the payload. An existing delta
+    version whose payload changed becomes a snapshot; a snapshot used by
+    delta versions cannot change its payload.
+    """
+    version_cls = type(version)
+    name = version_cls._delta_field
+    collection = version_cls._get_collection()
+    if not version._created:
+        changed = [path for path in version._get_changed_fields() if path == name or path.startswith(f"{name}.")]
+        if not changed:
+            return
+        if version.delta_base_id is not None:
+            _set_snapshot(version)
+            version._mark_as_changed(name)
+        elif collection.count_documents({'delta_base_id': version.pk}, limit=1):
+            raise ValueError(f"Version '{version.pk}' is the snapshot of delta-encoded versions and its {name} cannot change.")
+        return
+
+    _set_snapshot(version)
+    interval = _intervals.get(version_cls)
+    previous_id = _id_of(version._data.get('previous_version_id'))
+    if not interval or previous_id is None:
+        return
+    previous = collection.find_one({'_id': previous_id}, {'delta_base_id': 1, 'delta_depth': 1})
+    if previous is None:
+        return
+    depth = (previous.get('delta_depth') or 0) + 1
+    if depth >= interval:
+        return
+    base_id = previous.get('delta_base_id') or previous_id
+    base = _load_snapshots(version_cls, collection, [base_id]).get(base_id)
+    if base is None:
+        return
+    payload = getattr(version, name)
+    patch = make_patch(base, payload)
+    if len(bson.encode({'v': patch})) >= len(bson.encode({'v': payload})):
+        return
+    version.delta_base_id = base_id
+    version.delta = patch
+    version.delta_depth = depth
+
+def changes_payload(version_cls: type, update: dict) -> bool:
+    """
+    Returns whether a raw update document sets or removes the payload or
+    the delta fields of version_cls.
+    """
+    protected = {_payload_field(version_cls), *DELTA_FIELDS}
+    touched = {path.split('.')[0] for paths in update.values() if isinstance(paths, dict) for path in paths}
+    return bool(touched & protected)
+
+def _snapshot_error(version_cls: type) -> ValueError:
+    return ValueError(f"The update changes the {version_cls._delta_field} of snapshots of delta-encoded versions.")
+
+def check_snapshot_update(version_cls: type, ids: Iterable[ObjectId], update: dict, collection=None) -> None:
+    """
+    Raises ValueError if the raw update changes the payload of a version
+    with one of the given IDs that delta versions are based on.
+    """
+    if getattr(version_cls, '_delta_field', None) is None or not changes_payload(version_cls, update):
+        return
+    ids = list(ids)
+    collection = collection if collection is not None else version_cls._get_collection()
+    if ids and collection.count_documents({'delta_base_id': {'$in': ids}}, limit=1):
+        raise _snapshot_error(version_cls)
+
+async def check_snapshot_update_async(version_cls: type, ids: Iterable[ObjectId], update: dict, db) -> None:
+    """
+    Async counterpart of check_snapshot_update, reading from a database of
+    PyMongo's async client.
+    """
+    if getattr(version_cls, '_delta_field', None) is None or not changes_payload(version_cls, update):
+        return
+    ids = list(ids)
+    collection = db[version_cls._get_collection_name()]
+    if ids and await collection.count_documents({'delta_base_id': {'$in': ids}}, limit=1):
+        raise _snapshot_error(version_cls)
+
+def promote_dependents(version_cls: type, snapshot_ids: Iterable[ObjectId]) -> int:
+    """
+    Stores in full every delta version whose snapshot is one of
+    snapshot_ids, so the snapshots can be deleted. Returns how many
+    versions were promoted.
+    """
+    snapshot_ids = list(snapshot_ids)
+    if not snapshot_ids:
+        return 0
+    promoted = 0
+    for version in version_cls.objects(delta_base_id__in=snapshot_ids, id__nin=snapshot_ids):
+        version._mark_as_changed(version_cls._delta_field)
+        version.save()
+        promoted += 1
+    return promoted
+
+class DeltaQuerySet(QuerySet):
+    """
+    QuerySet of version models with delta storage. Iterating it rebuilds
+    the payloads of REBUILD_BATCH_SIZE documents at a time with one
+    snapshot query, also under only, exclude, scalar, values_list and
+    as_pymongo: projections of the payload read the delta fields too, and
+    the whole payload when only part of it is projected. Deleting
+    snapshots first promotes the versions based on them, and updates that
+    would change the payload of a snapshot in use raise ValueError, as
+    saving it does.
+    """
+    def _stores_deltas(self) -> bool:
+        return getattr(self._document, '_delta_field', None) is not None
+
+    def _matched_ids(self) -> List[ObjectId]:
+        return [raw['_id'] for raw in self._collection.find(self._query, {'_id': 1})]
+
+    def _check_snapshots(self, update: dict) -> None:
+        update = transform.update(self._document, **{key: value for key, value in update.items() if key not in _UPDATE_OPTIONS})
+        if changes_payload(self._document, update):
+            check_snapshot_update(self._document, self._matched_ids(), update, self._collection)
+
+    def _delta_projection(self):
+        """
+        Returns the projection of the cursor with what rebuilding the
+        payload needs, and the fields added to the requested ones.
+        """
+        projection = self._loaded_fields.as_dict() if self._loaded_fields else None
+        if not projection or not self._stores_deltas():
+            return projection, set()
+        field = _payload_field(self._document)
+        if any(value in (0, False) for key, value in projection.items() if key != '_id'):
+            if projection.get(field) in (0, False):
+                return projection, set()
+            hidden = {name for name in DELTA_FIELDS if name in projection}
+            return {key: value for key, value in projection.items() if key not in hidden} or None, hidden
+        if not any(key == field or key.startswith(f"{field}.") for key in projection):
+            return projection, set()
+        hidden = {name for name in DELTA_FIELDS if name not in projection}
+        projection = {key: value for key, value in projection.items() if not key.startswith(f"{field}.")}
+        return {**projection, field: 1, **dict.fromkeys(hidden, 1)}, hidden
+
+    @property
+    def _cursor_args(self):
+        cursor_args = super()._cursor_args
+        if 'projection' in cursor_args and self._stores_deltas():
+            projection, _ = self._delta_projection()
+            if projection is None:
+                del cursor_args['projection']
+            else:
+                cursor_args['projection'] = projection
+        return cursor_args
+
+    def _rebuild(self, raws: List[dict]) -> List[dict]:
+        rebuild_payloads(self._document, raws, self._collection)
+        if self._as_pymongo:
+            _, hidden = self._delta_projection()
+            for raw in raws:
+                for name in hidden:
+                    raw.pop(name, None)
+        return raws
+
+    def __getitem__(self, key):
+        result = super().__getitem__(key)
+        if isinstance(key, int) and self._as_pymongo and self._stores_deltas():
+            return self._rebuild([result])[0]
+        return result
+
+    def __next__(self):
+        if self._none or self._empty or not self._stores_deltas():
+            return super().__next__()
+        buffered = self.__dict__.setdefault('_rebuilt', deque())
+        if not buffered:
+            raws = list(islice(self._cursor, REBUILD_BATCH_SIZE))
+            if not raws:
+                raise StopIteration
+            buffered.extend(self._rebuild(raws))
+        if self._as_pymongo:
+            return buffered.popleft()
+        doc = self._document._from_son(buffered.popleft(), _auto_dereference=self._auto_dereference)
+        if self._scalar:
+            return self._get_scalar(doc)
+        return doc
+
+    def rewind(self):
+        self.__dict__.pop('_rebuilt', None)
+        return super().rewind()
+
+    def update(self, *args, **kwargs):
+        if self._stores_deltas():
+            self._check_snapshots(kwargs)
+        return super().update(*args, **kwargs)
+
+    def modify(self, *args, **kwargs):
+        if self._stores_deltas():
+            if kwargs.get('remove'):
+                promote_dependents(self._document, self._matched_ids())
+            else:
+                self._check_snapshots(kwargs)
+        return super().modify(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        # With skip or limit, documents are deleted one by one through here.
+        if self._stores_deltas() and not (self._skip or self._limit):
+            promote_dependents(self._document, self._matched_ids())
+        return super().delete(*args, **kwargs)
+
+class DeltaEncodedVersion:
+    """
+    Mixin for version models whose payload field (named by _delta_field)
+    may be stored as a JSON patch against an earlier snapshot. The payload
+    is rebuilt when documents are loaded, so the model and its *Read schema
+    always see the full value.
+    """
+    _delta_field: str = None
+
+    @classmethod
+    def _from_son(cls, son, *args, **kwargs):
+        if son and son.get('delta_base_id') is not None:
+            son = rebuild_payloads(cls, [dict(son)])[0]
+        return super()._from_son(son, *args, **kwargs)
+
+    def to_mongo(self, *args, **kwargs):
+        son = super().to_mongo(*args, **kwargs)
+        if son.get('delta_base_id') is not None:
+            son.pop(_payload_field(type(self)), None)
+        return son
+
+    def save(self, *args, **kwargs):
+        encode_version(self)
+        return super().save(*args, **kwargs)
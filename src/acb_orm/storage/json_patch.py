@@ -0,0 +1,60 @@
+import copy
+from typing import Any, List
+
+def _escape(key: str) -> str:
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+def _unescape(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+def _diff(source: Any, target: Any, path: str, ops: List[dict]) -> None:
+    if isinstance(source, dict) and isinstance(target, dict):
+        for key in source:
+            if key not in target:
+                ops.append({'op': 'remove', 'path': f"{path}/{_escape(key)}"})
+        for key, value in target.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in source:
+                ops.append({'op': 'add', 'path': child, 'value': value})
+            else:
+                _diff(source[key], value, child, ops)
+    elif isinstance(source, list) and isinstance(target, list) and len(source) == len(target):
+        for index, (old, new) in enumerate(zip(source, target)):
+            _diff(old, new, f"{path}/{index}", ops)
+    elif type(source) is not type(target) or source != target:
+        ops.append({'op': 'replace', 'path': path, 'value': target})
+
+def make_patch(source: dict, target: dict) -> List[dict]:
+    """
+    Returns the JSON patch (RFC 6902 'add', 'remove' and 'replace'
+    operations) that turns source into target. Lists whose length changed
+    are replaced as a whole.
+    """
+    ops = []
+    _diff(source, target, '', ops)
+    return ops
+
+def apply_patch(document: dict, ops: List[dict]) -> dict:
+    """
+    Applies a patch created by make_patch and returns a new document; the
+    given one is left untouched.
+    """
+    result = copy.deepcopy(document)
+    for op in ops:
+        if op['path'] == '':
+            result = copy.deepcopy(op['value'])
+            continue
+        tokens = [_unescape(token) for token in op['path'].split('/')[1:]]
+        parent = result
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            last = int(last)
+        if op['op'] == 'remove':
+            del parent[last]
+        elif op['op'] in ('add', 'replace'):
+            parent[last] = copy.deepcopy(op['value'])
+        else:
+            raise ValueError(f"Unsupported patch operation '{op['op']}'.")
+    return result
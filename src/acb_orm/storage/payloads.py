@@ -0,0 +1,36 @@
+from itertools import islice
+from typing import Iterable, Iterator, List
+from acb_orm.storage.blocks import expand_blocks, expand_blocks_async
+from acb_orm.storage.compression import decompress_fields
+from acb_orm.storage.delta import rebuild_payloads, rebuild_payloads_async
+
+def decode_documents(document_cls: type, raws: List[dict], collection=None) -> List[dict]:
+    """
+    Rebuilds, in place, the payloads of raw documents as the models see
+    them: compressed fields are decompressed, content blocks are reassembled
+    and delta-encoded versions are rebuilt from their snapshots. collection
+    is the collection the raw documents were read from.
+    """
+    decompress_fields(document_cls, raws)
+    expand_blocks(document_cls, raws)
+    return rebuild_payloads(document_cls, raws, collection)
+
+async def decode_documents_async(document_cls: type, raws: List[dict], db) -> List[dict]:
+    """
+    Async counterpart of decode_documents, reading from a database of
+    PyMongo's async client.
+    """
+    decompress_fields(document_cls, raws)
+    await expand_blocks_async(document_cls, raws, db)
+    return await rebuild_payloads_async(document_cls, raws, db)
+
+def iter_decoded(document_cls: type, raws: Iterable[dict], batch_size: int = 100, collection=None) -> Iterator[dict]:
+    """
+    Lazily decodes the raw documents of a cursor, one batch at a time.
+    """
+    raws = iter(raws)
+    while True:
+        batch = list(islice(raws, batch_size))
+        if not batch:
+            return
+        yield from decode_documents(document_cls, batch, collection)
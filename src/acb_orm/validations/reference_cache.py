@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Optional
+from bson import ObjectId
+from acb_orm.cache.invalidation import register_invalidation_hook, unregister_invalidation_hook
+from acb_orm.cache.version_cache import version_cache
+
+_scope: ContextVar[Optional[dict]] = ContextVar('acb_orm_validation_scope', default=None)
+
+class SharedReferenceCache:
+    """
+    Process-wide LRU of referenced IDs known to exist, bounded by size and TTL.
+    Only positive results are kept, since a missing document may be created
+    at any time by another process.
+    """
+    def __init__(self, collections: Iterable[str], maxsize: int = 10000, ttl: float = 60.0):
+        self.collections = set(collections)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, collection: str, value: str) -> Optional[bool]:
+        if collection not in self.collections:
+            return None
+        key = (collection, value)
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return None
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return True
+
+    def set(self, collection: str, value: str, exists: bool) -> None:
+        if collection not in self.collections:
+            return
+        key = (collection, value)
+        with self._lock:
+            if not exists:
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, collection: str, value: Optional[str] = None) -> None:
+        with self._lock:
+            if value is not None:
+                self._entries.pop((collection, value), None)
+                return
+            for key in [key for key in self._entries if key[0] == collection]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+_shared_cache: Optional[SharedReferenceCache] = None
+
+def configure_shared_reference_cache(collections: Iterable[str] = ('users', 'groups'), maxsize: int = 10000, ttl: float = 60.0) -> SharedReferenceCache:
+    """
+    Enables the process-wide reference cache for the given collection names.
+    IDs written or deleted through the ORM are evicted by an invalidation
+    hook.
+    """
+    global _shared_cache
+    disable_shared_reference_cache()
+    _shared_cache = SharedReferenceCache(collections, maxsize=maxsize, ttl=ttl)
+    register_invalidation_hook(_shared_cache.invalidate)
+    return _shared_cache
+
+def disable_shared_reference_cache() -> None:
+    """
+    Disables the process-wide reference cache.
+    """
+    global _shared_cache
+    if _shared_cache is not None:
+        unregister_invalidation_hook(_shared_cache.invalidate)
+    _shared_cache = None
+
+def get_shared_reference_cache() -> Optional[SharedReferenceCache]:
+    return _shared_cache
+
+@contextmanager
+def validation_scope():
+    """
+    Memoizes positive and negative reference existence checks for the
+    duration of the block, e.g. one request or one batch import.
+    Nested scopes share the outermost one.
+    """
+    if _scope.get() is not None:
+        yield
+        return
+    token = _scope.set({})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+def lookup_reference(collection: str, value: str) -> Optional[bool]:
+    """
+    Returns the cached existence of a referenced ID, or None if it is unknown.
+    Documents held by the version cache are known to exist.
+    """
+    scope = _scope.get()
+    if scope is not None and (collection, value) in scope:
+        return scope[(collection, value)]
+    if _shared_cache is not None:
+        exists = _shared_cache.get(collection, value)
+        if exists is not None:
+            if scope is not None:
+                scope[(collection, value)] = exists
+            return exists
+    if ObjectId.is_valid(value) and version_cache.contains(collection, ObjectId(value)):
+        return True
+    return None
+
+def remember_reference(collection: str, value: str, exists: bool) -> None:
+    """
+    Stores the result of an existence check in the active caches.
+    """
+    scope = _scope.get()
+    if scope is not None:
+        scope[(collection, value)] = exists
+    if _shared_cache is not None:
+        _shared_cache.set(collection, value, exists)
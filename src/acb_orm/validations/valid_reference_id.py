@@ -1,15 +1,262 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from bson import ObjectId
-from mongoengine import Document, DoesNotExist
+from pydantic import BaseModel, PrivateAttr, ValidationError, ValidationInfo, model_validator
+from acb_orm.validations.reference_cache import lookup_reference, remember_reference
 
-def validate_reference_id(value: str, document_cls: type) -> str:
+class ReferenceCheck(NamedTuple):
+    """
+    An existence check recorded by a reference validator while deferred.
+    loc is the location of the field, as in Pydantic errors.
+    """
+    document_cls: type
+    values: List[str]
+    loc: tuple
+
+_deferred_checks: ContextVar[Optional[list]] = ContextVar('acb_orm_deferred_checks', default=None)
+
+@contextmanager
+def deferred_references():
+    """
+    While active, the reference validators only check the ID format and
+    record their existence checks in the yielded list instead of querying
+    the database, so they can be verified later in one batch.
+    """
+    checks = []
+    token = _deferred_checks.set(checks)
+    try:
+        yield checks
+    finally:
+        _deferred_checks.reset(token)
+
+def _defer(values: List[str], document_cls: type, info: Optional[ValidationInfo]) -> bool:
+    checks = _deferred_checks.get()
+    if checks is None:
+        return False
+    loc = (info.field_name,) if info is not None and info.field_name else ()
+    checks.append(ReferenceCheck(document_cls, [str(value) for value in values], loc))
+    return True
+
+def _check_refs(info: Optional[ValidationInfo]) -> bool:
+    """
+    Reference existence checks are skipped when the schema is validated with
+    context={'check_refs': False}; only the ID format is checked then.
+    """
+    context = info.context if info is not None else None
+    return not (context and context.get('check_refs') is False)
+
+def missing_reference_message(missing: List[str]) -> str:
+    """
+    Builds the error message reported for IDs whose documents do not exist.
+    """
+    if len(missing) == 1:
+        return f"Referenced document with ID '{missing[0]}' does not exist."
+    ids = ", ".join(f"'{value}'" for value in missing)
+    return f"Referenced documents with IDs {ids} do not exist."
+
+def group_reference_checks(checks: Iterable[ReferenceCheck]) -> Dict[type, List[str]]:
+    """
+    Collects the IDs of all recorded checks per target document class.
+    """
+    references = {}
+    for check in checks:
+        references.setdefault(check.document_cls, []).extend(check.values)
+    return references
+
+def reference_line_errors(checks: Iterable[ReferenceCheck], missing: Dict[type, set], loc_prefix: tuple = ()) -> List[dict]:
+    """
+    Builds one Pydantic line error per failed check, using the same messages
+    as the reference validators. missing maps each document class to the IDs
+    that were not found.
+    """
+    line_errors = []
+    for check in checks:
+        failed = [value for value in dict.fromkeys(check.values) if value in missing.get(check.document_cls, ())]
+        if failed:
+            line_errors.append({
+                'type': 'value_error',
+                'loc': loc_prefix + check.loc,
+                'input': check.values if len(check.values) > 1 else check.values[0],
+                'ctx': {'error': ValueError(missing_reference_message(failed))}
+            })
+    return line_errors
+
+def _field_values(instance: BaseModel, loc: tuple) -> Iterator[Tuple[tuple, Any]]:
+    # Every field of the instance and its nested schemas, depth first in
+    # field order, which is the order the validators ran in.
+    for name in type(instance).model_fields:
+        value = getattr(instance, name)
+        yield loc + (name,), value
+        if isinstance(value, BaseModel):
+            yield from _field_values(value, loc + (name,))
+        elif isinstance(value, (list, tuple)):
+            for index, item in enumerate(value):
+                if isinstance(item, BaseModel):
+                    yield from _field_values(item, loc + (name, index))
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if isinstance(item, BaseModel):
+                    yield from _field_values(item, loc + (name, key))
+
+def _as_values(value) -> List[str]:
+    return [str(item) for item in value] if isinstance(value, (list, tuple)) else [str(value)]
+
+def locate_reference_checks(instance: BaseModel, checks: Iterable[ReferenceCheck]) -> List[ReferenceCheck]:
+    """
+    Returns the checks recorded while validating instance with their full
+    location in it, e.g. ('comments', 2, 'author_id'), since the validators
+    only know their field name. Each check is matched to the next field of
+    that name holding its values.
+    """
+    fields = list(_field_values(instance, ()))
+    position = 0
+    located = []
+    for check in checks:
+        name = check.loc[-1] if check.loc else None
+        for index in range(position, len(fields)):
+            loc, value = fields[index]
+            if loc[-1] == name and _as_values(value) == check.values:
+                check = check._replace(loc=loc)
+                position = index + 1
+                break
+        located.append(check)
+    return located
+
+def raise_for_missing_references(title: str, checks: Iterable[ReferenceCheck], missing: Dict[type, set]) -> None:
+    """
+    Raises a ValidationError for the failed checks, if any.
+    """
+    line_errors = reference_line_errors(checks, missing)
+    if line_errors:
+        raise ValidationError.from_exception_data(title, line_errors)
+
+class ReferenceSchema(BaseModel):
+    """
+    Base of the schemas with reference fields. When validated with
+    context={'check_refs': False}, the existence checks recorded by their
+    validators are kept on the instance for verify_references.
+    """
+    _reference_checks: List[ReferenceCheck] = PrivateAttr(default_factory=list)
+
+    @model_validator(mode='wrap')
+    @classmethod
+    def record_reference_checks(cls, data: Any, handler, info: ValidationInfo):
+        if _check_refs(info) or isinstance(data, cls):
+            return handler(data)
+        checks = _deferred_checks.get()
+        if checks is None:
+            with deferred_references() as checks:
+                instance = handler(data)
+        else:
+            # Nested schema: keep the checks recorded for its own fields.
+            start = len(checks)
+            instance = handler(data)
+            checks = checks[start:]
+        instance._reference_checks = checks
+        return instance
+
+def collect_reference_checks(instance: BaseModel) -> List[ReferenceCheck]:
+    """
+    Returns the existence checks of a schema instance that was validated with
+    context={'check_refs': False}, as recorded during that validation.
+    Instances validated with the checks enabled have none pending.
+    """
+    return locate_reference_checks(instance, getattr(instance, '_reference_checks', None) or [])
+
+def raise_for_instances(instances: List[BaseModel], checks_per_instance: List[List[ReferenceCheck]], missing: Dict[type, set]) -> None:
+    """
+    Raises one ValidationError covering every failed check of the instances.
+    When several instances are verified, error locations start with the
+    position of the instance.
+    """
+    line_errors = []
+    for index, checks in enumerate(checks_per_instance):
+        loc_prefix = (index,) if len(instances) > 1 else ()
+        line_errors.extend(reference_line_errors(checks, missing, loc_prefix))
+    if line_errors:
+        title = type(instances[0]).__name__ if len(instances) == 1 else "verify_references"
+        raise ValidationError.from_exception_data(title, line_errors)
+
+def reference_exists(value: str, document_cls: type) -> bool:
+    """
+    Checks whether a document with the given ID exists without loading it.
+    The check is a count on '_id' limited to one match, so it is answered
+    from the '_id' index and no document body is transferred.
+    """
+    return document_cls._get_collection().count_documents({'_id': ObjectId(value)}, limit=1) > 0
+
+def validate_reference_id(value: str, document_cls: type, info: Optional[ValidationInfo] = None) -> str:
     """
     Validates that the value is a valid ObjectId and that the referenced document exists.
     """
     if not ObjectId.is_valid(value):
         raise ValueError(f"Invalid ObjectId format for ID: '{value}'")
-    if document_cls:
-        try:
-            document_cls.objects.get(id=value)
-        except DoesNotExist:
-            raise ValueError(f"Referenced document with ID '{value}' does not exist.")
+    if document_cls and not _defer([value], document_cls, info) and _check_refs(info):
+        collection = document_cls._get_collection_name()
+        exists = lookup_reference(collection, str(value))
+        if exists is None:
+            exists = reference_exists(value, document_cls)
+            remember_reference(collection, str(value), exists)
+        if not exists:
+            raise ValueError(missing_reference_message([value]))
     return value
+
+def find_missing_ids(values: Iterable[str], document_cls: type) -> List[str]:
+    """
+    Returns the IDs in values that have no matching document in the collection
+    of document_cls. All IDs are checked with a single '$in' query that only
+    projects '_id'. The values must already be valid ObjectIds.
+    IDs already known to the active validation caches are not queried again.
+    """
+    collection = document_cls._get_collection_name()
+    unique_ids = list(dict.fromkeys(str(value) for value in values))
+    known = {value: lookup_reference(collection, value) for value in unique_ids}
+    pending = [value for value, exists in known.items() if exists is None]
+    if pending:
+        cursor = document_cls._get_collection().find(
+            {'_id': {'$in': [ObjectId(value) for value in pending]}},
+            {'_id': 1}
+        )
+        found = {str(doc['_id']) for doc in cursor}
+        for value in pending:
+            known[value] = value in found
+            remember_reference(collection, value, known[value])
+    return [value for value in unique_ids if not known[value]]
+
+def validate_reference_ids(values: List[str], document_cls: type, info: Optional[ValidationInfo] = None) -> List[str]:
+    """
+    Batched version of validate_reference_id for lists of IDs.
+    Checks the format of every ID and then the existence of all of them with
+    one query, reporting every missing ID in a single error.
+    """
+    for value in values:
+        if not ObjectId.is_valid(value):
+            raise ValueError(f"Invalid ObjectId format for ID: '{value}'")
+    if document_cls and values and not _defer(values, document_cls, info) and _check_refs(info):
+        missing = find_missing_ids(values, document_cls)
+        if missing:
+            raise ValueError(missing_reference_message(missing))
+    return values
+
+def validate_references(references: dict) -> dict:
+    """
+    Validates several lists of IDs at once, grouped by target collection.
+    references maps each document class to the IDs that must exist in it,
+    so every collection is checked with a single query.
+    """
+    return {document_cls: validate_reference_ids(list(values), document_cls)
+            for document_cls, values in references.items()}
+
+def verify_references(*instances: BaseModel) -> None:
+    """
+    Verifies the referenced IDs of schemas validated with
+    context={'check_refs': False}. The IDs of all instances are grouped by
+    collection and every collection is checked with a single query.
+    Raises a ValidationError with the same messages as the validators.
+    """
+    checks_per_instance = [collect_reference_checks(instance) for instance in instances]
+    references = group_reference_checks(check for checks in checks_per_instance for check in checks)
+    missing = {document_cls: set(find_missing_ids(values, document_cls))
+               for document_cls, values in references.items()}
+    raise_for_instances(list(instances), checks_per_instance, missing)
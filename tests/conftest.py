@@ -12,7 +12,7 @@ from acb_orm.auxiliaries.log import Log
 from acb_orm.auxiliaries.access_config import AccessConfig
 
 # Importaciones de MongoEngine y mongomock
-from mongoengine import Document, StringField, connect, disconnect
+from mongoengine import Document, StringField, connect, disconnect, get_db
 import mongomock
 
 # --- FIXTURES DE PYTEST ---
@@ -129,3 +129,70 @@ def setup_db(db_connection):
     BulletinsMaster.objects.delete()
     BulletinsVersion.objects.delete()
     Role.objects.delete()
+
+# --- ASYNC STAND-INS ---
+
+class AsyncCursorStub:
+    """
+    Minimal async cursor over a mongomock cursor.
+    """
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, value):
+        self._cursor = self._cursor.skip(value)
+        return self
+
+    def limit(self, value):
+        self._cursor = self._cursor.limit(value)
+        return self
+
+    def batch_size(self, value):
+        return self
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._cursor)
+        except StopIteration:
+            raise StopAsyncIteration
+
+class AsyncCollectionStub:
+    """
+    Exposes the subset of the async collection API used by the repositories.
+    """
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return AsyncCursorStub(self._collection.find(*args, **kwargs))
+
+    def aggregate(self, pipeline, **kwargs):
+        return AsyncCursorStub(self._collection.aggregate(pipeline))
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+        async def wrapper(*args, **kwargs):
+            kwargs.pop('session', None)
+            return method(*args, **kwargs)
+        return wrapper
+
+class AsyncDatabaseStub:
+    """
+    Async view of the mongomock database used by MongoEngine in the tests.
+    """
+    def __init__(self, db):
+        self._db = db
+
+    def __getitem__(self, name):
+        return AsyncCollectionStub(self._db[name])
+
+@pytest.fixture
+def async_db(db_connection):
+    return AsyncDatabaseStub(get_db())
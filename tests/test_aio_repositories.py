@@ -0,0 +1,69 @@
+import asyncio
+from datetime import datetime
+from bson import ObjectId
+from mongoengine import get_db
+
+from acb_orm.aio.repositories import BulletinsMasterRepository, CardsRepository, TemplatesVersionRepository
+from acb_orm.collections.cards import Cards
+from acb_orm.schemas.bulletins_master_schema import BulletinsMasterCreate, BulletinsMasterUpdate, BulletinsMasterRead
+
+def test_create_and_get(setup_db, async_db):
+    repository = BulletinsMasterRepository(async_db)
+    data = BulletinsMasterCreate(
+        bulletin_name="Async Bulletin",
+        base_template_master_id=setup_db['template_master'],
+        base_template_version_id=setup_db['template_version'],
+        access_config={"access_type": "public", "allowed_groups": []},
+        log={"created_at": datetime.now(), "creator_user_id": setup_db['user_1']}
+    )
+    created = asyncio.run(repository.create(data))
+    assert isinstance(created, BulletinsMasterRead)
+    assert created.base_template_master_id == setup_db['template_master']
+    fetched = asyncio.run(repository.get(created.id))
+    assert fetched.id == created.id
+    assert fetched.bulletin_name == "Async Bulletin"
+    assert asyncio.run(repository.get(str(ObjectId()))) is None
+
+def test_update_keeps_unset_fields(setup_db, async_db):
+    repository = BulletinsMasterRepository(async_db)
+    created = asyncio.run(repository.create({
+        "bulletin_name": "To Update",
+        "base_template_master_id": setup_db['template_master'],
+        "base_template_version_id": setup_db['template_version'],
+        "access_config": {"access_type": "public"},
+        "log": {"creator_user_id": setup_db['user_1']}
+    }))
+    update = BulletinsMasterUpdate(
+        status="published",
+        log={"updated_at": datetime.now(), "updater_user_id": setup_db['user_2']}
+    )
+    updated = asyncio.run(repository.update(created.id, update))
+    assert updated.status.value == "published"
+    assert updated.bulletin_name == "To Update"
+    assert updated.log.creator_user_id == setup_db['user_1']
+    assert updated.log.updater_user_id == setup_db['user_2']
+
+def test_list_and_stream(setup_db, async_db):
+    repository = CardsRepository(async_db)
+    for index in range(3):
+        asyncio.run(repository.create({
+            "card_name": f"Card {index}",
+            "card_type": "info" if index else "pest_or_disease",
+            "templates_master_ids": [setup_db['template_master']],
+            "access_config": {"access_type": "public"},
+            "content": {"index": index},
+            "log": {"creator_user_id": setup_db['user_1']}
+        }))
+    cards = asyncio.run(repository.list({"card_type": "info"}, sort=[("card_name", 1)]))
+    assert [card.card_name for card in cards] == ["Card 1", "Card 2"]
+
+    async def collect():
+        return [card async for card in repository.stream(batch_size=2)]
+    assert len(asyncio.run(collect())) == 3
+    Cards.objects.delete()
+
+def test_ensure_indexes(db_connection, async_db):
+    repository = TemplatesVersionRepository(async_db)
+    asyncio.run(repository.ensure_indexes())
+    indexes = get_db()['templates_versions'].index_information()
+    assert 'template_master_id_1' in indexes
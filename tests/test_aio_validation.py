@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from pydantic import ValidationError
+
+from acb_orm.aio.validation import validate_schema_async, verify_references_async
+from acb_orm.schemas.bulletin_reviews_schema import BulletinReviewsCreate
+from acb_orm.schemas.cards_schema import CardsCreate
+
+def review_data(setup_db, author_id):
+    comment = {
+        "text": "Looks good",
+        "created_at": datetime.now(),
+        "bulletin_version_id": setup_db['bulletin_version'],
+        "author_id": author_id
+    }
+    return {
+        "bulletin_master_id": setup_db['bulletin_master'],
+        "reviewer_user_id": setup_db['user_1'],
+        "log": {"created_at": datetime.now(), "creator_user_id": setup_db['user_1']},
+        "comments": [comment] * 5
+    }
+
+def test_validate_schema_async_valid(setup_db, async_db):
+    schema = asyncio.run(validate_schema_async(BulletinReviewsCreate, review_data(setup_db, setup_db['user_2']), async_db))
+    assert isinstance(schema, BulletinReviewsCreate)
+    assert len(schema.comments) == 5
+
+def test_validate_schema_async_missing_reference(setup_db, async_db):
+    missing_id = str(ObjectId())
+    with pytest.raises(ValidationError) as exc:
+        asyncio.run(validate_schema_async(BulletinReviewsCreate, review_data(setup_db, missing_id), async_db))
+    messages = [error['msg'] for error in exc.value.errors()]
+    assert messages == [f"Value error, Referenced document with ID '{missing_id}' does not exist."] * 5
+    assert [error['loc'] for error in exc.value.errors()] == [('comments', index, 'author_id') for index in range(5)]
+
+def test_validate_schema_async_matches_sync_message(setup_db, async_db):
+    missing_1, missing_2 = str(ObjectId()), str(ObjectId())
+    data = {
+        "card_name": "Async Card",
+        "card_type": "info",
+        "templates_master_ids": [setup_db['template_master'], missing_1, missing_2],
+        "access_config": {"access_type": "public", "allowed_groups": []},
+        "content": {}
+    }
+    with pytest.raises(ValidationError) as sync_exc:
+        CardsCreate(**data)
+    with pytest.raises(ValidationError) as async_exc:
+        asyncio.run(validate_schema_async(CardsCreate, data, async_db))
+    assert async_exc.value.errors()[0]['msg'] == sync_exc.value.errors()[0]['msg']
+
+def test_validate_schema_async_invalid_format(setup_db, async_db):
+    with pytest.raises(ValidationError, match="Invalid ObjectId format"):
+        asyncio.run(validate_schema_async(BulletinReviewsCreate, review_data(setup_db, "bad-id"), async_db))
+
+def test_verify_references_async(setup_db, async_db):
+    missing_id = str(ObjectId())
+    schema = BulletinReviewsCreate.model_validate(review_data(setup_db, missing_id), context={'check_refs': False})
+    with pytest.raises(ValidationError, match=missing_id):
+        asyncio.run(verify_references_async(schema, db=async_db))
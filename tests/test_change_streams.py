@@ -0,0 +1,91 @@
+import time
+import pytest
+from bson import ObjectId
+
+from acb_orm.auxiliaries.log import Log
+from acb_orm.cache.change_streams import ChangeStreamInvalidator, LocalEventBus, load_resume_token
+from acb_orm.cache.invalidation import register_invalidation_hook, unregister_invalidation_hook
+from acb_orm.cache.shared import LocalCacheBackend, configure_shared_cache, disable_shared_cache, get_role
+from acb_orm.collections.change_stream_tokens import ChangeStreamToken
+from acb_orm.collections.roles import Role
+from acb_orm.validations.reference_cache import configure_shared_reference_cache, disable_shared_reference_cache
+
+@pytest.fixture
+def bus(setup_db):
+    yield LocalEventBus()
+    ChangeStreamToken.objects.delete()
+
+@pytest.fixture
+def events():
+    received = []
+    def hook(collection, document_id):
+        received.append((collection, document_id))
+    register_invalidation_hook(hook)
+    yield received
+    unregister_invalidation_hook(hook)
+
+def test_external_update_evicts_shared_cache(setup_db, bus):
+    configure_shared_cache(LocalCacheBackend(), ttl=3600)
+    role = Role(role_name="Streamed Role", permissions={}, log=Log(creator_user_id=setup_db['user_1'])).save()
+    try:
+        assert get_role(role.id).description is None
+        # Another service writes behind the ORM's back.
+        Role._get_collection().update_one({'_id': role.id}, {'$set': {'description': "External"}})
+        assert get_role(role.id).description is None
+        bus.publish('roles', 'update', role.id)
+        ChangeStreamInvalidator(watch=bus.watch).run(until_idle=True)
+        assert get_role(role.id).description == "External"
+    finally:
+        disable_shared_cache()
+        role.delete()
+
+def test_unwatched_collections_are_ignored(bus, events):
+    bus.publish('bulletins_master', 'update', ObjectId())
+    bus.publish('templates_master', 'drop')
+    bus.publish('cards', 'insert', "650d5a32c74d081f9b36d654")
+    ChangeStreamInvalidator(watch=bus.watch).run(until_idle=True)
+    assert events == [('templates_master', None), ('cards', "650d5a32c74d081f9b36d654")]
+
+def test_resumes_after_restart(bus, events):
+    user_ids = [str(ObjectId()) for _ in range(3)]
+    bus.publish('users', 'update', user_ids[0])
+    bus.publish('users', 'update', user_ids[1])
+    ChangeStreamInvalidator(watch=bus.watch).run(until_idle=True)
+    assert load_resume_token('acb_orm') == {'_data': f"{2:016x}"}
+    bus.publish('users', 'delete', user_ids[2])
+    ChangeStreamInvalidator(watch=bus.watch).run(until_idle=True)
+    assert events == [('users', user_id) for user_id in user_ids]
+    ChangeStreamInvalidator('other', watch=bus.watch).run(until_idle=True)
+    assert len(events) == 6
+
+def test_lost_history_invalidates_everything(bus, events):
+    ChangeStreamToken(id='acb_orm', token={'_data': f"{99:016x}"}).save()
+    bus.publish('groups', 'update', ObjectId())
+    ChangeStreamInvalidator(collections=('groups', 'users'), watch=bus.watch).run(until_idle=True)
+    assert events[:2] == [('groups', None), ('users', None)]
+    assert len(events) == 3
+
+def test_delete_evicts_reference_cache(bus):
+    reference_cache = configure_shared_reference_cache(('groups',))
+    try:
+        group_id = str(ObjectId())
+        reference_cache.set('groups', group_id, True)
+        bus.publish('groups', 'delete', group_id)
+        ChangeStreamInvalidator(watch=bus.watch).run(until_idle=True)
+        assert reference_cache.get('groups', group_id) is None
+    finally:
+        disable_shared_reference_cache()
+
+def test_background_thread(bus, events):
+    invalidator = ChangeStreamInvalidator(watch=bus.watch)
+    invalidator.start()
+    try:
+        bus.publish('roles', 'replace', ObjectId())
+        for _ in range(50):
+            if events:
+                break
+            time.sleep(0.02)
+    finally:
+        invalidator.stop(timeout=5)
+    assert events and events[0][0] == 'roles'
+    assert invalidator._thread is None
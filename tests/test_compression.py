@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from bson import ObjectId
+
+from acb_orm.aio.repositories import CardsRepository
+from acb_orm.auxiliaries.log import Log
+from acb_orm.collections.bulletins_version import BulletinsVersion
+from acb_orm.collections.cards import Cards
+from acb_orm.collections.content_blocks import ContentBlock
+from acb_orm.converters.bson_to_read import read_all
+from acb_orm.schemas.bulletins_version_schema import BulletinsVersionRead
+from acb_orm.storage import compression
+from acb_orm.storage.blocks import BLOCK_MARKER, block_cache, configure_block_storage, disable_block_storage
+from acb_orm.storage.compression import (COMPRESSED_MARKER, CompressionSettings, compress_value, configure_compression,
+                                         decompress_value, disable_compression)
+
+DATA = {"forecast": [{"day": day, "text": "Lluvias moderadas " * 20} for day in range(10)]}
+
+@pytest.fixture
+def compressed_versions():
+    configure_compression(BulletinsVersion, threshold=1024)
+    yield
+    disable_compression(BulletinsVersion)
+
+def new_version(setup_db, data):
+    return BulletinsVersion(
+        bulletin_master_id=setup_db['bulletin_master'],
+        version_num="2",
+        log=Log(creator_user_id=setup_db['user_1']),
+        data=data
+    ).save()
+
+def test_compress_roundtrip():
+    settings = CompressionSettings(threshold=1024, codec='zlib', level=None)
+    stored = compress_value(DATA, settings)
+    assert stored[COMPRESSED_MARKER] == 'zlib'
+    assert len(stored['data']) < stored['size']
+    assert decompress_value(stored) == DATA
+    assert compress_value({"small": 1}, settings) == {"small": 1}
+
+def test_compressed_field(setup_db, compressed_versions):
+    version = new_version(setup_db, DATA)
+    small = new_version(setup_db, {"campo": "valor"})
+    raws = {raw['_id']: raw for raw in BulletinsVersion._get_collection().find()}
+    assert COMPRESSED_MARKER in raws[version.id]['data']
+    assert raws[small.id]['data'] == {"campo": "valor"}
+    assert BulletinsVersion.objects.get(id=version.id).data == DATA
+    schemas = read_all(BulletinsVersion.objects(id=version.id), BulletinsVersionRead)
+    assert schemas[0].data == DATA
+
+def test_change_rewrites_field(setup_db, compressed_versions):
+    version = BulletinsVersion.objects.get(id=new_version(setup_db, DATA).id)
+    version.data["forecast"][0]["text"] = "Seco"
+    version.save()
+    raw = BulletinsVersion._get_collection().find_one({'_id': version.id})
+    assert decompress_value(raw['data'])["forecast"][0]["text"] == "Seco"
+
+def test_projection_skips_decompression(setup_db, compressed_versions, monkeypatch):
+    version = new_version(setup_db, DATA)
+    def fail(value):
+        raise AssertionError("decompressed")
+    monkeypatch.setattr(compression, 'decompress_value', fail)
+    assert BulletinsVersion.objects.only('version_num').get(id=version.id).version_num == "2"
+
+def test_blocks_then_compression(setup_db, async_db):
+    configure_block_storage(Cards, min_block_size=256)
+    configure_compression(Cards, threshold=512)
+    try:
+        content = {"header": {"text": "h" * 300}, "sections": [{"text": f"section {index} " * 40} for index in range(5)]}
+        card = asyncio.run(CardsRepository(async_db).create({
+            "card_name": "Compressed Card",
+            "card_type": "info",
+            "templates_master_ids": [ObjectId(setup_db['template_master'])],
+            "access_config": {"access_type": "public", "allowed_groups": []},
+            "content": content,
+            "log": {"creator_user_id": setup_db['user_1']}
+        }))
+        assert card.content == content
+        saved = Cards.objects.get(id=card.id)
+        saved.content["header"]["text"] = "H" * 300
+        saved.save()
+        raw = Cards._get_collection().find_one({'_id': saved.id})
+        assert COMPRESSED_MARKER in raw['content']
+        assert BLOCK_MARKER in decompress_value(raw['content'])['header']
+        block_cache.clear()
+        assert Cards.objects.get(id=card.id).content["header"]["text"] == "H" * 300
+        assert asyncio.run(CardsRepository(async_db).get(card.id)).content["sections"] == content["sections"]
+    finally:
+        disable_block_storage(Cards)
+        disable_compression(Cards)
+        Cards.objects.delete()
+        ContentBlock.objects.delete()
+        block_cache.clear()
+
+@pytest.mark.skipif(compression.zstandard is not None, reason="zstandard is installed")
+def test_zstd_requires_package():
+    with pytest.raises(EnvironmentError, match="zstandard"):
+        configure_compression(Cards, codec='zstd')
+
+def test_unknown_codec():
+    with pytest.raises(ValueError, match="Unsupported"):
+        configure_compression(Cards, codec='lz4')
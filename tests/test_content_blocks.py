@@ -0,0 +1,144 @@
+import asyncio
+from datetime import timedelta
+import pytest
+from bson import ObjectId
+
+from acb_orm.aio.repositories import CardsRepository
+from acb_orm.auxiliaries.access_config import AccessConfig
+from acb_orm.auxiliaries.log import Log
+from acb_orm.collections.cards import Cards
+from acb_orm.collections.content_blocks import ContentBlock
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.converters.bson_to_read import read_all
+from acb_orm.queries.pagination import paginate
+from acb_orm.schemas.cards_schema import CardsRead
+from acb_orm.storage.blocks import (BLOCK_MARKER, assemble, block_cache, collect_garbage, configure_block_storage,
+                                    disable_block_storage, split_blocks, store_blocks)
+from acb_orm.storage.compression import COMPRESSED_MARKER, configure_compression, disable_compression
+from acb_orm.storage.delta import configure_delta_storage, disable_delta_storage
+
+HEADER = {"title": "Boletín agroclimático", "subtitle": "h" * 300, "logo": {"file": "logo.png", "caption": "x" * 300}}
+FOOTER = {"text": "y" * 300}
+
+def card_content(index):
+    return {"header": HEADER, "body": {"text": f"Card {index}"}, "footer": FOOTER}
+
+@pytest.fixture
+def block_storage(db_connection):
+    configure_block_storage(Cards, min_block_size=256)
+    configure_block_storage(TemplatesVersion, min_block_size=256)
+    yield
+    disable_block_storage(Cards)
+    disable_block_storage(TemplatesVersion)
+    Cards.objects.delete()
+    ContentBlock.objects.delete()
+    block_cache.clear()
+
+def create_cards(setup_db, count):
+    return [Cards(
+        card_name=f"Block Card {index}",
+        card_type="info",
+        templates_master_ids=[ObjectId(setup_db['template_master'])],
+        access_config=AccessConfig(access_type='public'),
+        content=card_content(index),
+        log=Log(creator_user_id=setup_db['user_1'])
+    ).save() for index in range(count)]
+
+def test_split_and_assemble():
+    content = card_content(0)
+    stored, blocks = split_blocks(content, 256)
+    assert set(stored) == {"header", "body", "footer"}
+    assert BLOCK_MARKER in stored["header"] and stored["body"] == {"text": "Card 0"}
+    # The logo is a block of its own, referenced from the header block.
+    assert len(blocks) == 3
+    assert assemble(stored, blocks) == content
+
+def test_shared_blocks_stored_once(setup_db, block_storage, async_db):
+    cards = create_cards(setup_db, 5)
+    assert ContentBlock.objects.count() == 3
+    raw = Cards._get_collection().find_one({'_id': cards[0].id})
+    assert BLOCK_MARKER in raw['content']['header']
+    block_cache.clear()
+    assert Cards.objects.get(id=cards[3].id).content == card_content(3)
+    schemas = read_all(Cards.objects(card_name__startswith="Block Card").order_by('card_name'), CardsRead)
+    assert [schema.content for schema in schemas] == [card_content(index) for index in range(5)]
+    page = paginate(Cards, CardsRead, limit=2, filters={'_id': {'$in': [card.id for card in cards]}})
+    assert page.items[1].content == card_content(1)
+    card = asyncio.run(CardsRepository(async_db).get(str(cards[4].id)))
+    assert card.content == card_content(4)
+
+def test_update_keeps_blocks(setup_db, block_storage):
+    card = create_cards(setup_db, 1)[0]
+    card.content["body"]["text"] = "Updated"
+    card.save()
+    raw = Cards._get_collection().find_one({'_id': card.id})
+    assert raw['content']['body'] == {"text": "Updated"}
+    assert BLOCK_MARKER in raw['content']['footer']
+    assert Cards.objects.get(id=card.id).content["header"] == HEADER
+
+def test_delta_versions_over_blocks(setup_db, block_storage):
+    configure_delta_storage(TemplatesVersion, snapshot_interval=5)
+    try:
+        previous = None
+        for index in range(3):
+            previous = TemplatesVersion(
+                template_master_id=setup_db['template_master'],
+                previous_version_id=previous,
+                version_num=str(index + 1),
+                commit_message="Edit",
+                content=card_content(index),
+                log=Log(creator_user_id=setup_db['user_1'])
+            ).save()
+        block_cache.clear()
+        assert TemplatesVersion.objects.get(id=previous.id).content == card_content(2)
+    finally:
+        disable_delta_storage(TemplatesVersion)
+
+def test_collect_garbage(setup_db, block_storage):
+    cards = create_cards(setup_db, 2)
+    Cards(
+        card_name="Other footer",
+        card_type="info",
+        templates_master_ids=[ObjectId(setup_db['template_master'])],
+        access_config=AccessConfig(access_type='public'),
+        content={"footer": {"text": "z" * 300}},
+        log=Log(creator_user_id=setup_db['user_1'])
+    ).save()
+    assert collect_garbage(grace_period=timedelta(0)) == 0
+    Cards.objects(card_name="Other footer").delete()
+    assert collect_garbage(grace_period=timedelta(hours=1)) == 0
+    assert collect_garbage(grace_period=timedelta(0)) == 1
+    for card in cards:
+        card.delete()
+    assert collect_garbage(grace_period=timedelta(0)) == 3
+    assert ContentBlock.objects.count() == 0
+
+def test_store_blocks_restores_swept_blocks(block_storage):
+    _, blocks = split_blocks({"footer": {"text": "w" * 300}}, 256)
+    store_blocks(blocks)
+    digest = next(iter(blocks))
+    stored_at = ContentBlock._get_collection().find_one({'_id': digest})['stored_at']
+    store_blocks(blocks)
+    assert ContentBlock._get_collection().find_one({'_id': digest})['stored_at'] >= stored_at
+    ContentBlock._get_collection().delete_many({})
+    store_blocks(blocks)
+    assert ContentBlock._get_collection().find_one({'_id': digest})['content'] == blocks[digest]
+
+def test_collect_garbage_with_compression(setup_db, block_storage):
+    configure_compression(Cards, threshold=512)
+    try:
+        content = {"header": {"text": "c" * 300}, "notes": "n" * 600}
+        card = Cards(
+            card_name="Compressed blocks",
+            card_type="info",
+            templates_master_ids=[ObjectId(setup_db['template_master'])],
+            access_config=AccessConfig(access_type='public'),
+            content=content,
+            log=Log(creator_user_id=setup_db['user_1'])
+        ).save()
+        assert COMPRESSED_MARKER in Cards._get_collection().find_one({'_id': card.id})['content']
+        assert collect_garbage(grace_period=timedelta(0)) == 0
+        block_cache.clear()
+        assert Cards.objects.get(id=card.id).content == content
+    finally:
+        disable_compression(Cards)
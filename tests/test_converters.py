@@ -0,0 +1,55 @@
+from datetime import datetime
+from bson import ObjectId
+
+from acb_orm.auxiliaries.log import Log
+from acb_orm.collections.bulletins_master import BulletinsMaster
+from acb_orm.collections.bulletin_reviews import BulletinReviews
+from acb_orm.converters.bson_to_read import to_read, iter_read, read_all
+from acb_orm.schemas.bulletins_master_schema import BulletinsMasterRead
+from acb_orm.schemas.bulletin_reviews_schema import BulletinReviewsRead
+from acb_orm.schemas.templates_version_schema import TemplatesVersionRead
+from acb_orm.collections.templates_version import TemplatesVersion
+
+def test_to_read_maps_ids_and_embedded(setup_db):
+    raw = BulletinsMaster.objects(id=setup_db['bulletin_master']).as_pymongo().first()
+    schema = to_read(BulletinsMasterRead, raw)
+    assert schema.id == setup_db['bulletin_master']
+    assert schema.base_template_master_id == setup_db['template_master']
+    assert schema.base_template_version_id == setup_db['template_version']
+    assert schema.log.creator_user_id == setup_db['user_1']
+    assert schema.access_config.allowed_groups == []
+
+def test_to_read_nested_comments(setup_db):
+    review = BulletinReviews(
+        bulletin_master_id=setup_db['bulletin_master'],
+        reviewer_user_id=setup_db['user_1'],
+        log=Log(creator_user_id=setup_db['user_1']),
+        comments=[{
+            'text': 'Fix the title',
+            'bulletin_version_id': setup_db['bulletin_version'],
+            'author_id': setup_db['user_2'],
+            'created_at': datetime.now(),
+            'replies': [{
+                'text': 'Done',
+                'bulletin_version_id': setup_db['bulletin_version'],
+                'author_id': setup_db['user_1'],
+                'created_at': datetime.now()
+            }]
+        }]
+    ).save()
+    raw = BulletinReviews._get_collection().find_one({'_id': review.id})
+    schema = to_read(BulletinReviewsRead, raw)
+    assert schema.comments[0].author_id == setup_db['user_2']
+    assert schema.comments[0].replies[0].author_id == setup_db['user_1']
+    review.delete()
+
+def test_opaque_fields_are_passed_through(setup_db):
+    content = {"_id": "section-1", "blocks": [{"title": "Header"}]}
+    TemplatesVersion.objects(id=setup_db['template_version']).update(set__content=content, set__template_master_id=ObjectId(setup_db["template_master"]))
+    schemas = list(iter_read(TemplatesVersionRead, TemplatesVersion.objects.as_pymongo()))
+    assert schemas[0].content == content
+    assert schemas[0].id == setup_db['template_version']
+
+def test_read_all(setup_db):
+    schemas = read_all(BulletinsMaster.objects(bulletin_name="Ejemplo Bulletin"), BulletinsMasterRead)
+    assert [schema.id for schema in schemas] == [setup_db['bulletin_master']]
@@ -0,0 +1,56 @@
+from bson import ObjectId
+
+from acb_orm.auxiliaries.access_config import AccessConfig
+from acb_orm.cache.version_cache import version_cache
+from acb_orm.collections.bulletins_master import BulletinsMaster
+from acb_orm.collections.templates_master import TemplatesMaster
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.queries.current_version import get_bulletin_view, get_bulletin_views, get_template_view
+
+def link_current_versions(setup_db):
+    template_master_id = ObjectId(setup_db['template_master'])
+    template_version_id = ObjectId(setup_db['template_version'])
+    TemplatesVersion.objects(id=template_version_id).update(set__template_master_id=template_master_id)
+    TemplatesMaster.objects(id=template_master_id).update(
+        set__current_version_id=template_version_id,
+        set__access_config=AccessConfig(access_type='public')
+    )
+    BulletinsMaster.objects(id=setup_db['bulletin_master']).update(set__current_version_id=ObjectId(setup_db['bulletin_version']))
+
+def test_get_bulletin_view(setup_db):
+    link_current_versions(setup_db)
+    view = get_bulletin_view(setup_db['bulletin_master'])
+    assert view.bulletin.id == setup_db['bulletin_master']
+    assert view.current_version.id == setup_db['bulletin_version']
+    assert view.current_version.data == {"campo": "valor"}
+    assert view.base_template_version.id == setup_db['template_version']
+    assert view.base_template_version.content == {"key": "value"}
+
+def test_get_bulletin_view_without_current_version(setup_db):
+    link_current_versions(setup_db)
+    BulletinsMaster.objects(id=setup_db['bulletin_master']).update(unset__current_version_id=True)
+    view = get_bulletin_view(setup_db['bulletin_master'])
+    assert view.current_version is None
+    assert view.base_template_version is not None
+
+def test_get_bulletin_views_skips_unknown_ids(setup_db):
+    link_current_versions(setup_db)
+    views = get_bulletin_views([str(ObjectId()), setup_db['bulletin_master']])
+    assert [view.bulletin.id for view in views] == [setup_db['bulletin_master']]
+    assert get_bulletin_view(str(ObjectId())) is None
+
+def test_get_template_view(setup_db):
+    link_current_versions(setup_db)
+    view = get_template_view(setup_db['template_master'])
+    assert view.template.id == setup_db['template_master']
+    assert view.current_version.id == setup_db['template_version']
+
+def test_template_versions_come_from_cache(setup_db):
+    link_current_versions(setup_db)
+    version_cache.clear()
+    version_cache.reset_stats()
+    get_bulletin_view(setup_db['bulletin_master'])
+    view = get_template_view(setup_db['template_master'])
+    assert view.current_version.content == {"key": "value"}
+    assert (version_cache.stats().misses, version_cache.stats().hits) == (1, 1)
+    version_cache.clear()
@@ -0,0 +1,45 @@
+import pytest
+from pymongo import MongoClient
+
+from acb_orm.database.database import get_connection_settings, READ_ALIAS
+
+@pytest.fixture
+def database_env(monkeypatch):
+    monkeypatch.setenv("DATABASE_URI", "mongodb://localhost:27017")
+    monkeypatch.setenv("DATABASE_NAME", "bulletin_builder")
+    return monkeypatch
+
+def test_default_settings(database_env):
+    settings = get_connection_settings()
+    assert settings == {'db': 'bulletin_builder', 'host': 'mongodb://localhost:27017', 'alias': 'default'}
+
+def test_pool_and_compression_settings(database_env):
+    database_env.setenv("DATABASE_MAX_POOL_SIZE", "200")
+    database_env.setenv("DATABASE_WAIT_QUEUE_TIMEOUT_MS", "500")
+    database_env.setenv("DATABASE_COMPRESSORS", "zstd,zlib")
+    database_env.setenv("DATABASE_WRITE_CONCERN", "majority")
+    settings = get_connection_settings(minPoolSize=5)
+    assert settings['maxPoolSize'] == 200
+    assert settings['waitQueueTimeoutMS'] == 500
+    assert settings['minPoolSize'] == 5
+    assert settings['compressors'] == "zstd,zlib"
+    assert settings['w'] == "majority"
+
+def test_read_replica_settings(database_env):
+    database_env.setenv("DATABASE_READ_REPLICA_URI", "mongodb://replica:27017")
+    database_env.setenv("DATABASE_READ_REPLICA_READ_PREFERENCE_TAGS", "dc:bog,rack:1;")
+    settings = get_connection_settings(READ_ALIAS)
+    assert settings['alias'] == READ_ALIAS
+    assert settings['host'] == "mongodb://replica:27017"
+    assert settings['db'] == "bulletin_builder"
+    assert settings['readPreference'] == "secondaryPreferred"
+    assert settings['readPreferenceTags'] == ['dc:bog,rack:1', '']
+    options = {key: value for key, value in settings.items() if key not in ('alias', 'db')}
+    client = MongoClient(connect=False, **options)
+    assert client.read_preference.tag_sets == [{'dc': 'bog', 'rack': '1'}, {}]
+
+def test_missing_settings(monkeypatch):
+    monkeypatch.delenv("DATABASE_URI", raising=False)
+    monkeypatch.delenv("DATABASE_NAME", raising=False)
+    with pytest.raises(EnvironmentError):
+        get_connection_settings()
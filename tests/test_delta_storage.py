@@ -0,0 +1,160 @@
+import asyncio
+import pytest
+
+from acb_orm.aio.repositories import TemplatesVersionRepository
+from acb_orm.auxiliaries.log import Log
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.converters.bson_to_read import read_all
+from acb_orm.queries.version_history import get_template_history
+from acb_orm.schemas.templates_version_schema import TemplatesVersionRead
+from acb_orm.storage import delta
+from acb_orm.storage.delta import configure_delta_storage, disable_delta_storage
+from acb_orm.storage.json_patch import apply_patch, make_patch
+
+def content_for(index):
+    return {
+        "header": {"title": "Boletín agroclimático", "logo": "logo.png"},
+        "sections": [{"name": f"section {number}", "text": "x" * 200} for number in range(5)],
+        "edition": index
+    }
+
+@pytest.fixture
+def delta_storage():
+    configure_delta_storage(TemplatesVersion, snapshot_interval=3)
+    yield
+    disable_delta_storage(TemplatesVersion)
+
+def create_chain(setup_db, length):
+    previous = None
+    versions = []
+    for index in range(length):
+        version = TemplatesVersion(
+            template_master_id=setup_db['template_master'],
+            previous_version_id=previous,
+            version_num=str(index + 1),
+            commit_message=f"Version {index + 1}",
+            content=content_for(index),
+            log=Log(creator_user_id=setup_db['user_1'])
+        ).save()
+        previous = version.id
+        versions.append(version)
+    return versions
+
+def test_patch_roundtrip():
+    source = {"a": 1, "b": {"c": [1, 2], "d/e": "x"}, "f": [1]}
+    target = {"a": 2, "b": {"c": [1, 3], "g": None}, "f": [1, 2]}
+    assert apply_patch(source, make_patch(source, target)) == target
+    assert source["b"]["c"] == [1, 2]
+
+def test_snapshot_interval(setup_db, delta_storage):
+    versions = create_chain(setup_db, 7)
+    raws = {raw['_id']: raw for raw in TemplatesVersion._get_collection().find()}
+    stored = [raws[version.id] for version in versions]
+    assert [raw.get('delta_depth') for raw in stored] == [None, 1, 2, None, 1, 2, None]
+    assert 'content' not in stored[1]
+    assert stored[2]['delta_base_id'] == versions[0].id
+    assert stored[4]['delta_base_id'] == versions[3].id
+
+def test_versions_rebuilt_on_read(setup_db, delta_storage):
+    versions = create_chain(setup_db, 5)
+    ids = [version.id for version in versions]
+    assert [TemplatesVersion.objects.get(id=id).content for id in ids] == [content_for(index) for index in range(5)]
+    schemas = read_all(TemplatesVersion.objects(id__in=ids).order_by('id'), TemplatesVersionRead)
+    assert [schema.content["edition"] for schema in schemas] == list(range(5))
+    history = get_template_history(setup_db['template_master'], limit=3)
+    assert [version.content for version in history] == [content_for(index) for index in (4, 3, 2)]
+
+def test_async_repository_rebuilds(setup_db, delta_storage, async_db):
+    versions = create_chain(setup_db, 3)
+    schema = asyncio.run(TemplatesVersionRepository(async_db).get(str(versions[2].id)))
+    assert schema.content == content_for(2)
+
+def test_changed_delta_version_becomes_snapshot(setup_db, delta_storage):
+    versions = create_chain(setup_db, 2)
+    version = TemplatesVersion.objects.get(id=versions[1].id)
+    version.content["edition"] = 99
+    version.save()
+    raw = TemplatesVersion._get_collection().find_one({'_id': version.id})
+    assert 'delta_base_id' not in raw
+    assert raw['content']['edition'] == 99
+
+def test_snapshot_in_use_cannot_change(setup_db, delta_storage):
+    versions = create_chain(setup_db, 2)
+    snapshot = TemplatesVersion.objects.get(id=versions[0].id)
+    snapshot.content["edition"] = 99
+    with pytest.raises(ValueError, match="snapshot"):
+        snapshot.save()
+
+def test_deleting_snapshot_promotes_dependents(setup_db, delta_storage):
+    versions = create_chain(setup_db, 3)
+    TemplatesVersion.objects.get(id=versions[0].id).delete()
+    raws = list(TemplatesVersion._get_collection().find({'_id': {'$in': [version.id for version in versions[1:]]}}))
+    assert all('delta_base_id' not in raw for raw in raws)
+    assert [TemplatesVersion.objects.get(id=version.id).content for version in versions[1:]] == [content_for(1), content_for(2)]
+
+def test_queryset_update_of_snapshot_in_use(setup_db, delta_storage):
+    versions = create_chain(setup_db, 2)
+    with pytest.raises(ValueError, match="snapshots"):
+        TemplatesVersion.objects(id=versions[0].id).update(set__content={"edition": 99})
+    TemplatesVersion.objects(id=versions[0].id).update(set__commit_message="Renamed")
+    assert TemplatesVersion.objects.get(id=versions[1].id).content == content_for(1)
+
+def test_async_update_of_snapshot_in_use(setup_db, delta_storage, async_db):
+    versions = create_chain(setup_db, 2)
+    repository = TemplatesVersionRepository(async_db)
+    with pytest.raises(ValueError, match="snapshots"):
+        asyncio.run(repository.update(str(versions[0].id), {"content": {"edition": 99}}))
+    assert asyncio.run(repository.update(str(versions[0].id), {"commit_message": "Renamed"})).content == content_for(0)
+    assert asyncio.run(repository.update(str(versions[1].id), {"content": {"edition": 99}})).content == {"edition": 99}
+    raw = TemplatesVersion._get_collection().find_one({'_id': versions[1].id})
+    assert 'delta_base_id' not in raw
+    assert TemplatesVersion.objects.get(id=versions[1].id).content == {"edition": 99}
+    asyncio.run(repository.update(str(versions[0].id), {"content": {"edition": 98}}))
+    assert TemplatesVersion.objects.get(id=versions[0].id).content == {"edition": 98}
+
+def test_iteration_loads_snapshots_in_batches(setup_db, delta_storage, monkeypatch):
+    versions = create_chain(setup_db, 6)
+    queries = []
+    original = delta._load_snapshots
+    def load_snapshots(version_cls, collection, ids):
+        queries.append(set(ids))
+        return original(version_cls, collection, ids)
+    monkeypatch.setattr(delta, '_load_snapshots', load_snapshots)
+    contents = [version.content for version in TemplatesVersion.objects(id__in=[version.id for version in versions]).order_by('id')]
+    assert contents == [content_for(index) for index in range(6)]
+    assert queries == [{versions[0].id, versions[3].id}]
+
+PROJECTIONS = {
+    'only': lambda chain: [version.content for version in chain.only('content')],
+    'only_part': lambda chain: [{"edition": version.content["edition"]} for version in chain.only('content.edition')],
+    'exclude': lambda chain: [version.content for version in chain.exclude('delta', 'delta_base_id')],
+    'scalar': lambda chain: list(chain.scalar('content')),
+    'scalar_index': lambda chain: [chain.scalar('content')[index] for index in range(3)],
+    'values_list': lambda chain: [content for _, content in chain.values_list('version_num', 'content')],
+    'as_pymongo': lambda chain: [raw['content'] for raw in chain.as_pymongo()],
+}
+
+@pytest.mark.parametrize('name', PROJECTIONS)
+def test_projections_rebuild_payloads(setup_db, delta_storage, name):
+    versions = create_chain(setup_db, 3)
+    chain = TemplatesVersion.objects(id__in=[version.id for version in versions]).order_by('id')
+    expected = [content_for(index) for index in range(3)]
+    if name == 'only_part':
+        expected = [{"edition": index} for index in range(3)]
+    assert PROJECTIONS[name](chain) == expected
+
+def test_projected_raw_versions(setup_db, delta_storage, monkeypatch):
+    versions = create_chain(setup_db, 3)
+    chain = TemplatesVersion.objects(id__in=[version.id for version in versions]).order_by('id')
+    raws = list(chain.only('content').as_pymongo())
+    assert raws == [{'_id': version.id, 'content': content_for(index)} for index, version in enumerate(versions)]
+    assert chain.only('content').as_pymongo()[1] == raws[1]
+    queries = []
+    monkeypatch.setattr(delta, '_load_snapshots', lambda *args: queries.append(args))
+    assert [version.version_num for version in chain.only('version_num')] == ["1", "2", "3"]
+    assert queries == []
+
+def test_disabled_by_default(setup_db):
+    versions = create_chain(setup_db, 3)
+    raws = TemplatesVersion._get_collection().find({'_id': {'$in': [version.id for version in versions]}})
+    assert all('content' in raw and 'delta_base_id' not in raw for raw in raws)
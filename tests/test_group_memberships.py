@@ -0,0 +1,170 @@
+import subprocess
+import sys
+import pytest
+from bson import ObjectId
+
+from acb_orm.access.permissions import get_permissions, permission_index
+from acb_orm.auxiliaries.log import Log
+from acb_orm.auxiliaries.user_access import UserAccess
+from acb_orm.cache.shared import LocalCacheBackend, configure_shared_cache, disable_shared_cache, get_group
+from acb_orm.collections.group_memberships import GroupMembership
+from acb_orm.collections.groups import Group
+from acb_orm.enums.membership_mode import MembershipMode
+from acb_orm.operations import membership
+from acb_orm.operations.membership import (add_member, add_members, externalize_large_groups, externalize_members,
+                                           remove_members, set_member_role)
+from acb_orm.queries.memberships import groups_for_user, list_members, members_among, membership_mode
+from acb_orm.queries.projections import list_summaries
+
+@pytest.fixture
+def group(setup_db):
+    permission_index.clear()
+    group = Group(group_name="External Group", country="Colombia", log=Log(creator_user_id=setup_db['user_1']), users_access=[
+        UserAccess(user_id=setup_db[key], role_id=setup_db['role_editor']) for key in ('user_1', 'user_2', 'user_3')
+    ]).save()
+    yield group
+    GroupMembership.objects.delete()
+    Group.objects(group_name__startswith="External ").delete()
+    permission_index.clear()
+
+def all_members(group_id) -> list:
+    members, token = [], None
+    while True:
+        page = list_members(group_id, limit=2, token=token)
+        members.extend((access.user_id, access.role_id) for access in page.items)
+        token = page.next_token
+        if token is None:
+            return members
+
+def test_externalize(setup_db, group):
+    embedded = get_group(group.id)
+    assert externalize_members(group.id, batch_size=2) == 3
+    raw = Group._get_collection().find_one({'_id': group.id})
+    assert raw['membership_mode'] == "external" and 'users_access' not in raw
+    assert GroupMembership.objects(group_id=group.id).count() == 3
+    assert get_group(group.id) == embedded
+    assert externalize_members(group.id) == 3
+    assert Group.objects.get(id=group.id).membership_mode == MembershipMode.EXTERNAL
+
+def test_externalize_keeps_edits_after_switch(setup_db, group, monkeypatch):
+    collection_cls = type(Group._get_collection())
+    original = collection_cls.find_one_and_update
+    def find_one_and_update(self, *args, **kwargs):
+        before = original(self, *args, **kwargs)
+        if before is not None and self.name == 'groups':
+            add_member(group.id, setup_db['user_4'], setup_db['role_admin'])
+            remove_members(group.id, [setup_db['user_1']])
+        return before
+    monkeypatch.setattr(collection_cls, 'find_one_and_update', find_one_and_update)
+    assert externalize_members(group.id) == 3
+    assert members_among(group.id, [setup_db['user_1'], setup_db['user_4']]) == {setup_db['user_4']}
+
+def test_externalize_reconciles_edits_while_copying(setup_db, group, monkeypatch):
+    original = membership._insert_memberships
+    def insert_memberships(group_id, accesses):
+        inserted = original(group_id, accesses)
+        if membership_mode(group_id) == MembershipMode.EMBEDDED:
+            Group._get_collection().update_one({'_id': group.id}, {
+                '$pull': {'users_access': {'user_id': ObjectId(setup_db['user_2'])}}})
+            Group._get_collection().update_one({'_id': group.id}, {
+                '$push': {'users_access': {'user_id': ObjectId(setup_db['user_4']), 'role_id': ObjectId(setup_db['role_admin'])}}})
+        return inserted
+    monkeypatch.setattr(membership, '_insert_memberships', insert_memberships)
+    assert externalize_members(group.id) == 3
+    assert sorted(all_members(group.id)) == sorted([
+        (setup_db['user_1'], setup_db['role_editor']),
+        (setup_db['user_3'], setup_db['role_editor']),
+        (setup_db['user_4'], setup_db['role_admin']),
+    ])
+
+def test_list_members_in_both_modes(setup_db, group):
+    expected = [(setup_db[key], setup_db['role_editor']) for key in ('user_1', 'user_2', 'user_3')]
+    assert all_members(group.id) == expected
+    first_page = list_members(group.id, limit=2)
+    externalize_members(group.id)
+    assert all_members(group.id) == expected
+    with pytest.raises(ValueError):
+        list_members(group.id, token=first_page.next_token)
+    with pytest.raises(ValueError):
+        list_members(ObjectId())
+
+def test_operations_in_external_mode(setup_db, group):
+    externalize_members(group.id)
+    assert add_member(group.id, setup_db['user_4'], setup_db['role_admin'], updater_user_id=setup_db['user_1'])
+    assert not add_members(group.id, [(setup_db['user_4'], setup_db['role_admin']), (setup_db['user_1'], setup_db['role_editor'])])
+    assert str(Group.objects.get(id=group.id).log.updater_user_id.id) == setup_db['user_1']
+    assert set_member_role(group.id, setup_db['user_2'], setup_db['role_admin'])
+    assert not set_member_role(group.id, setup_db['user_2'], setup_db['role_admin'])
+    add_member(group.id, setup_db['user_3'], setup_db['role_admin'])
+    # user_3 now holds both roles; moving the editor entry to admin merges them.
+    assert set_member_role(group.id, setup_db['user_3'], setup_db['role_admin'])
+    assert remove_members(group.id, [setup_db['user_1']])
+    assert not remove_members(group.id, [setup_db['user_1']])
+    assert sorted(all_members(group.id)) == sorted([
+        (setup_db['user_2'], setup_db['role_admin']),
+        (setup_db['user_3'], setup_db['role_admin']),
+        (setup_db['user_4'], setup_db['role_admin']),
+    ])
+    assert members_among(group.id, [setup_db['user_1'], setup_db['user_4']]) == {setup_db['user_4']}
+
+def test_operations_racing_the_switch(setup_db, group, monkeypatch):
+    externalize_members(group.id)
+    original = membership._is_external
+    checks = []
+    def is_external(group_id):
+        # The first check of each operation still sees the embedded mode.
+        checks.append(group_id)
+        return len(checks) > 1 and original(group_id)
+    monkeypatch.setattr(membership, '_is_external', is_external)
+    assert add_member(group.id, setup_db['user_4'], setup_db['role_admin'])
+    checks.clear()
+    assert set_member_role(group.id, setup_db['user_2'], setup_db['role_admin'])
+    checks.clear()
+    assert remove_members(group.id, [setup_db['user_1']])
+    assert 'users_access' not in Group._get_collection().find_one({'_id': group.id})
+    assert sorted(all_members(group.id)) == sorted([
+        (setup_db['user_2'], setup_db['role_admin']),
+        (setup_db['user_3'], setup_db['role_editor']),
+        (setup_db['user_4'], setup_db['role_admin']),
+    ])
+
+def test_access_paths_see_external_members(setup_db, group):
+    configure_shared_cache(LocalCacheBackend())
+    try:
+        externalize_members(group.id)
+        assert [membership.group_id for membership in groups_for_user(setup_db['user_2'])] == [str(group.id)]
+        assert str(group.id) in get_permissions(setup_db['user_2']).group_ids
+        assert get_group(group.id).users_access[0].user_id == setup_db['user_1']
+        add_member(group.id, setup_db['user_4'], setup_db['role_editor'])
+        assert str(group.id) in get_permissions(setup_db['user_4']).group_ids
+        assert len(get_group(group.id).users_access) == 4
+        remove_members(group.id, [setup_db['user_2']])
+        assert str(group.id) not in get_permissions(setup_db['user_2']).group_ids
+    finally:
+        disable_shared_cache()
+
+def test_group_delete_cascades(setup_db, group):
+    externalize_members(group.id)
+    assert [membership.group_id for membership in groups_for_user(setup_db['user_2'])] == [str(group.id)]
+    group.delete()
+    assert GroupMembership.objects(group_id=group.id).count() == 0
+    assert groups_for_user(setup_db['user_2']) == []
+    assert str(group.id) not in get_permissions(setup_db['user_2']).group_ids
+
+def test_cascade_registered_with_group():
+    script = ("from acb_orm.collections.groups import Group; "
+              "print(sorted(cls.__name__ for cls, _ in Group._meta['delete_rules']))")
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "['GroupMembership']"
+
+def test_externalize_large_groups(setup_db, group):
+    Group(group_name="External Small", country="Peru", log=Log(creator_user_id=setup_db['user_1']),
+          users_access=[UserAccess(user_id=setup_db['user_1'], role_id=setup_db['role_editor'])]).save()
+    assert externalize_large_groups(min_members=3) == [str(group.id)]
+    assert Group.objects.get(group_name="External Small").membership_mode == MembershipMode.EMBEDDED
+    assert externalize_large_groups(min_members=3) == []
+
+def test_summaries_leave_out_members(setup_db, group):
+    summaries = [summary for summary in list_summaries(Group) if summary.id == str(group.id)]
+    assert summaries[0].group_name == "External Group"
+    assert not hasattr(summaries[0], 'users_access')
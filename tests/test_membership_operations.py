@@ -0,0 +1,70 @@
+import pytest
+from bson import ObjectId
+
+from acb_orm.access.permissions import get_permissions, permission_index
+from acb_orm.auxiliaries.log import Log
+from acb_orm.auxiliaries.user_access import UserAccess
+from acb_orm.cache.invalidation import register_invalidation_hook, unregister_invalidation_hook
+from acb_orm.collections.groups import Group
+from acb_orm.operations.membership import add_member, add_members, remove_member, remove_members, set_member_role
+
+@pytest.fixture
+def group(setup_db):
+    permission_index.clear()
+    group = Group(group_name="Operations Group", country="Colombia", log=Log(creator_user_id=setup_db['user_1']),
+                  users_access=[UserAccess(user_id=setup_db['user_1'], role_id=setup_db['role_admin'])]).save()
+    events = []
+    def hook(collection, document_id):
+        events.append((collection, document_id))
+    register_invalidation_hook(hook)
+    yield group, events
+    unregister_invalidation_hook(hook)
+    Group.objects(group_name="Operations Group").delete()
+    permission_index.clear()
+
+def members(group) -> list:
+    return [(str(access.user_id.id), str(access.role_id.id)) for access in Group.objects.get(id=group.id).users_access]
+
+def test_add_member(setup_db, group):
+    group, events = group
+    assert add_member(group.id, setup_db['user_2'], setup_db['role_editor'], updater_user_id=setup_db['user_1'])
+    assert not add_member(group.id, setup_db['user_2'], setup_db['role_editor'])
+    assert members(group) == [(setup_db['user_1'], setup_db['role_admin']), (setup_db['user_2'], setup_db['role_editor'])]
+    log = Group.objects.get(id=group.id).log
+    assert log.updated_at is not None and str(log.updater_user_id.id) == setup_db['user_1']
+    assert events == [('groups', str(group.id)), ('users', setup_db['user_2'])]
+
+def test_bulk_add_and_remove(setup_db, group):
+    group, events = group
+    new_members = [(setup_db[key], setup_db['role_editor']) for key in ('user_2', 'user_3', 'user_4')]
+    assert add_members(group.id, new_members + [(setup_db['user_1'], setup_db['role_admin'])])
+    assert len(members(group)) == 4
+    assert remove_members(group.id, [setup_db['user_2'], setup_db['user_4'], str(ObjectId())])
+    assert [user_id for user_id, _ in members(group)] == [setup_db['user_1'], setup_db['user_3']]
+    assert not remove_member(group.id, setup_db['user_2'])
+    assert not add_members(group.id, []) and not remove_members(group.id, [])
+    assert [collection for collection, _ in events] == ['groups'] + ['users'] * 4 + ['groups']
+
+def test_set_member_role(setup_db, group):
+    group, _ = group
+    updated_at = Group.objects.get(id=group.id).log.updated_at
+    assert not set_member_role(group.id, setup_db['user_2'], setup_db['role_editor'])
+    assert not set_member_role(group.id, setup_db['user_1'], setup_db['role_admin'])
+    assert Group.objects.get(id=group.id).log.updated_at == updated_at
+    assert set_member_role(group.id, setup_db['user_1'], setup_db['role_editor'])
+    assert members(group) == [(setup_db['user_1'], setup_db['role_editor'])]
+
+def test_set_member_role_to_held_role(setup_db, group):
+    group, _ = group
+    add_member(group.id, setup_db['user_1'], setup_db['role_editor'])
+    assert set_member_role(group.id, setup_db['user_1'], setup_db['role_editor'])
+    assert members(group) == [(setup_db['user_1'], setup_db['role_editor'])]
+    assert not set_member_role(group.id, setup_db['user_1'], setup_db['role_editor'])
+
+def test_permissions_follow_membership(setup_db, group):
+    group, _ = group
+    assert str(group.id) not in get_permissions(setup_db['user_3']).group_ids
+    add_member(group.id, setup_db['user_3'], setup_db['role_editor'])
+    assert str(group.id) in get_permissions(setup_db['user_3']).group_ids
+    remove_member(group.id, setup_db['user_3'])
+    assert str(group.id) not in get_permissions(setup_db['user_3']).group_ids
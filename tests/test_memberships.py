@@ -0,0 +1,54 @@
+import pytest
+from bson import ObjectId
+
+from acb_orm.access.permissions import get_permissions_many, permission_index
+from acb_orm.auxiliaries.log import Log
+from acb_orm.auxiliaries.user_access import UserAccess
+from acb_orm.collections.groups import Group
+from acb_orm.queries.memberships import Membership, groups_for_user, groups_for_users
+
+@pytest.fixture
+def groups(setup_db):
+    log = Log(creator_user_id=setup_db['user_1'])
+    north = Group(group_name="Membership North", country="Colombia", log=log, users_access=[
+        UserAccess(user_id=setup_db['user_2'], role_id=setup_db['role_editor']),
+        UserAccess(user_id=setup_db['user_3'], role_id=setup_db['role_admin']),
+    ]).save()
+    south = Group(group_name="Membership South", country="Peru", log=log, users_access=[
+        UserAccess(user_id=setup_db['user_2'], role_id=setup_db['role_admin']),
+        UserAccess(user_id=setup_db['user_2'], role_id=setup_db['role_editor']),
+    ]).save()
+    yield str(north.id), str(south.id)
+    Group.objects(group_name__startswith="Membership ").delete()
+    permission_index.clear()
+
+def test_groups_for_user(setup_db, groups):
+    north, south = groups
+    assert set(groups_for_user(setup_db['user_2'])) == {
+        Membership(north, setup_db['role_editor']),
+        Membership(south, setup_db['role_admin']),
+        Membership(south, setup_db['role_editor']),
+    }
+    assert groups_for_user(setup_db['user_3']) == [Membership(north, setup_db['role_admin'])]
+    assert groups_for_user(ObjectId()) == []
+
+def test_groups_for_users_is_one_query(setup_db, groups, monkeypatch):
+    calls = []
+    collection_cls = type(Group._get_collection())
+    original = collection_cls.aggregate
+    monkeypatch.setattr(collection_cls, 'aggregate', lambda self, pipeline, *args, **kwargs: calls.append(pipeline) or original(self, pipeline, *args, **kwargs))
+    memberships = groups_for_users([setup_db['user_2'], setup_db['user_3'], setup_db['user_4'], setup_db['user_3']])
+    assert len(calls) == 1
+    assert calls[0][0] == {'$match': {'users_access.user_id': {'$in': [ObjectId(setup_db[key]) for key in ('user_2', 'user_3', 'user_4')]}}}
+    assert [len(memberships[setup_db[key]]) for key in ('user_2', 'user_3', 'user_4')] == [3, 1, 0]
+    assert groups_for_users([]) == {}
+
+def test_user_id_is_indexed(db_connection):
+    keys = [index['key'] for index in Group._get_collection().index_information().values()]
+    assert [('users_access.user_id', 1)] in keys
+
+def test_batched_permissions(setup_db, groups):
+    compiled = get_permissions_many([setup_db['user_2'], setup_db['user_3']])
+    assert compiled[setup_db['user_2']].group_ids == set(groups)
+    assert compiled[setup_db['user_3']].group_ids == {groups[0]}
+    assert get_permissions_many([setup_db['user_3']])[setup_db['user_3']] is compiled[setup_db['user_3']]
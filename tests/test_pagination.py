@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from pydantic import BaseModel
+
+from acb_orm.auxiliaries.log import Log
+from acb_orm.collections.bulletins_version import BulletinsVersion
+from acb_orm.collections.visual_resources import VisualResources
+from acb_orm.queries.pagination import paginate, has_supporting_index, clear_index_cache, CREATED_AT_SORT
+from acb_orm.schemas.bulletins_version_schema import BulletinsVersionRead
+
+@pytest.fixture
+def versions(setup_db):
+    start = datetime(2024, 1, 1)
+    for index in range(7):
+        BulletinsVersion(
+            bulletin_master_id=setup_db['bulletin_master'],
+            version_num=str(index + 2),
+            log=Log(created_at=start + timedelta(days=index // 2), creator_user_id=setup_db['user_1']),
+            data={"index": index}
+        ).save()
+    return setup_db
+
+def test_paginate_by_id(versions):
+    page = paginate(BulletinsVersion, BulletinsVersionRead, limit=3)
+    seen = [item.id for item in page.items]
+    while page.next_token:
+        page = paginate(BulletinsVersion, BulletinsVersionRead, limit=3, token=page.next_token)
+        seen.extend(item.id for item in page.items)
+    assert seen == sorted(seen)
+    assert len(seen) == 8
+
+def test_paginate_by_created_at_desc(versions):
+    filters = {'bulletin_master_id': ObjectId(versions['bulletin_master']), 'version_num': {'$ne': '1.0'}}
+    pages = []
+    token = None
+    while True:
+        page = paginate(BulletinsVersion, BulletinsVersionRead, limit=2, token=token, sort=CREATED_AT_SORT,
+                        descending=True, filters=filters)
+        pages.append([item.data['index'] for item in page.items])
+        token = page.next_token
+        if not token:
+            break
+    indexes = [index for page in pages for index in page]
+    assert sorted(indexes) == list(range(7))
+    assert indexes[0] == 6
+    assert len(pages) == 4
+
+def test_supporting_index():
+    filters = {'bulletin_master_id': ObjectId()}
+    assert has_supporting_index(BulletinsVersion, CREATED_AT_SORT, filters)
+    assert not has_supporting_index(VisualResources, CREATED_AT_SORT)
+    with pytest.raises(ValueError):
+        paginate(VisualResources, BulletinsVersionRead, sort=CREATED_AT_SORT)
+
+def test_filtered_id_sort_needs_index():
+    assert has_supporting_index(VisualResources, ('_id',))
+    assert not has_supporting_index(VisualResources, ('_id',), {'file_name': "logo.png"})
+    assert has_supporting_index(BulletinsVersion, ('_id',), {'_id': {'$in': [ObjectId()]}})
+
+class VersionData(BaseModel):
+    id: str
+    data: dict
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_paginate_past_null_sort_values(versions, descending):
+    master_id = ObjectId()
+    collection = BulletinsVersion._get_collection()
+    for index in range(4):
+        log = {'creator_user_id': ObjectId(versions['user_1'])}
+        if index % 2:
+            log['created_at'] = datetime(2024, 1, index)
+        collection.insert_one({'bulletin_master_id': master_id, 'version_num': str(index), 'log': log, 'data': {'index': index}})
+    seen, token = [], None
+    while True:
+        page = paginate(BulletinsVersion, VersionData, limit=1, token=token, sort=CREATED_AT_SORT,
+                        descending=descending, filters={'bulletin_master_id': master_id}, require_index=False)
+        seen.extend(item.data['index'] for item in page.items)
+        token = page.next_token
+        if not token:
+            break
+    assert seen == ([3, 1, 2, 0] if descending else [0, 2, 1, 3])
+
+def test_supporting_index_is_cached(monkeypatch):
+    clear_index_cache()
+    calls = []
+    original = BulletinsVersion._get_collection
+    def get_collection():
+        calls.append(1)
+        return original()
+    monkeypatch.setattr(BulletinsVersion, '_get_collection', get_collection)
+    for _ in range(3):
+        assert has_supporting_index(BulletinsVersion, CREATED_AT_SORT, {'bulletin_master_id': ObjectId()})
+    assert len(calls) == 1
+
+def test_token_must_match_sort(versions):
+    page = paginate(BulletinsVersion, BulletinsVersionRead, limit=1)
+    with pytest.raises(ValueError):
+        paginate(BulletinsVersion, BulletinsVersionRead, token=page.next_token, sort=CREATED_AT_SORT,
+                 filters={'bulletin_master_id': ObjectId(versions['bulletin_master'])})
@@ -0,0 +1,97 @@
+import pytest
+from bson import ObjectId
+
+from acb_orm.access.permissions import EffectivePermissions, can, compile_permissions, get_permissions, permission_index
+from acb_orm.auxiliaries.access_config import AccessConfig
+from acb_orm.auxiliaries.log import Log
+from acb_orm.auxiliaries.user_access import UserAccess
+from acb_orm.collections.groups import Group
+from acb_orm.collections.roles import Role
+from acb_orm.collections.users import User
+from acb_orm.enums.access_type import AccessType
+from acb_orm.schemas.roles_schema import RolePermissionSchema
+
+def crud(flags: str) -> dict:
+    return {operation: operation in flags for operation in 'crud'}
+
+@pytest.fixture
+def access(setup_db):
+    permission_index.clear()
+    log = Log(creator_user_id=setup_db['user_1'])
+    user = User(ext_id="Permissions User", log=log).save()
+    editor = Role(role_name="Perm Editor", permissions={"cards": crud("cru"), "bulletins": crud("r")}, log=log).save()
+    reviewer = Role(role_name="Perm Reviewer", permissions={"bulletins": crud("ru")}, log=log).save()
+    colombia = Group(group_name="Perm Colombia", country="Colombia", log=log,
+                     users_access=[UserAccess(user_id=user.id, role_id=editor.id)]).save()
+    peru = Group(group_name="Perm Peru", country="Peru", log=log,
+                 users_access=[UserAccess(user_id=user.id, role_id=reviewer.id)]).save()
+    yield {'user': user, 'editor': editor, 'reviewer': reviewer, 'colombia': colombia, 'peru': peru}
+    User.objects(ext_id="Permissions User").delete()
+    Role.objects(role_name__startswith="Perm ").delete()
+    Group.objects(group_name__startswith="Perm ").delete()
+    permission_index.clear()
+
+def test_compiled_masks(access):
+    permissions = compile_permissions(access['user'].id)
+    assert permissions.group_ids == {str(access['colombia'].id), str(access['peru'].id)}
+    assert permissions.masks == {"cards": 0b0111, "bulletins": 0b0110}
+    assert permissions.can('u', "bulletins") and permissions.can('c', "cards")
+    assert not permissions.can('d', "cards") and not permissions.can('r', "users")
+    with pytest.raises(ValueError):
+        permissions.can('x', "cards")
+
+def test_document_access(access):
+    user_id = access['user'].id
+    peru_only = AccessConfig(access_type=AccessType.RESTRICTED, allowed_groups=[access['peru'].id])
+    assert can(user_id, 'u', "bulletins", peru_only)
+    assert not can(user_id, 'r', "cards", peru_only)
+    assert can(user_id, 'r', "cards", {'access_type': "restricted", 'allowed_groups': [access['colombia'].id]})
+    assert can(user_id, 'r', "cards", AccessConfig(access_type=AccessType.PUBLIC))
+    assert not can(user_id, 'r', "bulletins", {'access_type': "restricted", 'allowed_groups': [ObjectId()]})
+
+def test_unknown_and_inactive_users(access):
+    assert get_permissions(ObjectId()).masks == {}
+    User.objects(id=access['user'].id).update(set__is_active=False)
+    assert not can(access['user'].id, 'r', "cards")
+
+def test_cached_and_invalidated_on_role_save(access):
+    user_id = access['user'].id
+    first = get_permissions(user_id)
+    assert get_permissions(str(user_id)) is first
+    access['editor'].permissions["cards"] = crud("crud")
+    access['editor'].save()
+    assert can(user_id, 'd', "cards")
+    assert get_permissions(user_id) is not first
+
+def test_invalidated_on_group_membership(access):
+    user_id = access['user'].id
+    assert not can(user_id, 'd', "cards")
+    admin = Role(role_name="Perm Admin", permissions={"cards": RolePermissionSchema(d=True).model_dump()},
+                 log=access['editor'].log).save()
+    Group(group_name="Perm Admins", country="Chile", log=access['editor'].log,
+          users_access=[UserAccess(user_id=user_id, role_id=admin.id)]).save()
+    assert can(user_id, 'd', "cards")
+    Group.objects(group_name="Perm Admins").delete()
+    assert not can(user_id, 'd', "cards")
+
+def test_group_invalidation_does_not_query(access, setup_db, monkeypatch):
+    member = get_permissions(access['user'].id)
+    other = get_permissions(setup_db['user_2'])
+    collection_cls = type(Group._get_collection())
+    monkeypatch.setattr(collection_cls, 'aggregate', lambda *args, **kwargs: pytest.fail("queried"))
+    monkeypatch.setattr(collection_cls, 'find', lambda *args, **kwargs: pytest.fail("queried"))
+    permission_index.invalidate('groups', str(access['colombia'].id))
+    assert get_permissions(setup_db['user_2']) is other
+    monkeypatch.undo()
+    assert get_permissions(access['user'].id) is not member
+
+def test_other_users_stay_cached(access, setup_db):
+    other = get_permissions(setup_db['user_2'])
+    access['reviewer'].description = "Changed"
+    access['reviewer'].save()
+    assert get_permissions(setup_db['user_2']) is other
+
+def test_empty_permissions():
+    permissions = EffectivePermissions("id", True, {})
+    assert not permissions.can('r', "cards")
+    assert not permissions.can_access('r', "cards", None)
@@ -0,0 +1,37 @@
+from bson import ObjectId
+
+from acb_orm.auxiliaries.access_config import AccessConfig
+from acb_orm.auxiliaries.log import Log
+from acb_orm.collections.cards import Cards
+from acb_orm.collections.templates_master import TemplatesMaster
+from acb_orm.queries.projections import list_summaries, projection_for, projection_fields
+from acb_orm.schemas.cards_schema import CardsSummaryRead
+from acb_orm.schemas.templates_master_schema import TemplatesMasterSummaryRead
+
+def test_projection_for_summary():
+    assert projection_for(Cards, CardsSummaryRead) == {
+        'card_name': 1, 'card_type': 1, 'access_config': 1, 'log': 1, '_id': 1
+    }
+    assert 'content' not in projection_fields(Cards, CardsSummaryRead)
+
+def test_list_card_summaries(setup_db):
+    for index in range(3):
+        Cards(
+            card_name=f"Summary Card {index}",
+            card_type="info",
+            templates_master_ids=[ObjectId(setup_db['template_master'])],
+            access_config=AccessConfig(access_type='public'),
+            content={"body": "x" * 1000},
+            log=Log(creator_user_id=setup_db['user_1'])
+        ).save()
+    summaries = list_summaries(Cards, order_by=['-card_name'], limit=2, card_type="info")
+    assert [summary.card_name for summary in summaries] == ["Summary Card 2", "Summary Card 1"]
+    assert all(isinstance(summary, CardsSummaryRead) for summary in summaries)
+    assert not hasattr(summaries[0], 'content')
+    Cards.objects.delete()
+
+def test_list_template_summaries(setup_db):
+    TemplatesMaster.objects(id=setup_db['template_master']).update(set__access_config=AccessConfig(access_type='public'))
+    summaries = list_summaries(TemplatesMaster)
+    assert isinstance(summaries[0], TemplatesMasterSummaryRead)
+    assert summaries[0].id == setup_db['template_master']
@@ -0,0 +1,57 @@
+from bson import ObjectId
+from acb_orm.cache.version_cache import version_cache
+from acb_orm.collections.bulletins_master import BulletinsMaster
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.database import read_routing
+from acb_orm.database.read_routing import route_read, read_collection, secondary_reads, DEFAULT_MAX_STALENESS_SECONDS
+from acb_orm.queries.current_version import get_bulletin_views
+from acb_orm.queries.pagination import paginate
+from acb_orm.queries.version_history import get_bulletin_history
+from acb_orm.schemas.bulletins_master_schema import BulletinsMasterSummaryRead
+
+def test_route_read_defaults_to_primary(setup_db):
+    queryset = route_read(BulletinsMaster.objects)
+    assert queryset._read_preference is None
+
+def test_route_read_marked_query(setup_db):
+    queryset = route_read(BulletinsMaster.objects, secondary=True)
+    assert queryset._read_preference.mongos_mode == 'secondaryPreferred'
+    assert queryset._read_preference.max_staleness == DEFAULT_MAX_STALENESS_SECONDS
+    assert queryset.count() == 1
+
+def test_secondary_reads_block(setup_db):
+    with secondary_reads(max_staleness_seconds=120):
+        queryset = route_read(BulletinsMaster.objects)
+        collection = read_collection(BulletinsMaster)
+        explicit = route_read(BulletinsMaster.objects, secondary=False)
+    assert queryset._read_preference.max_staleness == 120
+    assert collection.read_preference.max_staleness == 120
+    assert explicit._read_preference is None
+    assert collection.find_one({'_id': BulletinsMaster.objects.first().id}) is not None
+
+def test_helpers_use_causal_session(setup_db, monkeypatch):
+    TemplatesVersion.objects(id=setup_db['template_version']).update(set__template_master_id=ObjectId(setup_db['template_master']))
+    version_cache.clear()
+    session = object()
+    used = []
+    collection_cls = type(BulletinsMaster._get_collection())
+    original_find = collection_cls.find
+    original_aggregate = collection_cls.aggregate
+    def find(self, *args, session=None, **kwargs):
+        used.append(session)
+        return original_find(self, *args, **kwargs)
+    def aggregate(self, pipeline, session=None, **kwargs):
+        used.append(session)
+        return original_aggregate(self, pipeline, **kwargs)
+    monkeypatch.setattr(collection_cls, 'find', find)
+    monkeypatch.setattr(collection_cls, 'aggregate', aggregate)
+    token = read_routing._causal_session.set(session)
+    try:
+        paginate(BulletinsMaster, BulletinsMasterSummaryRead, limit=1)
+        get_bulletin_views([setup_db['bulletin_master']])
+        get_bulletin_history(setup_db['bulletin_master'])
+    finally:
+        read_routing._causal_session.reset(token)
+    # paginate, the views aggregation, its template version miss and the
+    # two history queries.
+    assert sum(value is session for value in used) == 5
@@ -0,0 +1,68 @@
+import pytest
+from bson import ObjectId
+
+from acb_orm.collections.users import User
+from acb_orm.validations import reference_cache
+from acb_orm.validations.reference_cache import validation_scope, configure_shared_reference_cache, disable_shared_reference_cache
+from acb_orm.validations.valid_reference_id import validate_reference_id, validate_reference_ids
+
+@pytest.fixture
+def shared_cache():
+    cache = configure_shared_reference_cache(collections=('users',), maxsize=2, ttl=30)
+    yield cache
+    disable_shared_reference_cache()
+
+def test_scope_memoizes_positive_checks(setup_db):
+    user_id = str(ObjectId())
+    User(id=user_id, ext_id='Scoped User').save()
+    with validation_scope():
+        validate_reference_id(user_id, User)
+        User.objects(id=user_id).delete()
+        assert validate_reference_id(user_id, User) == user_id
+    with pytest.raises(ValueError):
+        validate_reference_id(user_id, User)
+
+def test_scope_memoizes_negative_checks(setup_db):
+    user_id = str(ObjectId())
+    with validation_scope():
+        with pytest.raises(ValueError):
+            validate_reference_ids([user_id], User)
+        User(id=user_id, ext_id='Late User').save()
+        with pytest.raises(ValueError):
+            validate_reference_id(user_id, User)
+    assert validate_reference_id(user_id, User) == user_id
+
+def test_shared_cache_keeps_positive_checks(setup_db, shared_cache):
+    user_id = str(ObjectId())
+    User(id=user_id, ext_id='Shared User').save()
+    validate_reference_id(user_id, User)
+    # Deleted behind the ORM's back: the cached check still passes.
+    User._get_collection().delete_one({'_id': ObjectId(user_id)})
+    assert validate_reference_id(user_id, User) == user_id
+    shared_cache.invalidate('users', user_id)
+    with pytest.raises(ValueError):
+        validate_reference_id(user_id, User)
+
+def test_shared_cache_evicts_orm_deletes(setup_db, shared_cache):
+    user = User(ext_id='Deleted User').save()
+    validate_reference_id(str(user.id), User)
+    assert shared_cache.get('users', str(user.id)) is True
+    user.delete()
+    with pytest.raises(ValueError):
+        validate_reference_id(str(user.id), User)
+
+def test_shared_cache_expires_entries(setup_db, shared_cache, monkeypatch):
+    validate_reference_id(setup_db['user_1'], User)
+    assert shared_cache.get('users', setup_db['user_1']) is True
+    now = reference_cache.time.monotonic()
+    monkeypatch.setattr(reference_cache.time, 'monotonic', lambda: now + 60)
+    assert shared_cache.get('users', setup_db['user_1']) is None
+
+def test_shared_cache_evicts_least_recently_used(shared_cache):
+    shared_cache.set('users', 'a', True)
+    shared_cache.set('users', 'b', True)
+    shared_cache.get('users', 'a')
+    shared_cache.set('users', 'c', True)
+    assert shared_cache.get('users', 'b') is None
+    assert shared_cache.get('users', 'a') is True
+    assert shared_cache.get('groups', 'a') is None
@@ -0,0 +1,146 @@
+import os
+import pytest
+from bson import ObjectId
+
+from acb_orm.auxiliaries.log import Log
+from acb_orm.auxiliaries.user_access import UserAccess
+from acb_orm.cache import shared
+from acb_orm.cache.invalidation import register_invalidation_hook, unregister_invalidation_hook
+from acb_orm.cache.shared import (FileCacheBackend, LocalCacheBackend, configure_shared_cache, disable_shared_cache,
+                                  get_group, get_role, get_roles, get_user)
+from acb_orm.collections.groups import Group
+from acb_orm.collections.roles import Role
+from acb_orm.collections.users import User
+
+@pytest.fixture
+def shared_cache(setup_db):
+    cache = configure_shared_cache(LocalCacheBackend(), ttl=60)
+    yield cache
+    disable_shared_cache()
+
+@pytest.fixture
+def role_and_group(setup_db):
+    role = Role(role_name="Cached Role", permissions={"cards": {"c": False, "r": True, "u": False, "d": False}},
+                log=Log(creator_user_id=setup_db['user_1'])).save()
+    group = Group(group_name="Cached Group", country="Colombia", log=Log(creator_user_id=setup_db['user_1']),
+                  users_access=[UserAccess(user_id=setup_db['user_1'], role_id=str(role.id))]).save()
+    yield role, group
+    Role.objects(role_name="Cached Role").delete()
+    Group.objects(group_name="Cached Group").delete()
+
+@pytest.fixture
+def events():
+    received = []
+    def hook(collection, document_id):
+        received.append((collection, document_id))
+    register_invalidation_hook(hook)
+    yield received
+    unregister_invalidation_hook(hook)
+
+def count_finds(monkeypatch, document_cls):
+    calls = []
+    collection_cls = type(document_cls._get_collection())
+    original = collection_cls.find
+    monkeypatch.setattr(collection_cls, 'find', lambda self, *args, **kwargs: calls.append(args) or original(self, *args, **kwargs))
+    return calls
+
+def test_lookups_are_cached(setup_db, shared_cache, role_and_group, monkeypatch):
+    role, group = role_and_group
+    calls = count_finds(monkeypatch, Role)
+    assert get_role(role.id).role_name == "Cached Role"
+    assert get_role(str(role.id)).permissions["cards"].r is True
+    assert len(calls) == 1
+    assert [read.group_name for read in [get_group(group.id), get_group(group.id)]] == ["Cached Group"] * 2
+    assert len(calls) == 2
+    assert get_user(setup_db['user_1']).ext_id
+    assert get_group(str(ObjectId())) is None
+
+def test_get_roles_batches_misses(setup_db, shared_cache, role_and_group, monkeypatch):
+    role, _ = role_and_group
+    other = Role(role_name="Other Cached Role", permissions={}, log=Log(creator_user_id=setup_db['user_1'])).save()
+    try:
+        get_role(role.id)
+        calls = count_finds(monkeypatch, Role)
+        assert {read.id for read in get_roles([role.id, other.id, str(ObjectId())])} == {str(role.id), str(other.id)}
+        assert len(calls) == 1 and len(calls[0][0]['_id']['$in']) == 2
+    finally:
+        other.delete()
+
+def test_invalidated_on_save_update_and_delete(setup_db, shared_cache, role_and_group):
+    role, group = role_and_group
+    get_role(role.id)
+    role.description = "Changed"
+    role.save()
+    assert get_role(role.id).description == "Changed"
+    Role.objects(id=role.id).update(set__description="Updated")
+    assert get_role(role.id).description == "Updated"
+    get_group(group.id)
+    group.users_access.append(UserAccess(user_id=setup_db['user_4'], role_id=str(role.id)))
+    group.save()
+    assert setup_db['user_4'] in [access.user_id for access in get_group(group.id).users_access]
+    Role.objects(id=role.id).delete()
+    assert get_role(role.id) is None
+
+def test_hooks_fire_on_orm_writes(setup_db, events):
+    user = User(ext_id="Hook User").save()
+    User.objects(ext_id="Hook User").update(set__is_active=False)
+    user.delete()
+    assert events == [('users', str(user.id)), ('users', None), ('users', str(user.id))]
+
+def test_ttl_expiry(setup_db, monkeypatch):
+    backend = LocalCacheBackend()
+    backend.set("users:1", b"value", ttl=10)
+    now = shared.time.time()
+    assert backend.get("users:1") == b"value"
+    monkeypatch.setattr(shared.time, 'time', lambda: now + 11)
+    assert backend.get("users:1") is None
+
+def test_file_backend_is_shared(tmp_path):
+    writer = FileCacheBackend(str(tmp_path))
+    reader = FileCacheBackend(str(tmp_path))
+    writer.set("roles:1", b"admin", ttl=60)
+    writer.set("roles:2", b"editor", ttl=60)
+    writer.set("users:1", b"user", ttl=60)
+    assert reader.get("roles:1") == b"admin"
+    if hasattr(os, 'fork'):
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if FileCacheBackend(str(tmp_path)).get("roles:2") == b"editor" else 1)
+        assert os.WEXITSTATUS(os.waitpid(pid, 0)[1]) == 0
+    reader.delete_prefix("roles:")
+    assert writer.get("roles:2") is None and writer.get("users:1") == b"user"
+    writer.set("users:2", b"expired", ttl=-1)
+    assert reader.get("users:2") is None
+
+def test_file_backend_cache(setup_db, tmp_path):
+    configure_shared_cache(FileCacheBackend(str(tmp_path)), ttls={'users': 10})
+    try:
+        assert get_user(setup_db['user_2']).id == setup_db['user_2']
+        assert len(os.listdir(tmp_path)) == 1
+        User.objects(id=setup_db['user_2']).update(set__is_active=False)
+        assert os.listdir(tmp_path) == []
+        assert get_user(setup_db['user_2']).is_active is False
+    finally:
+        disable_shared_cache()
+
+def test_invalidation_during_load_is_not_overwritten(setup_db, shared_cache, role_and_group, monkeypatch):
+    role, _ = role_and_group
+    collection_cls = type(Role._get_collection())
+    original = collection_cls.find
+    def find(self, *args, **kwargs):
+        cursor = list(original(self, *args, **kwargs))
+        shared_cache.invalidate('roles', str(role.id))
+        return cursor
+    monkeypatch.setattr(collection_cls, 'find', find)
+    assert get_role(role.id).role_name == "Cached Role"
+    assert shared_cache.backend.get(shared_cache.key('roles', str(role.id))) is None
+    monkeypatch.setattr(collection_cls, 'find', original)
+    get_role(role.id)
+    assert shared_cache.backend.get(shared_cache.key('roles', str(role.id))) is not None
+
+def test_file_backend_clear_keeps_pending_writes(tmp_path):
+    backend = FileCacheBackend(str(tmp_path))
+    backend.set("roles:1", b"admin", ttl=60)
+    (tmp_path / ".tmp-pending").write_bytes(b"partial")
+    backend.clear()
+    assert os.listdir(tmp_path) == [".tmp-pending"]
@@ -0,0 +1,109 @@
+import pytest
+from bson import ObjectId
+from pydantic import ValidationError
+
+from acb_orm.collections.templates_master import TemplatesMaster
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.collections.users import User
+from acb_orm.schemas.bulletins_version_schema import BulletinsVersionCreate
+from acb_orm.schemas.cards_schema import CardsCreate
+from acb_orm.validations.valid_reference_id import reference_exists, find_missing_ids, validate_reference_ids, validate_references, verify_references
+
+def test_find_missing_ids(setup_db):
+    missing_id = str(ObjectId())
+    missing = find_missing_ids([setup_db['user_1'], missing_id, setup_db['user_2'], missing_id], User)
+    assert missing == [missing_id]
+
+def test_validate_reference_ids_valid(setup_db):
+    ids = [setup_db['user_1'], setup_db['user_2'], setup_db['user_3']]
+    assert validate_reference_ids(ids, User) == ids
+
+def test_validate_reference_ids_reports_all_missing(setup_db):
+    missing_1 = str(ObjectId())
+    missing_2 = str(ObjectId())
+    with pytest.raises(ValueError) as exc:
+        validate_reference_ids([setup_db['user_1'], missing_1, missing_2], User)
+    assert missing_1 in str(exc.value)
+    assert missing_2 in str(exc.value)
+
+def test_validate_reference_ids_invalid_format(setup_db):
+    with pytest.raises(ValueError, match="Invalid ObjectId format"):
+        validate_reference_ids([setup_db['user_1'], "not-an-id"], User)
+
+def test_validate_references_by_collection(setup_db):
+    references = {
+        User: [setup_db['user_1'], setup_db['user_2']],
+        TemplatesMaster: [setup_db['template_master']]
+    }
+    assert validate_references(references) == references
+
+def test_cards_schema_reports_missing_templates(setup_db):
+    missing_id = str(ObjectId())
+    data = {
+        "card_name": "Card Missing",
+        "card_type": "info",
+        "templates_master_ids": [setup_db['template_master'], missing_id],
+        "access_config": {"access_type": "public", "allowed_groups": []},
+        "content": {}
+    }
+    with pytest.raises(ValidationError, match=missing_id):
+        CardsCreate(**data)
+
+def test_reference_exists(setup_db):
+    assert reference_exists(setup_db['template_version'], TemplatesVersion)
+    assert not reference_exists(str(ObjectId()), TemplatesVersion)
+
+def test_schema_without_reference_checks():
+    missing_id = str(ObjectId())
+    data = {
+        "card_name": "Deferred Card",
+        "card_type": "info",
+        "templates_master_ids": [missing_id],
+        "access_config": {"access_type": "public", "allowed_groups": []},
+        "content": {},
+        "log": {"creator_user_id": missing_id}
+    }
+    schema = CardsCreate.model_validate(data, context={'check_refs': False})
+    assert schema.templates_master_ids == [missing_id]
+    with pytest.raises(ValidationError, match="Invalid ObjectId format"):
+        CardsCreate.model_validate({**data, "templates_master_ids": ["bad-id"]}, context={'check_refs': False})
+
+def test_verify_references(setup_db):
+    missing_id = str(ObjectId())
+    valid = BulletinsVersionCreate.model_validate({
+        "version_num": "1",
+        "data": {},
+        "bulletin_master_id": setup_db['bulletin_master'],
+        "log": {"creator_user_id": setup_db['user_1']}
+    }, context={'check_refs': False})
+    invalid = BulletinsVersionCreate.model_validate({
+        "version_num": "2",
+        "data": {},
+        "bulletin_master_id": setup_db['bulletin_master'],
+        "previous_version_id": missing_id,
+        "log": {"creator_user_id": missing_id}
+    }, context={'check_refs': False})
+    verify_references(valid)
+    with pytest.raises(ValidationError) as exc:
+        verify_references(valid, invalid)
+    errors = exc.value.errors()
+    assert [error['loc'] for error in errors] == [(1, 'previous_version_id'), (1, 'log', 'creator_user_id')]
+    assert errors[0]['msg'] == f"Value error, Referenced document with ID '{missing_id}' does not exist."
+
+def test_verify_references_uses_recorded_checks(setup_db, monkeypatch):
+    missing_id = str(ObjectId())
+    schema = CardsCreate.model_validate({
+        "card_name": "Recorded Card",
+        "card_type": "info",
+        "templates_master_ids": [setup_db['template_master'], missing_id],
+        "access_config": {"access_type": "restricted", "allowed_groups": [missing_id]},
+        "content": {},
+        "log": {"creator_user_id": setup_db['user_1']}
+    }, context={'check_refs': False})
+    assert len(schema.access_config._reference_checks) == 1
+    def fail(*args, **kwargs):
+        raise AssertionError("validated again")
+    monkeypatch.setattr(CardsCreate, 'model_validate', fail)
+    with pytest.raises(ValidationError) as exc:
+        verify_references(schema)
+    assert [error['loc'] for error in exc.value.errors()] == [('templates_master_ids',), ('access_config', 'allowed_groups')]
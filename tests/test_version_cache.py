@@ -0,0 +1,102 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from bson import ObjectId
+
+from acb_orm.aio.repositories import TemplatesVersionRepository
+from acb_orm.auxiliaries.log import Log
+from acb_orm.cache.version_cache import VersionCache, version_cache
+from acb_orm.collections.bulletins_version import BulletinsVersion
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.validations.valid_reference_id import find_missing_ids, validate_reference_id
+
+@pytest.fixture
+def cache(setup_db):
+    version_cache.clear()
+    version_cache.reset_stats()
+    yield version_cache
+    version_cache.resize(VersionCache().max_bytes)
+    version_cache.clear()
+
+def test_get_by_id_is_cached(setup_db, cache):
+    version_id = setup_db['template_version']
+    first = TemplatesVersion.objects.get(id=version_id)
+    second = TemplatesVersion.objects.get(id=version_id)
+    assert first.content == second.content == {"key": "value"}
+    assert first is not second
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert TemplatesVersion.objects.with_id(version_id).id == first.id
+    assert cache.stats().hit_ratio == pytest.approx(2 / 3)
+
+def test_hits_are_copies(setup_db, cache):
+    version = TemplatesVersion.objects.get(id=setup_db['template_version'])
+    version.content["key"] = "changed"
+    assert TemplatesVersion.objects.get(id=setup_db['template_version']).content == {"key": "value"}
+
+def test_filtered_queries_bypass_cache(setup_db, cache):
+    TemplatesVersion.objects.get(id=setup_db['template_version'])
+    assert TemplatesVersion.objects.only('id').get(id=setup_db['template_version']).id
+    assert cache.stats().hits == 0
+    with pytest.raises(TemplatesVersion.DoesNotExist):
+        TemplatesVersion.objects.get(id=ObjectId())
+
+def test_invalidated_on_save_and_update(setup_db, cache):
+    version = TemplatesVersion.objects.get(id=setup_db['template_version'])
+    version.commit_message = "Edited"
+    version.save()
+    assert cache.stats().entries == 0
+    assert TemplatesVersion.objects.get(id=version.id).commit_message == "Edited"
+    TemplatesVersion.objects(id=version.id).update(set__commit_message="Updated")
+    assert TemplatesVersion.objects.get(id=version.id).commit_message == "Updated"
+
+def test_size_eviction(setup_db, cache):
+    ids = [BulletinsVersion(
+        bulletin_master_id=setup_db['bulletin_master'],
+        version_num=str(index),
+        log=Log(creator_user_id=setup_db['user_1']),
+        data={"text": "x" * 1000}
+    ).save().id for index in range(5)]
+    cache.resize(3500)
+    for version_id in ids:
+        BulletinsVersion.objects.get(id=version_id)
+    stats = cache.stats()
+    assert stats.entries == 3 and stats.evictions == 2
+    assert stats.size_bytes <= 3500
+    cache.resize(0)
+    assert cache.stats().entries == 0
+    BulletinsVersion.objects.get(id=ids[0])
+    assert cache.stats().entries == 0
+
+def test_reference_checks_use_cache(setup_db, cache):
+    version_id = setup_db['bulletin_version']
+    BulletinsVersion.objects.get(id=version_id)
+    # Remove it behind the ORM's back: the cached version still counts.
+    BulletinsVersion._get_collection().delete_one({'_id': ObjectId(version_id)})
+    assert validate_reference_id(version_id, BulletinsVersion) == version_id
+    assert find_missing_ids([version_id], BulletinsVersion) == []
+
+def test_async_get_uses_cache(setup_db, cache, async_db):
+    repository = TemplatesVersionRepository(async_db)
+    TemplatesVersion.objects(id=setup_db['template_version']).update(set__template_master_id=ObjectId(setup_db['template_master']))
+    asyncio.run(repository.get(setup_db['template_version']))
+    schema = asyncio.run(repository.get(setup_db['template_version']))
+    assert schema.content == {"key": "value"}
+    assert cache.stats().hits == 1
+
+def test_concurrent_gets(setup_db, cache):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        versions = list(executor.map(lambda _: TemplatesVersion.objects.get(id=setup_db['template_version']), range(100)))
+    assert {version.content["key"] for version in versions} == {"value"}
+    assert cache.stats().hits + cache.stats().misses == 100
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires fork")
+def test_forked_child_starts_empty(setup_db, cache):
+    TemplatesVersion.objects.get(id=setup_db['template_version'])
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if version_cache.stats().entries == 0 else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert cache.stats().entries == 1
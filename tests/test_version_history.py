@@ -0,0 +1,54 @@
+import pytest
+from bson import ObjectId
+
+from acb_orm.auxiliaries.log import Log
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.queries.version_history import get_bulletin_history, get_template_history, VersionChainError
+from acb_orm.collections.bulletins_version import BulletinsVersion
+
+def create_template_chain(setup_db, length):
+    previous = None
+    ids = []
+    for index in range(length):
+        version = TemplatesVersion(
+            template_master_id=setup_db['template_master'],
+            previous_version_id=previous,
+            version_num=str(index + 1),
+            commit_message=f"Version {index + 1}",
+            content={"index": index},
+            log=Log(creator_user_id=setup_db['user_1'])
+        ).save()
+        previous = version.id
+        ids.append(str(version.id))
+    return ids
+
+def test_template_history_in_order(setup_db):
+    ids = create_template_chain(setup_db, 5)
+    history = get_template_history(setup_db['template_master'])
+    assert [version.id for version in history] == ids[::-1]
+    assert history[-1].previous_version_id is None
+
+def test_template_history_last_versions(setup_db):
+    ids = create_template_chain(setup_db, 5)
+    history = get_template_history(setup_db['template_master'], limit=2)
+    assert [version.version_num for version in history] == ["5", "4"]
+    history = get_template_history(setup_db['template_master'], head_version_id=ids[2])
+    assert [version.version_num for version in history] == ["3", "2", "1"]
+
+def test_bulletin_history_single_version(setup_db):
+    history = get_bulletin_history(setup_db['bulletin_master'])
+    assert [version.id for version in history] == [setup_db['bulletin_version']]
+    assert get_bulletin_history(str(ObjectId())) == []
+
+def test_history_detects_cycle(setup_db):
+    ids = create_template_chain(setup_db, 3)
+    TemplatesVersion.objects(id=ids[0]).update(set__previous_version_id=ObjectId(ids[2]))
+    with pytest.raises(VersionChainError):
+        get_template_history(setup_db['template_master'])
+    with pytest.raises(VersionChainError, match="Cycle"):
+        get_template_history(setup_db['template_master'], head_version_id=ids[2])
+
+def test_history_detects_broken_link(setup_db):
+    BulletinsVersion.objects(id=setup_db['bulletin_version']).update(set__previous_version_id=ObjectId())
+    with pytest.raises(VersionChainError, match="Broken link"):
+        get_bulletin_history(setup_db['bulletin_master'])
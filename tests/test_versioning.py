@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from bson import ObjectId
+
+from acb_orm.auxiliaries.log import Log
+from acb_orm.collections.bulletins_version import BulletinsVersion
+from acb_orm.collections.templates_version import TemplatesVersion
+from acb_orm.collections.version_counters import VersionCounter
+from acb_orm.operations.versioning import allocate_version_num, assign_version_num, get_latest_version, get_version
+
+def new_bulletin_version(setup_db):
+    return BulletinsVersion(
+        bulletin_master_id=setup_db['bulletin_master'],
+        log=Log(creator_user_id=setup_db['user_1']),
+        data={"campo": "valor"}
+    )
+
+def test_allocation_continues_legacy_numbers(setup_db):
+    # The fixture version uses the legacy version_num "1.0".
+    versions = [assign_version_num(new_bulletin_version(setup_db)).save() for _ in range(10)]
+    assert [version.version_num_int for version in versions] == list(range(2, 12))
+    assert versions[-1].version_num == "11"
+    VersionCounter.objects.delete()
+
+def test_latest_and_numbered_version(setup_db):
+    for _ in range(10):
+        assign_version_num(new_bulletin_version(setup_db)).save()
+    latest = get_latest_version(BulletinsVersion, setup_db['bulletin_master'])
+    assert latest.version_num_int == 11
+    assert get_version(BulletinsVersion, setup_db['bulletin_master'], 9).version_num == "9"
+    assert get_version(BulletinsVersion, setup_db['bulletin_master'], 99) is None
+    VersionCounter.objects.delete()
+
+def test_concurrent_allocation_is_unique(db_connection):
+    master_id = str(ObjectId())
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        numbers = list(executor.map(lambda _: allocate_version_num(TemplatesVersion, master_id), range(50)))
+    assert sorted(numbers) == list(range(1, 51))
+    VersionCounter.objects.delete()
+
+def test_allocation_requires_master(setup_db):
+    version = new_bulletin_version(setup_db)
+    version.bulletin_master_id = None
+    with pytest.raises(ValueError):
+        assign_version_num(version)
+    with pytest.raises(ValueError):
+        allocate_version_num(TemplatesVersion, None)
+    assert VersionCounter.objects.count() == 0
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+import inspect
+import pytest
+from bson import ObjectId
+
+from acb_orm.access.permissions import permission_index
+from acb_orm.auxiliaries.access_config import AccessConfig
+from acb_orm.auxiliaries.log import Log
+from acb_orm.auxiliaries.user_access import UserAccess
+from acb_orm.collections.bulletins_version import BulletinsVersion
+from acb_orm.collections.cards import Cards
+from acb_orm.collections.groups import Group
+from acb_orm.collections.templates_master import TemplatesMaster
+from acb_orm.collections.visual_resources import VisualResources
+from acb_orm.queries.pagination import CREATED_AT_SORT, has_supporting_index
+from acb_orm.queries.visibility import (VISIBILITY_DOCUMENTS, paginate_visible, visibility_filter, visible_documents,
+                                        visible_to)
+from acb_orm.schemas.cards_schema import CardsSummaryRead
+
+@pytest.fixture
+def catalog(setup_db):
+    permission_index.clear()
+    start = datetime(2024, 1, 1)
+    group = Group(group_name="Visibility Group", country="Colombia", log=Log(creator_user_id=setup_db['user_1']),
+                  users_access=[UserAccess(user_id=setup_db['user_2'], role_id=setup_db['role_editor'])]).save()
+    other_group = Group(group_name="Visibility Other", country="Peru", log=Log(creator_user_id=setup_db['user_1'])).save()
+    access = {
+        'public': AccessConfig(access_type='public'),
+        'group': AccessConfig(access_type='restricted', allowed_groups=[group.id]),
+        'other': AccessConfig(access_type='restricted', allowed_groups=[other_group.id]),
+    }
+    cards = {}
+    for index, name in enumerate(['public', 'group', 'other', 'public', 'group']):
+        cards[f"Visibility {index} {name}"] = Cards(
+            card_name=f"Visibility {index} {name}",
+            card_type="info",
+            templates_master_ids=[ObjectId(setup_db['template_master'])],
+            access_config=access[name],
+            content={"index": index},
+            log=Log(creator_user_id=setup_db['user_1'], created_at=start + timedelta(days=index))
+        ).save()
+    yield {'group': group, 'other_group': other_group, 'cards': cards}
+    Cards.objects(card_name__startswith="Visibility ").delete()
+    Group.objects(group_name__startswith="Visibility ").delete()
+    permission_index.clear()
+
+def names(documents) -> set:
+    return {document.card_name for document in documents if document.card_name.startswith("Visibility ")}
+
+def test_filter_shape():
+    group_id = ObjectId()
+    assert visibility_filter([]) == {'access_config.access_type': 'public'}
+    assert visibility_filter([str(group_id), group_id]) == {'$or': [
+        {'access_config.access_type': 'public'},
+        {'access_config.allowed_groups': {'$in': [group_id]}}
+    ]}
+
+def test_member_sees_public_and_group_documents(setup_db, catalog):
+    assert names(visible_documents(Cards, setup_db['user_2'])) == {
+        "Visibility 0 public", "Visibility 1 group", "Visibility 3 public", "Visibility 4 group"
+    }
+    assert names(visible_documents(Cards, setup_db['user_3'])) == {"Visibility 0 public", "Visibility 3 public"}
+    assert visible_to(setup_db['user_3']) == visibility_filter([])
+
+def test_indexes_support_visible_pages(catalog, setup_db):
+    filters = visible_to(setup_db['user_2'])
+    for document_cls in VISIBILITY_DOCUMENTS:
+        assert has_supporting_index(document_cls, CREATED_AT_SORT, filters)
+        assert has_supporting_index(document_cls, CREATED_AT_SORT, visibility_filter([]))
+    assert not has_supporting_index(BulletinsVersion, CREATED_AT_SORT, filters)
+    assert not has_supporting_index(VisualResources, CREATED_AT_SORT, {'access_config.allowed_groups': {'$in': list(range(201))}})
+    with pytest.raises(ValueError):
+        visible_documents(BulletinsVersion, setup_db['user_2'])
+
+def test_paginate_visible(setup_db, catalog):
+    filters = {'card_name': {'$regex': '^Visibility '}}
+    page = paginate_visible(Cards, CardsSummaryRead, setup_db['user_2'], limit=3, sort=CREATED_AT_SORT,
+                            descending=True, filters=filters, require_index=False)
+    assert [card.card_name for card in page.items] == ["Visibility 4 group", "Visibility 3 public", "Visibility 1 group"]
+    page = paginate_visible(Cards, CardsSummaryRead, setup_db['user_2'], limit=3, sort=CREATED_AT_SORT,
+                            descending=True, filters=filters, require_index=False, token=page.next_token)
+    assert [card.card_name for card in page.items] == ["Visibility 0 public"]
+    assert page.next_token is None
+
+def test_default_sort_is_indexed(setup_db, catalog):
+    sort = inspect.signature(paginate_visible).parameters['sort'].default
+    filters = visible_to(setup_db['user_2'])
+    for document_cls in VISIBILITY_DOCUMENTS:
+        assert has_supporting_index(document_cls, sort, filters)
+    page = paginate_visible(Cards, CardsSummaryRead, setup_db['user_2'], limit=10)
+    assert [card.card_name for card in page.items if card.card_name.startswith("Visibility ")] == [
+        "Visibility 0 public", "Visibility 1 group", "Visibility 3 public", "Visibility 4 group"]
+
+def test_new_membership_is_visible(setup_db, catalog):
+    assert "Visibility 2 other" not in names(visible_documents(Cards, setup_db['user_3']))
+    catalog['other_group'].users_access.append(UserAccess(user_id=setup_db['user_3'], role_id=setup_db['role_editor']))
+    catalog['other_group'].save()
+    assert "Visibility 2 other" in names(visible_documents(Cards, setup_db['user_3']))
+
+def test_templates_master_filter(setup_db, catalog):
+    master = TemplatesMaster(template_name="Visibility Template", access_config=AccessConfig(
+        access_type='restricted', allowed_groups=[catalog['group'].id])).save()
+    try:
+        assert master.id in [document.id for document in visible_documents(TemplatesMaster, setup_db['user_2'])]
+        assert master.id not in [document.id for document in visible_documents(TemplatesMaster, setup_db['user_3'])]
+    finally:
+        master.delete()